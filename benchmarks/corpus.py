@@ -0,0 +1,341 @@
+"""Generates a synthetic corpus of IaC scripts to benchmark GLITCH.
+
+Usage: python benchmarks/corpus.py --out DIR [--tech TECH] [--files N]
+    [--resources N] [--smells RATE] [--seed SEED]
+
+The scripts of each tech (or only of the given tech) are written to
+DIR/TECH, grouped in the folders of a module of the tech (Ansible roles,
+Chef cookbooks, Puppet modules, Terraform modules and Docker images), so
+that DIR/TECH can be analyzed as a dataset. Each script has about N
+resources (tasks, resources or instructions) built from common modules
+of each tech, and a fraction RATE of their values have a smell (e.g. a
+hard-coded password or an HTTP URL). The same seed always generates the
+same corpus. The paths of the scripts are reported as JSON, one line per
+tech.
+"""
+import os
+import json
+import random
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+from glitch.tech import Tech
+
+PACKAGES = ["nginx", "apache2", "postgresql", "redis-server", "mysql-server", "git",
+    "curl", "openjdk-11-jdk", "python3-pip", "memcached", "haproxy", "rsync", "ntp"]
+SERVICES = ["nginx", "apache2", "postgresql", "redis", "mysql", "memcached", "haproxy", "ntp"]
+USERS = ["deploy", "app", "www-data", "jenkins", "backup", "monitor"]
+HOSTS = ["releases.example.com", "mirror.example.org", "artifacts.internal.net",
+    "downloads.example.io", "repo.example.com"]
+WORDS = ["app", "web", "api", "worker", "cache", "db", "queue", "proxy", "search",
+    "metrics", "auth", "billing", "storage", "gateway"]
+COMMENTS = ["Keep the configuration in sync with the upstream defaults",
+    "The service is restarted by the handler", "Needed by the monitoring agent"]
+
+class Script:
+    """Random values of a script, where a fraction of them have a smell."""
+
+    def __init__(self, rng: random.Random, smells: float) -> None:
+        self.rng = rng
+        self.smells = smells
+
+    def smell(self) -> bool:
+        return self.rng.random() < self.smells
+
+    def choice(self, values: List[str]) -> str:
+        return self.rng.choice(values)
+
+    def name(self) -> str:
+        return f"{self.choice(WORDS)}_{self.rng.randrange(100)}"
+
+    def url(self, file: str) -> str:
+        scheme = "http" if self.smell() else "https"
+        return f"{scheme}://{self.choice(HOSTS)}/{self.choice(WORDS)}/{file}"
+
+    def mode(self) -> str:
+        return "0777" if self.smell() else self.choice(["0644", "0640", "0755"])
+
+    def address(self) -> str:
+        return "0.0.0.0" if self.smell() else f"10.0.{self.rng.randrange(256)}.{self.rng.randrange(256)}"
+
+    def password(self) -> str:
+        return "".join(self.rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(12))
+
+    def checksum(self) -> str:
+        algorithm = "md5" if self.smell() else "sha256"
+        return f"{algorithm}:{self.rng.getrandbits(128):032x}"
+
+    def comment(self) -> str:
+        return "TODO: " + self.choice(COMMENTS).lower() if self.smell() else self.choice(COMMENTS)
+
+def ansible_tasks(s: Script, resources: int) -> str:
+    lines = ["---"]
+    for _ in range(resources):
+        kind = s.rng.randrange(6)
+        package, service, name = s.choice(PACKAGES), s.choice(SERVICES), s.name()
+        if s.rng.random() < 0.2:
+            lines.append(f"# {s.comment()}")
+        if kind == 0:
+            lines += [f"- name: Install {package}", "  apt:", f"    name: {package}",
+                "    state: present", "    update_cache: yes"]
+        elif kind == 1:
+            lines += [f"- name: Download {name}", "  get_url:",
+                f"    url: \"{s.url(name + '.tar.gz')}\"", f"    dest: /opt/{name}.tar.gz",
+                f"    mode: \"{s.mode()}\""]
+            lines.append("    validate_certs: no" if s.smell() else f"    checksum: \"{s.checksum()}\"")
+        elif kind == 2:
+            lines += [f"- name: Configure {service}", "  template:",
+                f"    src: {service}.conf.j2", f"    dest: /etc/{service}/{service}.conf",
+                f"    owner: {'root' if s.smell() else s.choice(USERS)}", f"    mode: \"{s.mode()}\"",
+                f"  notify: restart {service}"]
+        elif kind == 3:
+            lines += [f"- name: Start {service}", "  service:", f"    name: {service}",
+                "    state: started", "    enabled: yes"]
+        elif kind == 4:
+            lines += [f"- name: Run {name}", f"  shell: \"cd /opt/{name} && ./install.sh\"",
+                f"  args:", f"    creates: /opt/{name}/.installed",
+                "  when: ansible_os_family == \"Debian\""]
+        else:
+            user = s.choice(USERS)
+            password = f"\"{s.password()}\"" if s.smell() else f"\"{{{{ {user}_password }}}}\""
+            lines += [f"- name: Create {user}", "  user:", f"    name: {user}",
+                f"    password: {password}", "    shell: /bin/bash"]
+    return "\n".join(lines) + "\n"
+
+def ansible_vars(s: Script, resources: int) -> str:
+    lines = ["---"]
+    for _ in range(resources):
+        name = s.name()
+        lines += [f"{name}_port: {s.rng.randrange(1024, 65535)}",
+            f"{name}_bind_address: {s.address()}",
+            f"{name}_url: \"{s.url(name)}\""]
+        if s.smell():
+            lines.append(f"{name}_password: \"{s.password()}\"")
+    return "\n".join(lines) + "\n"
+
+def chef_recipe(s: Script, resources: int) -> str:
+    lines = []
+    for _ in range(resources):
+        kind = s.rng.randrange(6)
+        package, service, name = s.choice(PACKAGES), s.choice(SERVICES), s.name()
+        if s.rng.random() < 0.2:
+            lines.append(f"# {s.comment()}")
+        if kind == 0:
+            lines += [f"package '{package}' do", "  action :install", "end"]
+        elif kind == 1:
+            lines += [f"remote_file '/tmp/{name}.tar.gz' do", f"  source '{s.url(name + '.tar.gz')}'",
+                f"  mode '{s.mode()}'"]
+            if not s.smell():
+                lines.append(f"  checksum '{s.checksum().split(':')[1]}'")
+            lines.append("end")
+        elif kind == 2:
+            lines += [f"template '/etc/{service}/{service}.conf' do", f"  source '{service}.conf.erb'",
+                f"  owner '{'root' if s.smell() else s.choice(USERS)}'", "  group 'root'",
+                f"  mode '{s.mode()}'", f"  variables(bind: '{s.address()}')",
+                f"  notifies :restart, 'service[{service}]'", "end"]
+        elif kind == 3:
+            lines += [f"service '{service}' do", "  action [:enable, :start]", "end"]
+        elif kind == 4:
+            lines += [f"execute 'install {name}' do", f"  command 'cd /opt/{name} && ./install.sh'",
+                f"  not_if {{ ::File.exist?('/opt/{name}/.installed') }}", "end"]
+        else:
+            lines += ["case node['platform']", "when 'ubuntu', 'debian'",
+                f"  package '{package}'", "when 'centos'", f"  package '{package}-server'"]
+            if not s.smell():
+                lines += ["else", f"  log 'unsupported platform for {package}'"]
+            lines.append("end")
+        lines.append("")
+    return "\n".join(lines)
+
+def chef_attributes(s: Script, resources: int) -> str:
+    lines = []
+    for _ in range(resources):
+        name = s.name()
+        lines += [f"default['{name}']['port'] = {s.rng.randrange(1024, 65535)}",
+            f"default['{name}']['bind_address'] = '{s.address()}'",
+            f"default['{name}']['url'] = '{s.url(name)}'"]
+        if s.smell():
+            lines.append(f"default['{name}']['password'] = '{s.password()}'")
+    return "\n".join(lines) + "\n"
+
+def puppet_class(s: Script, resources: int, module: str, name: str) -> str:
+    password = f"'{s.password()}'" if s.smell() else "undef"
+    title = module if name == "init" else f"{module}::{name}"
+    lines = [f"class {title} (", f"  $port = {s.rng.randrange(1024, 65535)},",
+        f"  $bind_address = '{s.address()}',", f"  $password = {password},", ") {"]
+    for _ in range(resources):
+        kind = s.rng.randrange(6)
+        package, service, resource = s.choice(PACKAGES), s.choice(SERVICES), s.name()
+        if s.rng.random() < 0.2:
+            lines.append(f"  # {s.comment()}")
+        if kind == 0:
+            lines += [f"  package {{ '{package}':", "    ensure => installed,", "  }"]
+        elif kind == 1:
+            lines += [f"  file {{ '/etc/{service}/{resource}.conf':", "    ensure  => file,",
+                f"    owner   => '{'root' if s.smell() else s.choice(USERS)}',",
+                f"    mode    => '{s.mode()}',",
+                f"    content => template('{module}/{resource}.conf.erb'),",
+                f"    notify  => Service['{service}'],", "  }"]
+        elif kind == 2:
+            lines += [f"  service {{ '{service}':", "    ensure => running,",
+                "    enable => true,", "  }"]
+        elif kind == 3:
+            lines += [f"  exec {{ 'download {resource}':",
+                f"    command => '/usr/bin/curl -o /tmp/{resource}.tar.gz {s.url(resource + '.tar.gz')}',",
+                f"    creates => '/tmp/{resource}.tar.gz',", "  }"]
+        elif kind == 4:
+            lines += ["  case $facts['os']['family'] {",
+                f"    'Debian': {{ package {{ '{package}-dev': ensure => installed }} }}",
+                f"    'RedHat': {{ package {{ '{package}-devel': ensure => installed }} }}"]
+            if not s.smell():
+                lines.append(f"    default: {{ notice('unsupported platform for {package}') }}")
+            lines.append("  }")
+        else:
+            lines += [f"  user {{ '{s.choice(USERS)}':", "    ensure     => present,",
+                "    managehome => true,", "    password   => $password,", "  }"]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def terraform_main(s: Script, resources: int) -> str:
+    lines = []
+    for _ in range(resources):
+        kind = s.rng.randrange(5)
+        name = s.name()
+        if s.rng.random() < 0.2:
+            lines.append(f"# {s.comment()}")
+        if kind == 0:
+            lines += [f"resource \"aws_instance\" \"{name}\" {{",
+                f"  ami           = \"ami-{s.rng.getrandbits(32):08x}\"",
+                f"  instance_type = \"{s.choice(['t3.micro', 't3.small', 'm5.large'])}\"",
+                f"  user_data     = \"curl -s {s.url('bootstrap.sh')} | sh\"",
+                "  tags = {", f"    Name = \"{name}\"", "  }", "}"]
+        elif kind == 1:
+            cidr = "0.0.0.0/0" if s.smell() else f"10.{s.rng.randrange(256)}.0.0/16"
+            lines += [f"resource \"aws_security_group\" \"{name}\" {{", f"  name = \"{name}\"",
+                "  ingress {", "    from_port   = 443", "    to_port     = 443",
+                "    protocol    = \"tcp\"", f"    cidr_blocks = [\"{cidr}\"]", "  }", "}"]
+        elif kind == 2:
+            password = f"\"{s.password()}\"" if s.smell() else "var.db_password"
+            lines += [f"resource \"aws_db_instance\" \"{name}\" {{",
+                "  engine            = \"postgres\"", "  instance_class    = \"db.t3.micro\"",
+                "  allocated_storage = 20",
+                f"  username          = \"{'admin' if s.smell() else s.choice(USERS)}\"",
+                f"  password          = {password}", "}"]
+        elif kind == 3:
+            lines += [f"resource \"aws_s3_bucket\" \"{name}\" {{", f"  bucket = \"{name}-bucket\"",
+                "}"]
+        else:
+            lines += [f"resource \"aws_lb\" \"{name}\" {{", f"  name               = \"{name}\"",
+                "  load_balancer_type = \"application\"",
+                f"  internal           = {'false' if s.smell() else 'true'}", "}"]
+        lines.append("")
+    return "\n".join(lines)
+
+def terraform_variables(s: Script, resources: int) -> str:
+    lines = []
+    for _ in range(max(resources // 2, 1)):
+        name = s.name()
+        lines += [f"variable \"{name}\" {{", "  type    = string",
+            f"  default = \"{s.url(name) if s.rng.random() < 0.5 else name}\"", "}", ""]
+    lines += ["variable \"db_password\" {", "  type      = string", "  sensitive = true", "}"]
+    return "\n".join(lines) + "\n"
+
+def dockerfile(s: Script, resources: int) -> str:
+    image = s.choice(["ubuntu:22.04", "debian:bookworm", "python:3.11-slim", "node:20",
+        "nginx:1.25", "example/base:1.0"])
+    lines = [f"FROM {image}", "LABEL maintainer=\"ops@example.com\""]
+    for _ in range(resources):
+        kind = s.rng.randrange(5)
+        package, name = s.choice(PACKAGES), s.name()
+        if s.rng.random() < 0.2:
+            lines.append(f"# {s.comment()}")
+        if kind == 0:
+            lines.append(f"RUN apt-get update && apt-get install -y {package} && rm -rf /var/lib/apt/lists/*")
+        elif kind == 1:
+            lines.append(f"RUN wget {s.url(name + '.tar.gz')} && tar xzf {name}.tar.gz")
+            if not s.smell():
+                lines.append(f"RUN sha256sum -c {name}.tar.gz.sha256")
+        elif kind == 2:
+            lines.append(f"RUN chmod {s.mode()} /opt/{name}")
+        elif kind == 3:
+            lines.append(f"ENV {name.upper()}_HOST={s.address()}")
+        else:
+            lines.append(f"COPY {name}/ /opt/{name}/")
+    lines += [f"USER {'root' if s.smell() else s.choice(USERS)}", "WORKDIR /opt",
+        "EXPOSE 8080", "CMD [\"./start.sh\"]"]
+    return "\n".join(lines) + "\n"
+
+def ansible_module(s: Script, resources: int, module: str) -> List[Tuple[str, str]]:
+    files = [(f"{module}/tasks/main.yml", ansible_tasks(s, resources)),
+        (f"{module}/vars/main.yml", ansible_vars(s, max(resources // 4, 1)))]
+    for _ in range(s.rng.randrange(3)):
+        files.append((f"{module}/tasks/{s.name()}.yml", ansible_tasks(s, resources)))
+    return files
+
+def chef_module(s: Script, resources: int, module: str) -> List[Tuple[str, str]]:
+    files = [(f"{module}/recipes/default.rb", chef_recipe(s, resources)),
+        (f"{module}/attributes/default.rb", chef_attributes(s, max(resources // 4, 1)))]
+    for _ in range(s.rng.randrange(3)):
+        files.append((f"{module}/recipes/{s.name()}.rb", chef_recipe(s, resources)))
+    return files
+
+def puppet_module(s: Script, resources: int, module: str) -> List[Tuple[str, str]]:
+    files = [(f"{module}/manifests/init.pp", puppet_class(s, resources, module, "init"))]
+    for _ in range(s.rng.randrange(1, 4)):
+        name = s.name()
+        files.append((f"{module}/manifests/{name}.pp", puppet_class(s, resources, module, name)))
+    return files
+
+def terraform_module(s: Script, resources: int, module: str) -> List[Tuple[str, str]]:
+    return [(f"{module}/main.tf", terraform_main(s, resources)),
+        (f"{module}/variables.tf", terraform_variables(s, resources))]
+
+def docker_module(s: Script, resources: int, module: str) -> List[Tuple[str, str]]:
+    return [(f"{module}/Dockerfile", dockerfile(s, resources))]
+
+MODULES: Dict[Tech, Callable[[Script, int, str], List[Tuple[str, str]]]] = {
+    Tech.ansible: ansible_module,
+    Tech.chef: chef_module,
+    Tech.puppet: puppet_module,
+    Tech.terraform: terraform_module,
+    Tech.docker: docker_module,
+}
+
+def generate(tech: Tech, out: str, files: int, resources: int = 20,
+        smells: float = 0.05, seed: int = 0) -> List[str]:
+    """Writes about files scripts of the tech, with about resources resources
+    each, to out/TECH and returns their paths."""
+    # Each tech has its own generator so that its corpus does not depend
+    # on the other techs generated
+    s = Script(random.Random(f"{seed}:{tech.value}"), smells)
+    paths = []
+    i = 0
+    while len(paths) < files:
+        module = f"{tech.value}_{i}"
+        for path, content in MODULES[tech](s, resources, module):
+            if len(paths) == files:
+                break
+            path = os.path.join(out, tech.value, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+            paths.append(path)
+        i += 1
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic corpus of IaC scripts.")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--tech", choices=[t.value for t in Tech])
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--smells", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for tech in [Tech(args.tech)] if args.tech else list(Tech):
+        paths = generate(tech, args.out, args.files, args.resources, args.smells, args.seed)
+        print(json.dumps({"tech": tech.value, "paths": paths}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Measures the time it takes to import the command line tool of GLITCH.
+
+Usage: python benchmarks/import_time.py [--runs N] [--max-ms MS]
+
+Each run imports glitch.__main__ in a new interpreter with -X importtime
+and the median of the cumulative import time is reported as JSON. If
+--max-ms is given, the script fails when the median is above it, so it can
+be used to guard against imports that make the startup slower again.
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+def import_time(module: str) -> int:
+    """Returns the cumulative import time of the module in microseconds."""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE, check=True, text=True).stderr
+    for line in output.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise RuntimeError(f"Could not find the import time of {module}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of GLITCH.")
+    parser.add_argument("--module", default="glitch.__main__")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    times = [import_time(args.module) / 1000 for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(json.dumps({
+        "module": args.module,
+        "runs": args.runs,
+        "median_ms": round(median, 2),
+        "min_ms": round(min(times), 2),
+        "max_ms": round(max(times), 2),
+    }))
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"The import time ({median:.2f} ms) is above {args.max_ms} ms", 
+            file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Measures the memory used by the intermediate representation of GLITCH.
+
+Usage: python benchmarks/ir_memory.py --tech TECH [PATH ...]
+
+Each path (by default, the test files of the tech) is parsed and the
+memory allocated by the parser which is still in use by the
+intermediate representation is measured with tracemalloc. The results
+are reported as JSON, in bytes per line of source code.
+"""
+import os
+import gc
+import sys
+import json
+import argparse
+import tracemalloc
+
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import get_parser
+from glitch.source import sources
+from glitch.tech import Tech
+
+TESTS = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "glitch", "tests")
+
+def default_paths(tech: Tech) -> list[str]:
+    paths = []
+    for root, _, files in os.walk(TESTS):
+        if os.path.basename(root) == "files" and os.path.basename(os.path.dirname(root)) == tech.value:
+            paths += [os.path.join(root, f) for f in sorted(files)]
+    return sorted(paths)
+
+def parse(parser, path: str):
+    # The errors of the parsers are printed to stdout
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        return parser.parse(path, UnitBlockType.unknown, False)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+def measure(tech: Tech, paths: list[str]) -> dict:
+    parser = get_parser(tech)
+    lines, irs = 0, []
+    # The first parse builds the tables of the parsers, which are not part
+    # of the intermediate representation
+    parse(parser, paths[0])
+    sources.evict()
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for path in paths:
+        irs.append(parse(parser, path))
+        lines += len(sources.open(path).lines)
+        # Only the memory used by the intermediate representation counts
+        sources.evict()
+    gc.collect()
+    ir = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return {
+        "tech": tech.value,
+        "files": len(paths),
+        "lines": lines,
+        "ir_bytes": ir,
+        "bytes_per_line": round(ir / max(lines, 1), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory used by the intermediate representation.")
+    parser.add_argument("--tech", choices=[t.value for t in Tech], required=True)
+    parser.add_argument("paths", nargs="*")
+    args = parser.parse_args()
+
+    tech = Tech(args.tech)
+    paths = args.paths if args.paths else default_paths(tech)
+    print(json.dumps(measure(tech, paths)))
+
+if __name__ == "__main__":
+    main()
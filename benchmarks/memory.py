@@ -0,0 +1,228 @@
+"""Measures the memory used by each phase of an analysis with GLITCH.
+
+Usage: python benchmarks/memory.py [--tech TECH] [--corpus {synthetic,fixtures}]
+    [--files N] [--resources N] [--seed SEED] [--top N] [--output FILE]
+
+The scripts of each tech (or only of the given tech) are analyzed in the
+phases of a run of glitch, keeping the results of each phase alive until
+the end, as glitch keeps the intermediate representation of the path it
+analyzes:
+    parse: the intermediate representation of each script is built;
+    analyze: all the visitors check the intermediate representations;
+    stats: the stats of the files are computed;
+    print: the errors are sorted and formatted, and the stats are printed
+        (to /dev/null).
+The scripts are a synthetic corpus (see corpus.py) and the test files of
+the tech, or only the ones given by --corpus. Each tech is analyzed twice,
+in new processes: once to measure the RSS and once to trace the
+allocations with tracemalloc, which uses memory of its own. The results are
+reported as JSON, one line per phase (and appended to FILE, if given), with:
+    rss_bytes: RSS of the process after the phase;
+    peak_rss_bytes: peak RSS of the process during the phase (None if the
+        peak cannot be reset, e.g. without /proc/self/clear_refs);
+    traced_peak_bytes: peak of the memory allocated during the phase;
+    retained_bytes: memory allocated during the phase which is still in use
+        after it;
+    top: the N allocation sites (file and line) with most retained memory.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, List, Optional, Tuple
+
+from corpus import generate
+from glitch.analysis.rules import RuleVisitor, Traversal
+from glitch.budget import current_rss
+from glitch.output import format_error
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import get_analyses, get_parser
+from glitch.source import sources
+from glitch.stats.print import SmellStats, print_stats
+from glitch.stats.stats import FileStats
+from glitch.tech import Tech
+
+ROOT = os.path.realpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+TESTS = os.path.join(ROOT, "glitch", "tests")
+CONFIG = os.path.join(ROOT, "glitch", "configs", "default.ini")
+
+def default_paths(tech: Tech) -> list[str]:
+    paths = []
+    for root, _, files in os.walk(TESTS):
+        if os.path.basename(root) == "files" and os.path.basename(os.path.dirname(root)) == tech.value:
+            paths += [os.path.join(root, f) for f in sorted(files)]
+    return sorted(paths)
+
+def silenced(function: Callable) -> Callable:
+    # The errors of the parsers and the stats are printed to stdout
+    def call(*args):
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            return function(*args)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    return call
+
+def phases(tech: Tech, paths: List[str]) -> List[Tuple[str, Callable]]:
+    """The phases of the analysis of the paths, in order. Each phase keeps
+    its results for the next ones."""
+    parser = get_parser(tech)
+    smells = [r.get_name() for r in RuleVisitor.__subclasses__()]
+    analyses = get_analyses(tech, CONFIG, smells)
+    irs, errors, stats = [], [], FileStats()
+    # The first parse builds the tables of the parsers (and loads their
+    # dependencies), which are not part of the phases
+    silenced(parser.parse)(paths[0], UnitBlockType.unknown, False)
+    sources.evict()
+
+    def parse():
+        for path in paths:
+            irs.append(parser.parse(path, UnitBlockType.unknown, False))
+
+    def analyze():
+        for ir in irs:
+            if ir is not None:
+                errors.extend(Traversal(analyses).check(ir))
+
+    def compute_stats():
+        for ir in irs:
+            stats.compute(ir)
+
+    def print_results():
+        smell_stats = SmellStats(smells)
+        sorted_errors = sorted(set(errors), key=lambda e: (e.path, e.line, e.code))
+        smell_stats.add_errors(sorted_errors)
+        for error in sorted_errors:
+            print(format_error(error, False, False))
+        if len(stats.files) > 0 and stats.loc > 0:
+            print_stats(smell_stats, stats, "prettytable")
+
+    return [("parse", silenced(parse)), ("analyze", analyze),
+        ("stats", compute_stats), ("print", silenced(print_results))]
+
+def reset_peak_rss() -> bool:
+    """Resets the peak RSS of the process (VmHWM), if possible."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def peak_rss() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+def measure_rss(tech: Tech, paths: List[str]) -> dict:
+    """Runs the phases in the current process, which should be new, and
+    returns the RSS of each phase."""
+    results = {}
+    for name, phase in phases(tech, paths):
+        resettable = reset_peak_rss()
+        phase()
+        results[name] = {"rss_bytes": current_rss(),
+            "peak_rss_bytes": peak_rss() if resettable else None}
+    sources.evict()
+    return results
+
+def site(frame: tracemalloc.Frame) -> str:
+    filename = os.path.realpath(frame.filename)
+    if filename.startswith(ROOT + os.sep):
+        filename = os.path.relpath(filename, ROOT)
+    return f"{filename}:{frame.lineno}"
+
+def measure_allocations(tech: Tech, paths: List[str], top: int) -> dict:
+    """Runs the phases in the current process, which should be new, and
+    returns the allocations of each phase."""
+    results = {}
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")]
+    tracemalloc.start()
+    for name, phase in phases(tech, paths):
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        phase()
+        # Read before the snapshot, whose memory is also traced
+        traced, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+
+        sites = [diff for diff in after.compare_to(before, "lineno") if diff.size_diff > 0]
+        results[name] = {
+            "traced_peak_bytes": peak - current,
+            "retained_bytes": traced - current,
+            "top": [{"site": site(diff.traceback[0]), "bytes": diff.size_diff,
+                "blocks": diff.count_diff} for diff in sites[:top]],
+        }
+        # The snapshots are freed before the next phase is measured
+        del before, after, sites
+    tracemalloc.stop()
+    sources.evict()
+    return results
+
+def in_new_process(function: Callable, *args):
+    # The memory of a spawned process does not depend on this one (or on
+    # the phases measured before), as the memory of a forked process would
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(function, *args).result()
+
+def measure(tech: Tech, corpus: str, paths: List[str], top: int) -> List[dict]:
+    rss = in_new_process(measure_rss, tech, paths)
+    allocations = in_new_process(measure_allocations, tech, paths, top)
+    lines = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            lines += sum(1 for _ in f)
+
+    results = []
+    for name in rss:
+        result = {"tech": tech.value, "corpus": corpus, "phase": name,
+            "files": len(paths), "lines": lines}
+        result.update(rss[name])
+        result.update(allocations[name])
+        results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory used by each phase of an analysis.")
+    parser.add_argument("--tech", choices=[t.value for t in Tech])
+    parser.add_argument("--corpus", choices=["synthetic", "fixtures"], default=None)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    corpora = [args.corpus] if args.corpus else ["synthetic", "fixtures"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for tech in [Tech(args.tech)] if args.tech else list(Tech):
+            for corpus in corpora:
+                if corpus == "synthetic":
+                    paths = generate(tech, tmp, args.files, args.resources, seed=args.seed)
+                else:
+                    paths = default_paths(tech)
+                if len(paths) == 0:
+                    continue
+
+                for result in measure(tech, corpus, paths, args.top):
+                    line = json.dumps(result)
+                    print(line, flush=True)
+                    if args.output is not None:
+                        with open(args.output, "a") as f:
+                            f.write(line + "\n")
+
+if __name__ == "__main__":
+    main()
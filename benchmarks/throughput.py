@@ -0,0 +1,177 @@
+"""Measures the throughput of the parsers and visitors of GLITCH.
+
+Usage: python benchmarks/throughput.py [--tech TECH] [--corpus DIR]
+    [--files N] [--resources N] [--seed SEED] [--runs N] [--output FILE]
+
+A synthetic corpus (see corpus.py) is generated for each tech (or only for
+the given tech), unless --corpus is given, in which case the scripts in
+DIR/TECH are used. Then, for each tech, these scenarios are timed:
+    parse: the parser of the tech parses each script;
+    check: each visitor (e.g. security) checks the IR of each script,
+        which is parsed before the scenario is timed;
+    pipeline: each script is parsed and checked by all the visitors, and
+        its stats are computed, as in a run of glitch without cache.
+Each scenario runs in a new process, so that its peak RSS does not depend
+on the scenarios before it. The results are reported as JSON, one line per
+scenario (and appended to FILE, if given), with:
+    files, lines: size of the corpus;
+    seconds: best time of the runs;
+    files_per_s, loc_per_s: throughput of the best run;
+    peak_rss_bytes: peak RSS of the process of the scenario;
+    baseline_rss_bytes: RSS of that process before the scenario (after
+        the modules of GLITCH are imported);
+    commit: the git commit of the tree, to track the results between commits.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import List, Optional
+
+from corpus import generate
+from glitch.analysis.rules import RuleVisitor, Traversal
+from glitch.budget import current_rss
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import check, get_analyses, get_parser
+from glitch.source import sources
+from glitch.tech import Tech
+
+ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+CONFIG = os.path.join(ROOT, "glitch", "configs", "default.ini")
+
+def commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def corpus_paths(corpus: str, tech: Tech) -> List[str]:
+    paths = []
+    for root, _, files in os.walk(os.path.join(corpus, tech.value)):
+        paths += [os.path.join(root, f) for f in files]
+    return sorted(paths)
+
+def parse(parser, path: str):
+    # The errors of the parsers are printed to stdout
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        return parser.parse(path, UnitBlockType.unknown, False)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+def best_time(function, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def scenario(name: str, tech: Tech, visitor: Optional[str], paths: List[str], runs: int) -> dict:
+    """Runs the scenario in the current process, which should be new."""
+    parser = get_parser(tech)
+    analyses = get_analyses(tech, CONFIG, [visitor] if visitor is not None else
+        [r.get_name() for r in RuleVisitor.__subclasses__()])
+    # The parsers may load their dependencies (e.g. the Ruby parser of
+    # Chef) the first time they are used
+    parse(parser, paths[0])
+    sources.evict()
+    baseline = current_rss()
+
+    if name == "parse":
+        def run():
+            for path in paths:
+                parse(parser, path)
+            sources.evict()
+    elif name == "check":
+        irs = [ir for ir in (parse(parser, p) for p in paths) if ir is not None]
+        def run():
+            for ir in irs:
+                Traversal(analyses).check(ir)
+        # The first check loads the scripts into the store of sources
+        run()
+    else:
+        def run():
+            for path in paths:
+                stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+                try:
+                    check(UnitBlockType.unknown, path, False, parser, analyses)
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+                sources.evict()
+    seconds = best_time(run, runs)
+    # ru_maxrss is in kilobytes in Linux. It is only updated from time to
+    # time, so it can be below the current RSS.
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, 
+        current_rss() or 0, baseline or 0)
+
+    lines = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            lines += sum(1 for _ in f)
+    result = {"scenario": name, "tech": tech.value}
+    if name == "parse":
+        result["parser"] = parser.__class__.__name__
+    elif name == "check":
+        result["visitor"] = visitor
+    result.update({
+        "files": len(paths),
+        "lines": lines,
+        "seconds": round(seconds, 4),
+        "files_per_s": round(len(paths) / seconds, 1),
+        "loc_per_s": round(lines / seconds, 1),
+        "peak_rss_bytes": peak,
+        "baseline_rss_bytes": baseline,
+    })
+    return result
+
+def run_scenario(name: str, tech: Tech, visitor: Optional[str], paths: List[str],
+        runs: int) -> dict:
+    # A new process for each scenario, which does not share the memory of
+    # this one (as a forked process would)
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(scenario, name, tech, visitor, paths, runs).result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the parsers and visitors.")
+    parser.add_argument("--tech", choices=[t.value for t in Tech])
+    parser.add_argument("--corpus", default=None)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    visitors = [r.get_name() for r in RuleVisitor.__subclasses__()]
+    with tempfile.TemporaryDirectory() as tmp:
+        info = {"commit": commit(), "seed": args.seed if args.corpus is None else None}
+        for tech in [Tech(args.tech)] if args.tech else list(Tech):
+            if args.corpus is None:
+                paths = generate(tech, tmp, args.files, args.resources, seed=args.seed)
+            else:
+                paths = corpus_paths(args.corpus, tech)
+            if len(paths) == 0:
+                continue
+
+            scenarios = [("parse", None)] + [("check", v) for v in visitors] + [("pipeline", None)]
+            for name, visitor in scenarios:
+                result = run_scenario(name, tech, visitor, paths, args.runs)
+                result.update(info)
+                line = json.dumps(result)
+                print(line, flush=True)
+                if args.output is not None:
+                    with open(args.output, "a") as f:
+                        f.write(line + "\n")
+
+if __name__ == "__main__":
+    main()
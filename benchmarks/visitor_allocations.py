@@ -0,0 +1,113 @@
+"""Measures the allocations made by the visitors of GLITCH to report errors.
+
+Usage: python benchmarks/visitor_allocations.py [--tech TECH] [--runs N]
+
+The test files of each tech (or only of the given tech) are parsed once
+and then checked by all the visitors in a single pass, with the default
+configuration. The parsing is not measured. The results are reported as JSON, one line
+per tech, with:
+    lists: number of lists returned by the methods of glitch.analysis,
+        which are the temporary lists built to report errors (counted
+        with a profile hook in a separate run);
+    peak_bytes: peak of the memory allocated while checking the files,
+        measured with tracemalloc;
+    seconds: best time of the runs to check the files.
+"""
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+from glitch.analysis.rules import Traversal
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import get_parser, get_analyses
+from glitch.source import sources
+from glitch.tech import Tech
+
+GLITCH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "glitch")
+TESTS = os.path.join(GLITCH, "tests")
+CONFIG = os.path.join(GLITCH, "configs", "default.ini")
+ANALYSIS = os.path.join(os.path.realpath(GLITCH), "analysis")
+
+def default_paths(tech: Tech) -> list[str]:
+    paths = []
+    for root, _, files in os.walk(TESTS):
+        if os.path.basename(root) == "files" and os.path.basename(os.path.dirname(root)) == tech.value:
+            paths += [os.path.join(root, f) for f in sorted(files)]
+    return sorted(paths)
+
+def parse(parser, path: str):
+    # The errors of the parsers are printed to stdout
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        return parser.parse(path, UnitBlockType.unknown, False)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+def check(analyses, irs):
+    for ir in irs:
+        Traversal(analyses).check(ir)
+
+def count_lists(analyses, irs) -> int:
+    lists = 0
+
+    def profile(frame, event, arg):
+        nonlocal lists
+        if event == "return" and type(arg) is list and \
+                frame.f_code.co_filename.startswith(ANALYSIS):
+            lists += 1
+
+    sys.setprofile(profile)
+    try:
+        check(analyses, irs)
+    finally:
+        sys.setprofile(None)
+    return lists
+
+def measure(tech: Tech, runs: int) -> dict:
+    parser = get_parser(tech)
+    analyses = get_analyses(tech, CONFIG, ())
+    paths = default_paths(tech)
+    irs = [ir for ir in (parse(parser, p) for p in paths) if ir is not None]
+    # The analyses read the files again, which is part of the check.
+    # The first check also loads them into the store.
+    check(analyses, irs)
+
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        check(analyses, irs)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    check(analyses, irs)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    lists = count_lists(analyses, irs)
+    sources.evict()
+    return {
+        "tech": tech.value,
+        "files": len(paths),
+        "lists": lists,
+        "peak_bytes": peak,
+        "seconds": round(best, 4),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocations of the visitors to report errors.")
+    parser.add_argument("--tech", choices=[t.value for t in Tech])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for tech in [Tech(args.tech)] if args.tech else list(Tech):
+        print(json.dumps(measure(tech, args.runs)))
+
+if __name__ == "__main__":
+    main()
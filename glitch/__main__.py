@@ -1,29 +1,47 @@
 import click, os, sys
-from glitch.analysis.rules import Error, RuleVisitor
-from glitch.helpers import RulesListOption
-from glitch.parsers.docker_parser import DockerParser
-from glitch.stats.print import print_stats
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from glitch.analysis.rules import RuleVisitor
+from glitch.helpers import AnalysisGroup, RulesListOption
+from glitch.cache import ResultCache, default_cache_dir
+from glitch.analysis.duplicates import DuplicateIndex
+from glitch.budget import Budget
+from glitch.ir import IRFormatError, IRReader, IRWriter
+from glitch.runner import get_parser, get_analyses, check_and_fingerprint, \
+    init_worker, check_in_worker, parse_to_ir, check_from_ir, check_ir_in_worker
+from glitch.output import ExternalSort, format_error
+from glitch.profiling import ProfileReport
+from glitch.stats.print import SmellStats, print_stats
 from glitch.stats.stats import FileStats
 from glitch.tech import Tech
 from glitch.repr.inter import UnitBlockType
-from glitch.parsers.cmof import AnsibleParser, ChefParser, PuppetParser, TerraformParser
-from pkg_resources import resource_filename
 from alive_progress import alive_bar
 from pathlib import Path
 
-# NOTE: These are necessary in order for python to load the visitors.
-# Otherwise, python will not consider these types of rules.
-from glitch.analysis.design import DesignVisitor 
-from glitch.analysis.security import SecurityVisitor
+def dataset_paths(path, includeall, action) -> list[tuple[list[str], str]]:
+    """Returns the groups of paths of a dataset, which are the files with the
+    extensions in includeall (if given) or the subfolders, and the files in
+    the root folder, with the title of their progress bar."""
+    groups = []
+    if includeall != ():
+        iac_files = []
+        for root, _, files in os.walk(path):
+            for name in files:
+                name_split = name.split('.')
+                if name_split[-1] in includeall \
+                        and not Path(os.path.join(root, name)).is_symlink():
+                    iac_files.append(os.path.join(root, name))
+        iac_files = list(set(iac_files))
+        groups.append((iac_files, f"{action} ALL FILES WITH EXTENSIONS {includeall}"))
+    else:
+        subfolders = [f.path for f in os.scandir(f"{path}") if f.is_dir()]
+        groups.append((subfolders, f"{action} SUBFOLDERS"))
 
-def parse_and_check(type, path, module, parser, analyses, errors, stats):
-    inter = parser.parse(path, type, module)
-    if inter != None:
-        for analysis in analyses:
-            errors += analysis.check(inter)
-    stats.compute(inter)
+    files = [f.path for f in os.scandir(f"{path}") if f.is_file()]
+    groups.append((files, f"{action} FILES IN ROOT FOLDER"))
+    return groups
 
-@click.command(
+@click.group(cls=AnalysisGroup,
     help="PATH is the file or folder to analyze. OUTPUT is an optional file to which we can redirect the smells output."
 )
 @click.option('--tech',
@@ -52,96 +70,246 @@ def parse_and_check(type, path, module, parser, analyses, errors, stats):
     help="Use this flag if you want the output to be in CSV format.")
 @click.option('--smells', cls=RulesListOption, multiple=True, 
     help="The type of smells being analyzed.")
+@click.option('--jobs', type=click.IntRange(min=1), default=1,
+    help="The number of processes used to analyze the subfolders/files of a dataset in parallel. "
+         "This flag is only relevant if you are using the dataset flag.")
+@click.option('--cache-dir', type=click.Path(file_okay=False), default=None,
+    help="The folder where the results of unchanged files are cached between runs. "
+         "Otherwise, the folder glitch inside the user's cache folder will be used.")
+@click.option('--no-cache', is_flag=True, default=False,
+    help="Use this flag if you do not want to use the cache of results.")
+@click.option('--stream', is_flag=True, default=False,
+    help="Use this flag if you want the smells of each file to be output as soon as the file is analyzed. "
+         "Duplicated smells are only removed inside each file and the output is not sorted.")
+@click.option('--external-sort', is_flag=True, default=False,
+    help="Use this flag if you want the output to be sorted with an external merge sort. "
+         "The smells are kept in temporary files instead of memory until the end of the run.")
+@click.option('--cross-file-duplicates', is_flag=True, default=False,
+    help="Use this flag if you want the duplicated blocks between different files to be reported. "
+         "This flag is only relevant if the design smells are analyzed.")
+@click.option('--from-ir', is_flag=True, default=False,
+    help="Use this flag if PATH is a file with the intermediate representation of the scripts, "
+         "written by 'glitch parse --emit-ir', so that the scripts are not parsed again. "
+         "The flags --type, --module, --dataset and --includeall are the ones used to parse the scripts.")
+@click.option('--timeout', type=click.FloatRange(min=0, min_open=True), default=None,
+    help="The maximum number of seconds spent parsing and analyzing each file (or subfolder of a dataset). "
+         "The files which take longer are skipped and reported at the end of the run.")
+@click.option('--max-memory', type=click.IntRange(min=1), default=None,
+    help="The maximum memory, in MB, which parsing and analyzing each file (or subfolder of a dataset) "
+         "can add to the process. The files which use more are skipped and reported at the end of the run.")
+@click.option('--profile-report', type=click.Path(dir_okay=False), default=None,
+    help="The file to which the time spent parsing, analyzing (by each type of smell) and computing the stats "
+         "of each file (or subfolder of a dataset), and the size of its intermediate representation, are written "
+         "as JSON lines. The slowest files are also shown in the stats.")
+@click.option('--profile-rules', is_flag=True, default=False,
+    help="Use this flag if you want the CPU time spent in the rules of each smell, and the number of times "
+         "they were invoked, to be shown in the stats. The files whose results are cached are not analyzed.")
 @click.argument('path', type=click.Path(exists=True), required=True)
 @click.argument('output', type=click.Path(), required=False)
 def glitch(tech, type, path, config, module, csv, 
-        dataset, includeall, smells, output, tableformat, linter):
+        dataset, includeall, smells, output, tableformat, linter, jobs,
+        cache_dir, no_cache, stream, external_sort, cross_file_duplicates, from_ir,
+        timeout, max_memory, profile_report, profile_rules):
     if config != "configs/default.ini" and not os.path.exists(config):
         raise click.BadOptionUsage('config', f"Invalid value for 'config': Path '{config}' does not exist.")
     elif os.path.isdir(config):
         raise click.BadOptionUsage('config', f"Invalid value for 'config': Path '{config}' should be a file.")
     elif config == "configs/default.ini":
-        config = resource_filename('glitch', "configs/default.ini")
-
-    parser = None
-    if tech == Tech.ansible:
-        parser = AnsibleParser()
-    elif tech == Tech.chef:
-        parser = ChefParser()
-    elif tech == Tech.puppet:
-        parser = PuppetParser()
-    elif tech == Tech.docker:
-        parser = DockerParser()
-    elif tech == Tech.terraform:
-        parser = TerraformParser()
+        config = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+            "configs", "default.ini")
+
+    if from_ir:
+        try:
+            with IRReader(path) as ir:
+                if ir.tech != tech:
+                    raise click.BadOptionUsage('tech', f"Invalid value for 'tech': "
+                        f"'{path}' has the intermediate representation of {ir.tech.value} scripts.")
+        except IRFormatError as e:
+            raise click.BadParameter(str(e), param_hint="'PATH'")
+
+    if (timeout is not None or max_memory is not None) and \
+            not Budget.supported(memory=max_memory is not None):
+        raise click.BadOptionUsage('timeout' if max_memory is None else 'max_memory', 
+            "The budget of each file cannot be enforced in this platform.")
+    budget = Budget(timeout, max_memory << 20 if max_memory is not None else None)
+
+    # The scripts are already parsed in the intermediate representation
+    parser = get_parser(tech) if not from_ir else None
     file_stats = FileStats()
 
     if smells == ():
         smells = list(map(lambda c: c.get_name(), RuleVisitor.__subclasses__()))
 
-    analyses = []
-    rules = RuleVisitor.__subclasses__()
-    for r in rules:
-        if smells == () or r.get_name() in smells:
-            analysis = r(tech)
-            analysis.config(config)
-            analyses.append(analysis)
+    analyses = get_analyses(tech, config, smells, profile_rules)
+
+    cache = None
+    # The cache is keyed by the content of the scripts, which are not read
+    # when the intermediate representation is analyzed
+    if not no_cache and not from_ir:
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        cache = ResultCache(cache_dir, tech, config, smells, type, module)
+
+    if output is None:
+        f = sys.stdout
+    else:
+        f = open(output, "w")
+
+    duplicates = None
+    if cross_file_duplicates and "design" in smells:
+        duplicates = DuplicateIndex()
 
     errors = []
-    if dataset:
-        if includeall != ():
-            iac_files = []
-            for root, _, files in os.walk(path):
-                for name in files:
-                    name_split = name.split('.')
-                    if name_split[-1] in includeall \
-                            and not Path(os.path.join(root, name)).is_symlink():
-                        iac_files.append(os.path.join(root, name))
-            iac_files = set(iac_files)
-
-            with alive_bar(len(iac_files), 
-                    title=f"ANALYZING ALL FILES WITH EXTENSIONS {includeall}") as bar:
-                for file in iac_files:
-                    parse_and_check(type, file, module, parser, analyses, errors, file_stats)
-                    bar()
+    smell_stats = SmellStats(smells)
+    sorter = ExternalSort() if external_sort else None
+    report = ProfileReport(profile_report) if profile_report is not None else None
+    profile = report is not None
+
+    def add_errors(p_errors):
+        if not stream and sorter is None:
+            errors.extend(p_errors)
+            return
+
+        p_errors = sorted(set(p_errors), key=lambda e: (e.path, e.line, e.code))
+        if sorter is not None:
+            for error in p_errors:
+                sorter.add(error, format_error(error, linter, csv))
         else:
-            subfolders = [f.path for f in os.scandir(f"{path}") if f.is_dir()]
-            with alive_bar(len(subfolders), title="ANALYZING SUBFOLDERS") as bar:
-                for d in subfolders:
-                    parse_and_check(type, d, module, parser, analyses, errors, file_stats)
-                    bar()
+            smell_stats.add_errors(p_errors)
+            for error in p_errors:
+                print(format_error(error, linter, csv), file = f)
+            f.flush()
+
+    def add_stats(p_stats):
+        if report is not None:
+            report.add(p_stats.profile)
+        file_stats.merge(p_stats)
 
-        files = [f.path for f in os.scandir(f"{path}") if f.is_file()]
+    def add_fingerprints(p_fingerprints):
+        if p_fingerprints is None:
+            return
+        for file, fingerprints in p_fingerprints.items():
+            add_errors(duplicates.add(file, fingerprints))
 
-        with alive_bar(len(files), title="ANALYZING FILES IN ROOT FOLDER") as bar:
-            for file in files:
-                parse_and_check(type, file, module, parser, analyses, errors, file_stats)
+    executor = None
+    if (dataset or from_ir) and jobs > 1:
+        executor = ProcessPoolExecutor(jobs, initializer=init_worker, 
+            initargs=(tech, config, smells, cache, budget, profile, profile_rules))
+
+    def add_results(results, total, title):
+        with alive_bar(total, title=title) as bar:
+            for p_errors, p_stats, p_fingerprints in results:
+                add_fingerprints(p_fingerprints)
+                add_errors(p_errors)
+                add_stats(p_stats)
                 bar()
+
+    def analyze(paths, title):
+        if executor is None:
+            results = map(lambda p: check_and_fingerprint(type, p, module, 
+                parser, analyses, cache, duplicates is not None, budget, profile), paths)
+        else:
+            # map keeps the order of the paths so that the errors are 
+            # merged in the same order as in a serial run
+            results = executor.map(partial(check_in_worker, type, module, 
+                duplicates is not None), paths)
+        add_results(results, len(paths), title)
+
+    def analyze_ir(ir: IRReader):
+        if executor is None:
+            results = map(lambda e: check_from_ir(e, analyses, 
+                duplicates is not None, budget, profile), ir)
+        else:
+            results = executor.map(partial(check_ir_in_worker, path, 
+                duplicates is not None), range(len(ir)))
+        add_results(results, len(ir), "ANALYZING INTERMEDIATE REPRESENTATION")
+
+    if from_ir:
+        with IRReader(path) as ir:
+            analyze_ir(ir)
+
+        if executor is not None:
+            executor.shutdown()
+    elif dataset:
+        for paths, title in dataset_paths(path, includeall, "ANALYZING"):
+            analyze(paths, title)
+
+        if executor is not None:
+            executor.shutdown()
     else:         
-        parse_and_check(type, path, module, parser, analyses, errors, file_stats)
-    
-    errors = sorted(set(errors), key=lambda e: (e.path, e.line, e.code))
-    
-    if output is None:
-        f = sys.stdout
-    else:
-        f = open(output, "w")
+        p_errors, p_stats, p_fingerprints = check_and_fingerprint(type, path, 
+            module, parser, analyses, cache, duplicates is not None, budget, profile)
+        add_fingerprints(p_fingerprints)
+        add_errors(p_errors)
+        add_stats(p_stats)
 
-    if linter:
-        for error in errors:
-            print(Error.ALL_ERRORS[error.code] + "," + error.to_csv(), file = f)
-    elif csv:
-        for error in errors:
-            print(error.to_csv(), file = f)
-    else:
+    if cache is not None:
+        cache.evict()
+
+    if sorter is not None:
+        for error_path, _, code, text in sorter.merge():
+            smell_stats.add(code, error_path)
+            print(text, file = f)
+    elif not stream:
+        errors = sorted(set(errors), key=lambda e: (e.path, e.line, e.code))
+        smell_stats.add_errors(errors)
         for error in errors:
-            print(error, file = f)
+            print(format_error(error, linter, csv), file = f)
 
     if f != sys.stdout: f.close()
+    slowest = None
+    if report is not None:
+        report.close()
+        slowest = report.slowest()
+    for skipped_path, reason in sorted(file_stats.skipped.items()):
+        print(f"Skipped '{skipped_path}': {reason}.", file=sys.stderr)
     if not linter:
-        print_stats(errors, smells, file_stats, tableformat)
+        print_stats(smell_stats, file_stats, tableformat, slowest)
+
+@glitch.command(short_help="Serves the analysis of files on request.",
+    help="Starts a server that analyzes files on request, keeping the parsers and analyses loaded "
+         "between requests. The requests follow the JSON-RPC 2.0 protocol, one per line."
+)
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=None,
+    help="Listen for connections on this port of localhost instead of using stdin/stdout.")
+def serve(port):
+    from glitch.server import serve as serve_requests
+    serve_requests(port)
+
+@glitch.command(short_help="Saves the intermediate representation of scripts.",
+    help="Parses the file or folder in PATH and saves its intermediate representation, so that it "
+         "can be analyzed many times (e.g. with different configs) with 'glitch --from-ir'."
+)
+@click.option('--tech',
+        type=click.Choice(Tech), required=True,
+        help="The IaC technology in which the scripts parsed are written in.")
+@click.option('--type',
+        type=click.Choice(UnitBlockType), default=UnitBlockType.unknown,
+        help="The type of scripts being parsed.")
+@click.option('--module', is_flag=True, default=False,
+    help="Use this flag if the folder you are going to parse is a module (e.g. Chef cookbook).")
+@click.option('--dataset', is_flag=True, default=False,
+    help="Use this flag if the folder being parsed is a dataset. A dataset is a folder with subfolders to be parsed.")
+@click.option('--includeall', multiple=True,
+    help="Parse all the files with a certain extension inside a folder (e.g. --includeall yml). "
+         "This flag is only relevant if you are using the dataset flag.")
+@click.option('--emit-ir', type=click.Path(dir_okay=False), required=True,
+    help="The file to which the intermediate representation is written.")
+@click.argument('path', type=click.Path(exists=True), required=True)
+def parse(tech, type, module, dataset, includeall, emit_ir, path):
+    parser = get_parser(tech)
+    with IRWriter(emit_ir, tech, type, module) as writer:
+        if dataset:
+            for paths, title in dataset_paths(path, includeall, "PARSING"):
+                with alive_bar(len(paths), title=title) as bar:
+                    for p in paths:
+                        parse_to_ir(type, p, module, parser, writer)
+                        bar()
+        else:
+            parse_to_ir(type, path, module, parser, writer)
 
 def main():
     glitch(prog_name='glitch')
 
-main()
+if __name__ == "__main__":
+    main()
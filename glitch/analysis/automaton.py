@@ -0,0 +1,86 @@
+from collections import deque
+from typing import List, Dict
+
+class AhoCorasick:
+    """Aho-Corasick automaton which finds which of a multiset of patterns
+    occur in a text with a single scan of the text.
+
+    Patterns can be added and removed at any moment. Removing a pattern or
+    adding a pattern which is already in the automaton does not change its
+    structure, so only adding new patterns requires the failure links to
+    be computed again (before the next search)."""
+
+    def __init__(self) -> None:
+        self.__goto: List[Dict[str, int]] = [{}]
+        self.__fail: List[int] = [0]
+        # Number of times each pattern ending in a node was added
+        self.__count: List[int] = [0]
+        # Next node in the failure chain where a pattern ends
+        self.__output: List[int] = [-1]
+        self.__ends: List[bool] = [False]
+        self.__dirty = False
+
+    def add(self, pattern: str):
+        node = 0
+        for c in pattern:
+            if c not in self.__goto[node]:
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__count.append(0)
+                self.__output.append(-1)
+                self.__ends.append(False)
+                self.__goto[node][c] = len(self.__goto) - 1
+                self.__dirty = True
+            node = self.__goto[node][c]
+
+        if not self.__ends[node]:
+            self.__ends[node] = True
+            self.__dirty = True
+        self.__count[node] += 1
+
+    def remove(self, pattern: str):
+        node = 0
+        for c in pattern:
+            node = self.__goto[node][c]
+        self.__count[node] -= 1
+
+    def __build(self):
+        queue = deque()
+        for node in self.__goto[0].values():
+            self.__fail[node] = 0
+            self.__output[node] = 0 if self.__ends[0] else -1
+            queue.append(node)
+
+        while len(queue) > 0:
+            node = queue.popleft()
+            for c, next in self.__goto[node].items():
+                fail = self.__fail[node]
+                while fail != 0 and c not in self.__goto[fail]:
+                    fail = self.__fail[fail]
+                fail = self.__goto[fail].get(c, 0)
+                self.__fail[next] = fail
+                self.__output[next] = fail if self.__ends[fail] else self.__output[fail]
+                queue.append(next)
+
+        self.__dirty = False
+
+    def count(self, text: str) -> int:
+        """Returns the number of patterns (with repetitions) which occur in
+        the text at least once."""
+        if self.__dirty:
+            self.__build()
+
+        goto, fail, output, ends = self.__goto, self.__fail, self.__output, self.__ends
+        found = {0} if ends[0] else set()
+        node = 0
+        for c in text:
+            while node != 0 and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+
+            match = node if ends[node] else output[node]
+            while match > 0 and match not in found:
+                found.add(match)
+                match = output[match]
+
+        return sum(self.__count[node] for node in found)
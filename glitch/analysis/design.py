@@ -1,15 +1,45 @@
 from cmath import inf
 import json
 import re
+from collections import Counter
 import configparser
-from glitch.analysis.rules import Error, RuleVisitor, SmellChecker
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+from glitch.analysis.rules import Error, ErrorSink, RuleVisitor, SmellChecker, rule
+from glitch.analysis.automaton import AhoCorasick
+from glitch.source import sources
+from glitch.analysis.duplicates import BLOCK_SIZE, strip_code, get_line, rolling_hashes
 from glitch.tech import Tech
 
 from glitch.repr.inter import *
 
+@dataclass(frozen=True)
+class DesignConfig:
+    """Configuration of the design smells, read from the [design] section
+    of a config file. It is immutable, so the same configuration can be
+    shared by visitors running in different threads."""
+
+    exec_atomic_units: FrozenSet[str]
+    default_variables: Tuple[str, ...]
+    # Symbol which references a variable (e.g. "$"), if the tech has one
+    var_refer_symbol: Optional[str]
+
+    @staticmethod
+    def load(config_path: str) -> "DesignConfig":
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        design = config['design']
+        return DesignConfig(
+            exec_atomic_units=frozenset(json.loads(design['exec_atomic_units'])),
+            default_variables=tuple(json.loads(design['default_variables'])),
+            var_refer_symbol=json.loads(design['var_refer_symbol']) 
+                if 'var_refer_symbol' in design else None,
+        )
+
 class DesignVisitor(RuleVisitor):
     class ImproperAlignmentSmell(SmellChecker):
-        def check(self, element, file: str):
+        @rule('implementation_improper_alignment')
+        def check(self, element, file: str, errors: ErrorSink):
             if isinstance(element, AtomicUnit):
                 identation = None
                 for a in element.attributes:
@@ -19,22 +49,14 @@ class DesignVisitor(RuleVisitor):
                     if (identation is None):
                         identation = curr_id
                     elif (identation != curr_id):
-                        return [Error('implementation_improper_alignment', 
-                            element, file, repr(element))]
-
-                return []
-            return []
+                        errors.emit(Error('implementation_improper_alignment', 
+                            element, file, repr(element)))
+                        return
 
     class PuppetImproperAlignmentSmell(SmellChecker):
-        cached_file = ""
-        lines = []
-
-        def check(self, element, file: str) -> list[Error]:
-            if DesignVisitor.PuppetImproperAlignmentSmell.cached_file != file:
-                with open(file, "r") as f:
-                    DesignVisitor.PuppetImproperAlignmentSmell.lines = f.readlines()
-                    DesignVisitor.PuppetImproperAlignmentSmell.cached_file = file
-            lines = DesignVisitor.PuppetImproperAlignmentSmell.lines
+        @rule('implementation_improper_alignment')
+        def check(self, element, file: str, errors: ErrorSink):
+            lines = sources.open(file).lines
 
             longest = 0
             longest_ident = 0
@@ -45,31 +67,34 @@ class DesignVisitor(RuleVisitor):
                     split = lines[a.line - 1].split('=>')[0]
                     longest_ident = len(split)
                     longest_split = split
-            if longest_split == "": return []
+            if longest_split == "": return
             elif len(longest_split) - 1 != len(longest_split.rstrip()):
-                return [Error('implementation_improper_alignment', 
-                    element, file, repr(element))]
+                errors.emit(Error('implementation_improper_alignment', 
+                    element, file, repr(element)))
+                return
 
             for a in element.attributes:
                 first_line = lines[a.line - 1]
                 cur_arrow_column = len(first_line.split('=>')[0])
                 if cur_arrow_column != longest_ident:
-                    return [Error('implementation_improper_alignment', 
-                            element, file, repr(element))]
-
-            return []
+                    errors.emit(Error('implementation_improper_alignment', 
+                            element, file, repr(element)))
+                    return
     
     class AnsibleImproperAlignmentSmell(SmellChecker):
         # YAML does not allow improper alignments (it also would have problems with generic attributes for all modules)
-        def check(self, element: AtomicUnit, file: str):
-            return []
+        @rule('implementation_improper_alignment')
+        def check(self, element: AtomicUnit, file: str, errors: ErrorSink):
+            pass
 
     class MisplacedAttribute(SmellChecker):
-        def check(self, element, file: str):
-            return []
+        @rule('design_misplaced_attribute')
+        def check(self, element, file: str, errors: ErrorSink):
+            pass
 
     class ChefMisplacedAttribute(SmellChecker):
-        def check(self, element, file: str):
+        @rule('design_misplaced_attribute')
+        def check(self, element, file: str, errors: ErrorSink):
             if isinstance(element, AtomicUnit):
                 order = []
                 for attribute in element.attributes:
@@ -83,23 +108,24 @@ class DesignVisitor(RuleVisitor):
                         order.append(4)
 
                 if order != sorted(order):
-                    return [Error('design_misplaced_attribute', element, file, repr(element))]
-            return []
+                    errors.emit(Error('design_misplaced_attribute', element, file, repr(element)))
 
     class PuppetMisplacedAttribute(SmellChecker):
-        def check(self, element, file: str):
+        @rule('design_misplaced_attribute')
+        def check(self, element, file: str, errors: ErrorSink):
             if isinstance(element, AtomicUnit):
                 for i, attr in enumerate(element.attributes):
                     if attr.name == "ensure" and i != 0:
-                        return [Error('design_misplaced_attribute', element, file, repr(element))]
+                        errors.emit(Error('design_misplaced_attribute', element, file, repr(element)))
+                        return
             elif isinstance(element, UnitBlock):
                 optional = False
                 for attr in element.attributes:
                     if attr.value is not None:
                         optional = True
                     elif optional == True:
-                        return [Error('design_misplaced_attribute', element, file, repr(element))]
-            return []
+                        errors.emit(Error('design_misplaced_attribute', element, file, repr(element)))
+                        return
 
     def __init__(self, tech: Tech) -> None:
         super().__init__(tech)
@@ -123,8 +149,13 @@ class DesignVisitor(RuleVisitor):
         else:
             self.comment = "//"
 
+        self.settings: DesignConfig = None
         self.variable_stack = []
         self.variables_names = []
+        # Variables checked in the current unit block, and the keys of the
+        # values of variables, which are not in scope
+        self.checked_variables = []
+        self.variable_keys = set()
         self.first_code_line = inf
 
     @staticmethod
@@ -132,28 +163,114 @@ class DesignVisitor(RuleVisitor):
         return "design"
 
     def config(self, config_path: str):
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        DesignVisitor.__EXEC = json.loads(config['design']['exec_atomic_units'])
-        DesignVisitor.__DEFAULT_VARIABLES = json.loads(config['design']['default_variables'])
-        if 'var_refer_symbol' not in config['design']:
-            DesignVisitor.__VAR_REFER_SYMBOL = None
-        else:
-            DesignVisitor.__VAR_REFER_SYMBOL = json.loads(config['design']['var_refer_symbol'])
+        self.settings = DesignConfig.load(config_path)
+
+        # Automaton with the references to the variables in scope, which is
+        # updated as the variables are added and removed
+        self.variables_automaton = AhoCorasick()
+        symbol = self.settings.var_refer_symbol
+        if symbol is not None:
+            for var in self.variables_names + list(self.settings.default_variables):
+                self.variables_automaton.add(symbol + var)
+
+    def __add_variable_name(self, name: str):
+        self.variables_names.append(name)
+        if self.settings.var_refer_symbol is not None:
+            self.variables_automaton.add(self.settings.var_refer_symbol + name)
 
-    def check_module(self, m: Module) -> list[Error]:
-        errors = super().check_module(m)
+    @staticmethod
+    def __duplicate_blocks(code: str, size: int) -> list[list[int]]:
+        """Returns the offsets of each block of size characters which appears
+        more than once in the code, ordered by their first occurrence. The 
+        hashes of the blocks are computed with a Rabin-Karp rolling hash and
+        the blocks with the same hash are compared to rule out collisions."""
+        # The modulus keeps the intermediate values small enough to be fast
+        hashes = rolling_hashes(code, size, (1 << 31) - 1)
+
+        repeated = {h for h, n in Counter(hashes).items() if n > 1}
+        if len(repeated) == 0:
+            return []
+
+        blocks = {}
+        for i, hash in enumerate(hashes):
+            if hash in repeated:
+                blocks.setdefault(code[i : i + size], []).append(i)
+        return [b for b in blocks.values() if len(b) >= 2]
+
+    def check_module(self, m: Module, errors: ErrorSink):
         # FIXME Needs to consider more things
         # if len(m.blocks) == 0:
-        #     errors.append(Error('design_unnecessary_abstraction', m, m.path, repr(m)))
-        return errors
+        #     errors.emit(Error('design_unnecessary_abstraction', m, m.path, repr(m)))
+        pass
+
+    def enter_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        try:
+            code_lines = sources.open(u.path).lines
+        except UnicodeDecodeError:
+            code_lines = []
+
+        self.first_non_comm_line = inf
+        for i, line in enumerate(code_lines):
+            if not line.startswith(self.comment): 
+                self.first_non_comm_line = i + 1
+                break 
+
+        # The attributes and variables of the unit block are in scope in the
+        # unit blocks inside it, which are checked after it. The variables
+        # are added when they are checked.
+        self.variable_stack.append(len(self.variables_names))
+        for attr in u.attributes:
+           self.__add_variable_name(attr.name)
+        self.checked_variables = []
+        self.variable_keys = set()
+
+    def exit_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        variable_size = self.variable_stack.pop()
+        if self.settings.var_refer_symbol is not None:
+            for name in self.variables_names[variable_size:]:
+                self.variables_automaton.remove(self.settings.var_refer_symbol + name)
+        if (variable_size == 0): self.variables_names = []
+        else: self.variables_names = self.variables_names[:variable_size]
 
-    def check_unitblock(self, u: UnitBlock) -> list[Error]:
+    def check_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        # The elements of the unit block are checked before it, so all its
+        # variables (including the ones inside statements) were checked
+        for v in self.checked_variables:
+            if id(v) not in self.variable_keys:
+                self.__add_variable_name(v.name)
+        self.checked_variables = []
+        self.variable_keys = set()
+
+        source = sources.open(u.path)
+        try:
+            code_lines = source.lines
+            all_code = source.text
+        except UnicodeDecodeError:
+            return
+
+        self.__check_imperative_abstraction(u, errors)
+        self.__check_tabs(u, code_lines, errors)
+        self.__check_long_statements(u, code_lines, errors)
+        self.__check_too_many_variables(u, code_lines, errors)
+        self.__check_unguarded_variables(u, code_lines, errors)
+        self.__check_duplicate_blocks(u, code_lines, all_code, errors)
+
+        # FIXME Needs to consider more things
+        # if (len(u.statements) == 0 and len(u.atomic_units) == 0 and
+        #         len(u.variables) == 0 and len(u.unit_blocks) == 0 and
+        #             len(u.attributes) == 0):
+        #     errors.emit(Error('design_unnecessary_abstraction', u, u.path, repr(u)))
+
+        self.misplaced_attr.check(u, u.path, errors)
+        self.imp_align.check(u, u.path, errors)
+
+    @rule('design_imperative_abstraction')
+    def __check_imperative_abstraction(self, u: UnitBlock, errors: ErrorSink):
         def count_atomic_units(ub: UnitBlock):
             count_resources = len(ub.atomic_units)
             count_execs = 0
             for au in ub.atomic_units:
-                if au.type in DesignVisitor.__EXEC:
+                if au.type in self.settings.exec_atomic_units:
                     count_execs += 1
             
             for unitblock in ub.unit_blocks:
@@ -163,56 +280,30 @@ class DesignVisitor(RuleVisitor):
 
             return count_resources, count_execs
 
-        with open(u.path, "r") as f:
-            try:
-                code_lines = f.readlines()
-                f.seek(0, 0)
-                all_code = f.read()
-                code = ""
-            except UnicodeDecodeError:
-                return []
-
-        self.first_non_comm_line = inf
-        for i, line in enumerate(code_lines):
-            if not line.startswith(self.comment): 
-                self.first_non_comm_line = i + 1
-                break 
-
-        self.variable_stack.append(len(self.variables_names))
-        for attr in u.attributes:
-           self.variables_names.append(attr.name)
-
-        errors = []
-        # The order is important
-        for au in u.atomic_units:
-            errors += self.check_atomicunit(au, u.path)
-        for v in u.variables:
-            errors += self.check_variable(v, u.path)
-        for a in u.attributes:
-            errors += self.check_attribute(a, u.path)
-        for d in u.dependencies:
-            errors += self.check_dependency(d, u.path)
-        for s in u.statements:
-            errors += self.check_element(s, u.path)
-        for c in u.comments:
-            errors += self.check_comment(c, u.path)
-
         total_resources, total_execs = count_atomic_units(u)
 
         if total_execs > 2 and (total_execs / total_resources) > 0.20:
-            errors.append(Error('design_imperative_abstraction', u, u.path, repr(u)))
+            errors.emit(Error('design_imperative_abstraction', u, u.path, repr(u)))
 
+    @rule('implementation_improper_alignment')
+    def __check_tabs(self, u: UnitBlock, code_lines: list[str], errors: ErrorSink):
         for i, line in enumerate(code_lines):
             if ("\t" in line):
                 error = Error('implementation_improper_alignment', 
                     u, u.path, repr(u))
                 error.line = i + 1
-                errors.append(error)
+                errors.emit(error)
+
+    @rule('implementation_long_statement')
+    def __check_long_statements(self, u: UnitBlock, code_lines: list[str], errors: ErrorSink):
+        for i, line in enumerate(code_lines):
             if len(line) > 140:
                 error = Error('implementation_long_statement', u, u.path, line)
                 error.line = i + 1
-                errors.append(error)
+                errors.emit(error)
 
+    @rule('implementation_too_many_variables')
+    def __check_too_many_variables(self, u: UnitBlock, code_lines: list[str], errors: ErrorSink):
         def count_variables(vars: list[Variable]):
             count = 0
             for var in vars:
@@ -225,118 +316,78 @@ class DesignVisitor(RuleVisitor):
         # The UnitBlock should not be of type vars, because these files are supposed to only
         # have variables
         if count_variables(u.variables) / max(len(code_lines), 1) > 0.3 and u.type != UnitBlockType.vars:
-            errors.append(Error('implementation_too_many_variables', u, u.path, repr(u)))
+            errors.emit(Error('implementation_too_many_variables', u, u.path, repr(u)))
 
-        if DesignVisitor.__VAR_REFER_SYMBOL is not None:
+    @rule('implementation_unguarded_variable')
+    def __check_unguarded_variables(self, u: UnitBlock, code_lines: list[str], errors: ErrorSink):
+        if self.settings.var_refer_symbol is not None:
             # FIXME could be improved if we considered strings as part of the model
             for i, l in enumerate(code_lines):
                 for tuple in re.findall(r'(\'([^\\]|(\\(\n|.)))*?\')|(\"([^\\]|(\\(\n|.)))*?\")', l):
                     for string in (tuple[0], tuple[4]):
-                        for var in self.variables_names + DesignVisitor.__DEFAULT_VARIABLES:
-                            if (DesignVisitor.__VAR_REFER_SYMBOL + var) in string[1:-1]:
-                                error = Error('implementation_unguarded_variable', u, u.path, string)
-                                error.line = i + 1
-                                errors.append(error)
-
-        def get_line(i ,lines):
-            for j, line in lines:
-                if i < j:
-                    return line
-
-        lines = []
-        current_line = 1
-        i = 0
-        for c in all_code:
-            if c == '\n':
-                lines.append((i, current_line))
-                current_line += 1
-            elif not c.isspace():
-                code += c
-                i += 1
-        lines.append((i, current_line))
-
-        blocks = {}
-        for i in range(len(code) - 150):
-            hash = code[i : i + 150].__hash__()
-            if hash not in blocks:
-                blocks[hash] = [i]
-            else:
-                blocks[hash].append(i)
-
-        # Note: changing the structure to a set instead of a list increased the speed A LOT
+                        # One error for each variable referenced in the string
+                        for _ in range(self.variables_automaton.count(string[1:-1])):
+                            error = Error('implementation_unguarded_variable', u, u.path, string)
+                            error.line = i + 1
+                            errors.emit(error)
+
+    @rule('design_duplicate_block')
+    def __check_duplicate_blocks(self, u: UnitBlock, code_lines: list[str], all_code: str, 
+            errors: ErrorSink):
+        code, lines = strip_code(all_code)
         checked = set()
-        for _, value in blocks.items():
-            if len(value) >= 2:
-                for i in value:
-                    if i not in checked:
-                        line = get_line(i, lines)
-                        error = Error('design_duplicate_block', u, u.path, code_lines[line - 1])
-                        error.line = line
-                        errors.append(error)
-                        checked.update(range(i, i + 150))
-
-        # FIXME Needs to consider more things
-        # if (len(u.statements) == 0 and len(u.atomic_units) == 0 and
-        #         len(u.variables) == 0 and len(u.unit_blocks) == 0 and
-        #             len(u.attributes) == 0):
-        #     errors.append(Error('design_unnecessary_abstraction', u, u.path, repr(u)))
-
-        errors += self.misplaced_attr.check(u, u.path)
-        errors += self.imp_align.check(u, u.path)
-
-        # The unit blocks inside should only be considered after in order to
-        # have the correct variables
-        for ub in u.unit_blocks:
-            errors += self.check_unitblock(ub)
-
-        variable_size = self.variable_stack.pop()
-        if (variable_size == 0): self.variables_names = []
-        else: self.variables_names = self.variables_names[:variable_size]
-
-        return errors
-
-    def check_condition(self, c: ConditionalStatement, file: str) -> list[Error]:
-        return super().check_condition(c, file)
-
-    def check_atomicunit(self, au: AtomicUnit, file: str) -> list[Error]:
-        errors = super().check_atomicunit(au, file)
-        errors += self.imp_align.check(au, file)
-        errors += self.misplaced_attr.check(au, file)
-
-        if au.type in DesignVisitor.__EXEC:
+        for block in DesignVisitor.__duplicate_blocks(code, BLOCK_SIZE):
+            for i in block:
+                if i not in checked:
+                    line = get_line(lines, i)
+                    error = Error('design_duplicate_block', u, u.path, code_lines[line - 1])
+                    error.line = line
+                    errors.emit(error)
+                    checked.update(range(i, i + BLOCK_SIZE))
+
+    def check_atomicunit(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        self.imp_align.check(au, file, errors)
+        self.misplaced_attr.check(au, file, errors)
+        self.__check_multifaceted_abstraction(au, file, errors)
+        self.__check_long_resource(au, file, errors)
+
+    @rule('design_multifaceted_abstraction')
+    def __check_multifaceted_abstraction(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        if au.type in self.settings.exec_atomic_units:
             if ("&&" in au.name or ";" in au.name or "|" in au.name):
-                errors.append(Error("design_multifaceted_abstraction", au, file, repr(au)))
+                errors.emit(Error("design_multifaceted_abstraction", au, file, repr(au)))
             else:
                 for attribute in au.attributes:
                     value = repr(attribute.value)
                     if ("&&" in value or ";" in value or "|" in value):
-                        errors.append(Error("design_multifaceted_abstraction", au, file, repr(au)))
+                        errors.emit(Error("design_multifaceted_abstraction", au, file, repr(au)))
                         break
 
-
-        if au.type in DesignVisitor.__EXEC:
+    @rule('design_long_resource')
+    def __check_long_resource(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        if au.type in self.settings.exec_atomic_units:
             lines = 0
             for attr in au.attributes:
                 for line in attr.code.split('\n'):
                     if line.strip() != "": lines += 1
 
             if lines > 7: 
-                errors.append(Error("design_long_resource", au, file, repr(au)))
+                errors.emit(Error("design_long_resource", au, file, repr(au)))
 
-        return errors
+    def check_dependency(self, d: Dependency, file: str, errors: ErrorSink):
+        pass
 
-    def check_dependency(self, d: Dependency, file: str) -> list[Error]:
-        return []
+    def check_attribute(self, a: Attribute, file: str, errors: ErrorSink):
+        pass
 
-    def check_attribute(self, a: Attribute, file: str) -> list[Error]:
-        return []
+    def check_variable(self, v: Variable, file: str, errors: ErrorSink):
+        self.checked_variables.append(v)
+        self.variable_keys.update(id(kv) for kv in v.keyvalues)
 
-    def check_variable(self, v: Variable, file: str) -> list[Error]:
-        self.variables_names.append(v.name)
-        return []
+    def check_comment(self, c: Comment, file: str, errors: ErrorSink):
+        self.__check_avoid_comments(c, file, errors)
 
-    def check_comment(self, c: Comment, file: str) -> list[Error]:
-        errors = []
+    @rule('design_avoid_comments')
+    def __check_avoid_comments(self, c: Comment, file: str, errors: ErrorSink):
         if c.line >= self.first_non_comm_line:
-            errors.append(Error('design_avoid_comments', c, file, repr(c)))
-        return errors
+            errors.emit(Error('design_avoid_comments', c, file, repr(c)))
@@ -0,0 +1,129 @@
+import bisect
+from collections import deque
+from itertools import accumulate
+from typing import Tuple, List, Dict
+
+from glitch.analysis.rules import Error
+from glitch.source import sources
+
+# Number of non-whitespace characters in a block
+BLOCK_SIZE = 150
+
+def strip_code(code: str) -> Tuple[str, List[int]]:
+    """Returns the code without whitespace and the number of non-whitespace
+    characters up to the end of each line."""
+    lines, i = [], 0
+    for line in code.split('\n'):
+        i += sum(map(len, line.split()))
+        lines.append(i)
+    return "".join(code.split()), lines
+
+def get_line(lines: List[int], i: int) -> int:
+    """Returns the line of the i-th character of the stripped code."""
+    return bisect.bisect_right(lines, i) + 1
+
+def rolling_hashes(code: str, size: int, mod: int) -> List[int]:
+    """Returns the Rabin-Karp hash of each block of size characters in the
+    code, except the last one (to keep the previous behavior of the
+    duplicate block smell)."""
+    if len(code) - size <= 0:
+        return []
+
+    base = 257
+    # Weight of the first character of a block
+    first = pow(base, size - 1, mod)
+    chars = list(map(ord, code))
+
+    hash = 0
+    for c in chars[:size]:
+        hash = (hash * base + c) % mod
+    # The hash of each block is computed from the hash of the previous
+    # one by removing its first character and adding the next one
+    return list(accumulate(zip(chars, chars[size:len(code) - 1]),
+        lambda h, c: ((h - c[0] * first) * base + c[1]) % mod, initial=hash))
+
+def winnow(hashes: List[int], window: int) -> List[int]:
+    """Returns the offsets of the hashes selected by winnowing: the minimum
+    hash (the rightmost one on ties) of each window of consecutive hashes.
+    Any two codes which share a sequence of window hashes share at least
+    one of the selected hashes."""
+    selected, candidates = [], deque()
+    for i, hash in enumerate(hashes):
+        while len(candidates) > 0 and hashes[candidates[-1]] >= hash:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1 and (len(selected) == 0 or selected[-1] != candidates[0]):
+            selected.append(candidates[0])
+    if len(selected) == 0 and len(hashes) > 0:
+        selected.append(candidates[0])
+    return selected
+
+Fingerprints = List[Tuple[int, int]]
+
+def fingerprint(path: str, window: int = 50) -> Fingerprints:
+    """Returns the (hash, line) of the fingerprints of the blocks of the file.
+    A block duplicated in another file is found if the duplicated code has
+    at least BLOCK_SIZE + window - 1 non-whitespace characters."""
+    try:
+        code, lines = strip_code(sources.open(path).text)
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    # A bigger modulus makes collisions between the blocks of a large
+    # dataset unlikely, since the blocks are not compared
+    hashes = rolling_hashes(code, BLOCK_SIZE, (1 << 61) - 1)
+    return [(hashes[i], get_line(lines, i)) for i in winnow(hashes, window)]
+
+
+class DuplicateIndex:
+    """Index with the fingerprints of the files analyzed so far, which finds
+    the blocks duplicated between files. Each duplicate is reported in both
+    files.
+
+    The memory used is bounded by keeping at most max_size fingerprints.
+    When the index is full, only the fingerprints whose hash is a multiple
+    of the next power of two are kept, from then on. Since a large
+    duplicated block has many fingerprints, it is still likely to be found."""
+
+    DEFAULT_MAX_SIZE = 1000000
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.__fingerprints: Dict[int, Tuple[str, int]] = {}
+        self.__mask = 0
+
+    def __len__(self) -> int:
+        return len(self.__fingerprints)
+
+    @staticmethod
+    def __error(path: str, line: int, other_path: str, other_line: int) -> Error:
+        error = Error('design_duplicate_block', None, path,
+            f"Duplicate of the block in {other_path} (line {other_line})")
+        error.line = line
+        return error
+
+    def add(self, path: str, fingerprints: Fingerprints) -> List[Error]:
+        """Adds the fingerprints of a file and returns the errors of the blocks
+        it shares with the files added before."""
+        errors, last = [], None
+        for hash, line in fingerprints:
+            if hash & self.__mask != 0:
+                continue
+
+            other = self.__fingerprints.get(hash)
+            if other is None:
+                self.__fingerprints[hash] = (path, line)
+            elif other[0] != path and other[0] != last:
+                # Consecutive fingerprints from the same file are usually
+                # the same duplicated block, which is only reported once
+                errors.append(DuplicateIndex.__error(path, line, *other))
+                errors.append(DuplicateIndex.__error(*other, path, line))
+            last = other[0] if other is not None else None
+
+        while len(self.__fingerprints) > self.max_size:
+            self.__mask = (self.__mask << 1) | 1
+            self.__fingerprints = {h: l for h, l in self.__fingerprints.items()
+                if h & self.__mask == 0}
+        return errors
@@ -1,6 +1,13 @@
+import time
+import threading
+from contextlib import ExitStack
 from glitch.tech import Tech
 from glitch.repr.inter import *
+from glitch.source import sources
+from glitch.budget import shielded
+from glitch.dispatch import TypeDispatch
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 class Error():
     ERRORS = {
@@ -59,15 +66,26 @@ class Error():
         return f"{self.path},{self.line},{self.code},{repr}"
 
     def __repr__(self) -> str:
-        with open(self.path) as f:
-            line = f.readlines()[self.line - 1].strip() if self.line != -1 else self.repr.split('\n')[0]
-            return \
-                f"{self.path}\nIssue on line {self.line}: {Error.ALL_ERRORS[self.code]}\n" + \
-                    f"{line}\n"
+        if self.line != -1:
+            # The errors of a file are usually printed together, so the file
+            # is kept in the cache of recent files instead of read again
+            line = sources.open(self.path, keep=False).lines[self.line - 1].strip()
+        else:
+            line = self.repr.split('\n')[0]
+        return \
+            f"{self.path}\nIssue on line {self.line}: {Error.ALL_ERRORS[self.code]}\n" + \
+                f"{line}\n"
 
     def __hash__(self):
         return hash((self.code, self.path, self.line))
 
+    def __getstate__(self):
+        # The element is only needed to compute the line. Dropping it avoids
+        # pickling the whole IR when errors are sent between processes.
+        state = self.__dict__.copy()
+        state['el'] = None
+        return state
+
     def __eq__(self, other):
         if not isinstance(other, type(self)): return NotImplemented
         return self.code == other.code and self.path == other.path and\
@@ -75,39 +93,133 @@ class Error():
 
 Error.agglomerate_errors()
 
+class ErrorSink:
+    """Collects the errors found by the visitors. The sink is passed down
+    the traversal and each check emits its errors into it, instead of
+    returning a list which its caller has to concatenate. An error equal
+    to one already collected (same code, path and line) is discarded, so
+    the first one emitted is kept."""
+
+    __slots__ = ("__errors",)
+
+    def __init__(self) -> None:
+        # Dicts keep the insertion order
+        self.__errors: Dict[Error, None] = {}
+
+    def emit(self, error: Error):
+        self.__errors.setdefault(error)
+
+    def extend(self, errors: Iterable[Error]):
+        for error in errors:
+            self.__errors.setdefault(error)
+
+    def __contains__(self, error: Error) -> bool:
+        return error in self.__errors
+
+    def __len__(self) -> int:
+        return len(self.__errors)
+
+    def __iter__(self) -> Iterator[Error]:
+        return iter(self.__errors)
+
+def rule(*codes: str):
+    """Decorator of the method of a visitor (or of a SmellChecker) which 
+    checks the smells with the given codes. When the rules are profiled, 
+    the cost of the method is attributed to the first code, since the 
+    other ones are found by the same checks."""
+    def decorator(method):
+        method.codes = codes
+        return method
+    return decorator
+
+class RuleCosts:
+    """CPU time spent in the rules of each smell code and number of times
+    they were invoked. The CPU time of the process is used, so the time
+    spent waiting (e.g. for other processes of --jobs) is not counted."""
+
+    def __init__(self) -> None:
+        self.time: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def timed(self, code: str, method: Callable) -> Callable:
+        """Returns the method, measured as a rule of the code."""
+        self.time.setdefault(code, 0.0)
+        self.calls.setdefault(code, 0)
+
+        def timed(*args):
+            start = time.process_time()
+            try:
+                return method(*args)
+            finally:
+                self.time[code] += time.process_time() - start
+                self.calls[code] += 1
+        return timed
+
+    def merge(self, other: "RuleCosts"):
+        for code, t in other.time.items():
+            self.time[code] = self.time.get(code, 0.0) + t
+        for code, n in other.calls.items():
+            self.calls[code] = self.calls.get(code, 0) + n
+
+    def clear(self):
+        for code in self.time:
+            self.time[code] = 0.0
+            self.calls[code] = 0
+
+    def __bool__(self) -> bool:
+        return any(n > 0 for n in self.calls.values())
+
+def profile_rules(obj, costs: RuleCosts):
+    """Replaces the rules of obj (methods decorated with @rule) by methods
+    which measure their cost. The class of obj is not changed, so the 
+    rules of other objects are not measured."""
+    rules = {}
+    for cls in type(obj).__mro__:
+        for name, method in vars(cls).items():
+            codes = getattr(method, "codes", None)
+            # The method of the subclass overrides the others
+            if codes is not None and name not in rules:
+                rules[name] = codes[0]
+
+    # The methods are found before any of them is replaced
+    methods = {name: getattr(obj, name) for name in rules}
+    for name, code in rules.items():
+        setattr(obj, name, costs.timed(code, methods[name]))
+
 class RuleVisitor(ABC):
+    """Rules of a family of smells. The visitors do not walk the IR: a
+    Traversal visits each element once and calls the check of every
+    visitor for it, after the elements inside it were checked. The state
+    which depends on the unit block being checked (e.g. the variables in
+    scope) is kept by the enter_unitblock and exit_unitblock hooks, so a
+    visitor checks one code at a time (see Traversal.check)."""
+
+    # Check of each class of element. The visitors of new rules can 
+    # register checks for other classes of elements with
+    # @RuleVisitor.elements.register(cls)
+    elements = TypeDispatch()
+
     def __init__(self, tech: Tech) -> None:
         super().__init__()
         self.tech = tech
-
-    def check(self, code) -> list[Error]:
-        if isinstance(code, Project):
-            return self.check_project(code)
-        elif isinstance(code, Module):
-            return self.check_module(code)
-        elif isinstance(code, UnitBlock):
-            return self.check_unitblock(code)
-
-    def check_element(self, c, file: str) -> list[Error]:
-        if isinstance(c, AtomicUnit):
-            return self.check_atomicunit(c, file)
-        elif isinstance(c, Dependency):
-            return self.check_dependency(c, file)
-        elif isinstance(c, Attribute):
-            return self.check_attribute(c, file)
-        elif isinstance(c, Variable):
-            return self.check_variable(c, file)
-        elif isinstance(c, ConditionalStatement):
-            return self.check_condition(c, file)
-        elif isinstance(c, Comment):
-            return self.check_comment(c, file)
-        elif isinstance(c, dict):
-            errors = []
-            for k, v in c.items():
-                errors += self.check_element(k, file) + self.check_element(v, file)
-            return errors
-        else:
-            return []
+        # Costs of the rules, if they are profiled
+        self.costs: RuleCosts = None
+        # Held while the visitor checks some code
+        self.lock = threading.RLock()
+
+    def profile_rules(self):
+        """Measures the cost of the rules of the visitor (and of its smell
+        checkers) in self.costs, from now on."""
+        self.costs = RuleCosts()
+        profile_rules(self, self.costs)
+        for checker in vars(self).values():
+            if isinstance(checker, SmellChecker):
+                profile_rules(checker, self.costs)
+
+    def check(self, code, errors: ErrorSink = None) -> ErrorSink:
+        """Checks the code and returns the sink with the errors found. A new
+        sink is used if none is given."""
+        return Traversal([self]).check(code, errors)
 
     @abstractmethod
     def get_name() -> str:
@@ -117,76 +229,184 @@ class RuleVisitor(ABC):
     def config(self, config_path: str):
         pass
 
-    def check_project(self, p: Project) -> list[Error]:
-        errors = []
-        for m in p.modules:
-            errors += self.check_module(m)
-
-        for u in p.blocks:
-            errors += self.check_unitblock(u)
-
-        return errors
-
-    def check_module(self, m: Module) -> list[Error]:
-        errors = []
-        for u in m.blocks:
-            errors += self.check_unitblock(u)
-
-        return errors
+    def check_project(self, p: Project, errors: ErrorSink):
+        pass
 
-    def check_unitblock(self, u: UnitBlock) -> list[Error]:
-        errors = []
-        for au in u.atomic_units:
-            errors += self.check_atomicunit(au, u.path)
-        for c in u.comments:
-            errors += self.check_comment(c, u.path)
-        for v in u.variables:
-            errors += self.check_variable(v, u.path)
-        for ub in u.unit_blocks:
-            errors += self.check_unitblock(ub)
-        for a in u.attributes:
-            errors += self.check_attribute(a, u.path)
-        for s in u.statements:
-            errors += self.check_element(s, u.path)
+    def check_module(self, m: Module, errors: ErrorSink):
+        pass
 
-        return errors
+    def enter_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        """Called before the elements of the unit block are checked."""
+        pass
 
-    def check_atomicunit(self, au: AtomicUnit, file: str) -> list[Error]:
-        errors = []
-        for a in au.attributes:
-            errors += self.check_attribute(a, file)
+    def check_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        """Called after the elements of the unit block are checked, but
+        before the unit blocks inside it."""
+        pass
 
-        for s in au.statements:
-            errors += self.check_element(s, file)
+    def exit_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        """Called after the unit blocks inside the unit block are checked."""
+        pass
 
-        return errors
+    @elements.register(AtomicUnit)
+    def check_atomicunit(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        pass
 
+    @elements.register(Dependency)
     @abstractmethod
-    def check_dependency(self, d: Dependency, file: str) -> list[Error]:
+    def check_dependency(self, d: Dependency, file: str, errors: ErrorSink):
         pass
 
+    @elements.register(Attribute)
     @abstractmethod
-    def check_attribute(self, a: Attribute, file: str) -> list[Error]:
+    def check_attribute(self, a: Attribute, file: str, errors: ErrorSink):
         pass
 
+    @elements.register(Variable)
     @abstractmethod
-    def check_variable(self, v: Variable, file: str) -> list[Error]:
+    def check_variable(self, v: Variable, file: str, errors: ErrorSink):
         pass
 
-    def check_condition(self, c: ConditionalStatement, file: str) -> list[Error]:
-        errors = []
-
-        for s in c.statements:
-            errors += self.check_element(s, file)
-
-        return errors
+    @elements.register(ConditionalStatement)
+    def check_condition(self, c: ConditionalStatement, file: str, errors: ErrorSink):
+        pass
 
+    @elements.register(Comment)
     @abstractmethod
-    def check_comment(self, c: Comment, file: str) -> list[Error]:
+    def check_comment(self, c: Comment, file: str, errors: ErrorSink):
         pass
 Error.agglomerate_errors()
 
+class Traversal:
+    """Checks the code with several visitors in a single pass. Each element
+    is visited once and the checks of all the visitors for its class are
+    found once per class, so the cost grows with the size of the IR and
+    not with the number of visitors.
+
+    The elements inside an element are checked before it. The elements of
+    a unit block are checked in the order: atomic units, variables,
+    attributes, dependencies, statements and comments."""
+
+    # Visit of the elements inside each class of element
+    children = TypeDispatch()
+
+    def __init__(self, visitors: List[RuleVisitor]) -> None:
+        self.visitors = visitors
+        self.__checks: Dict[type, Tuple[Tuple[Callable, RuleVisitor], ...]] = {}
+
+    def check(self, code, errors: ErrorSink = None) -> ErrorSink:
+        """Checks the code and returns the sink with the errors found. A new
+        sink is used if none is given.
+
+        The visitors keep the state of the code being checked, so they are
+        locked during the check: checks in different threads which share
+        some visitor run one after the other."""
+        if errors is None:
+            errors = ErrorSink()
+        # Locked in the same order by every check, so that checks sharing
+        # several visitors cannot deadlock
+        locks = sorted({id(v.lock): v.lock for v in self.visitors}.items())
+        with ExitStack() as stack:
+            for _, lock in locks:
+                # The release is registered before the check can be
+                # interrupted (e.g. by the budget of the file)
+                shielded(stack.enter_context, lock)
+
+            if isinstance(code, Project):
+                self.visit_project(code, errors)
+            elif isinstance(code, Module):
+                self.visit_module(code, errors)
+            elif isinstance(code, UnitBlock):
+                self.visit_unitblock(code, errors)
+        return errors
+
+    def __checks_of(self, cls: type) -> Tuple[Tuple[Callable, RuleVisitor], ...]:
+        checks = self.__checks.get(cls)
+        if checks is None:
+            checks = self.__checks[cls] = tuple((check, visitor) 
+                for visitor in self.visitors
+                for check in (RuleVisitor.elements.handlers(visitor.__class__)[cls],)
+                if check is not None)
+        return checks
+
+    def visit(self, c, file: str, errors: ErrorSink):
+        visit = Traversal.children.handlers(self.__class__)[c.__class__]
+        if visit is not None:
+            visit(self, c, file, errors)
+        for check, visitor in self.__checks_of(c.__class__):
+            check(visitor, c, file, errors)
+
+    def visit_project(self, p: Project, errors: ErrorSink):
+        for m in p.modules:
+            self.visit_module(m, errors)
+        for u in p.blocks:
+            self.visit_unitblock(u, errors)
+        for visitor in self.visitors:
+            visitor.check_project(p, errors)
+
+    def visit_module(self, m: Module, errors: ErrorSink):
+        for u in m.blocks:
+            self.visit_unitblock(u, errors)
+        for visitor in self.visitors:
+            visitor.check_module(m, errors)
+
+    def visit_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        entered = []
+        try:
+            shielded(self.__enter_unitblock, u, errors, entered)
+
+            for elements in (u.atomic_units, u.variables, u.attributes,
+                    u.dependencies, u.statements, u.comments):
+                for c in elements:
+                    self.visit(c, u.path, errors)
+
+            for visitor in self.visitors:
+                visitor.check_unitblock(u, errors)
+            for ub in u.unit_blocks:
+                self.visit_unitblock(ub, errors)
+        finally:
+            # The visitors keep the scope of the unit block (e.g. its
+            # variables) until it is exited, so it is exited even if the
+            # check is aborted (e.g. by the budget of the file). Entering
+            # and exiting it are not interrupted by the budget.
+            shielded(self.__exit_unitblock, u, errors, entered)
+
+    def __enter_unitblock(self, u: UnitBlock, errors: ErrorSink, entered: List[RuleVisitor]):
+        for visitor in self.visitors:
+            visitor.enter_unitblock(u, errors)
+            entered.append(visitor)
+
+    def __exit_unitblock(self, u: UnitBlock, errors: ErrorSink, entered: List[RuleVisitor]):
+        for visitor in reversed(entered):
+            visitor.exit_unitblock(u, errors)
+
+    @children.register(AtomicUnit)
+    def visit_atomicunit(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        for a in au.attributes:
+            self.visit(a, file, errors)
+        for s in au.statements:
+            self.visit(s, file, errors)
+
+    @children.register(KeyValue)
+    def visit_keyvalue(self, kv: KeyValue, file: str, errors: ErrorSink):
+        if kv.value is None:
+            for child in kv.keyvalues:
+                self.visit(child, file, errors)
+        elif not isinstance(kv.value, str):
+            self.visit(kv.value, file, errors)
+
+    @children.register(ConditionalStatement)
+    def visit_condition(self, c: ConditionalStatement, file: str, errors: ErrorSink):
+        for s in c.statements:
+            self.visit(s, file, errors)
+
+    @children.register(dict)
+    def visit_dict(self, d: dict, file: str, errors: ErrorSink):
+        for k, v in d.items():
+            self.visit(k, file, errors)
+            self.visit(v, file, errors)
+
 class SmellChecker(ABC):
     @abstractmethod
-    def check(self, element, file: str) -> list[Error]:
+    def check(self, element, file: str, errors: ErrorSink):
         pass
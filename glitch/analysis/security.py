@@ -3,37 +3,141 @@ import re
 import json
 import configparser
 from urllib.parse import urlparse
-from typing import Tuple, List, Optional
+from dataclasses import dataclass
+from typing import FrozenSet, Tuple, List, Optional, Iterator, Pattern
 
 import glitch
-from glitch.analysis.rules import Error, RuleVisitor, SmellChecker
+from glitch.analysis.rules import Error, ErrorSink, RuleVisitor, SmellChecker, rule
 
 from glitch.repr.inter import *
 from glitch.tech import Tech
 
 
+@dataclass(frozen=True)
+class SecurityConfig:
+    """Configuration of the security smells, read from the [security]
+    section of a config file, with its regexes already compiled. It is
+    immutable, so the same configuration can be shared by visitors running
+    in different threads."""
+
+    KEYWORD_REGEX = r'[_A-Za-z0-9$\/\.\[\]-]*{text}\b'
+    MISC_SECRET_REGEX = r'([_A-Za-z0-9$-]*[-_]{text}([-_].*)?$)|(^{text}([-_].*)?$)'
+
+    wrong_words: Tuple[str, ...]
+    passwords: Tuple[str, ...]
+    users: Tuple[str, ...]
+    profile: FrozenSet[str]
+    secrets: Tuple[str, ...]
+    misc_secrets: Tuple[str, ...]
+    roles: Tuple[str, ...]
+    download: Tuple[str, ...]
+    ssh_dirs: Tuple[str, ...]
+    admin: Tuple[str, ...]
+    checksum: Tuple[str, ...]
+    crypt: Tuple[str, ...]
+    crypt_whitelist: Tuple[str, ...]
+    url_whitelist: FrozenSet[str]
+    file_commands: Tuple[str, ...]
+    download_commands: Tuple[str, ...]
+    shell_resources: Tuple[str, ...]
+    ip_bind_commands: FrozenSet[str]
+    obsolete_commands: FrozenSet[str]
+    docker_official_images: FrozenSet[str]
+
+    roles_users_regex: Tuple[Pattern, Tuple[Tuple[str, Pattern], ...]]
+    secrets_regex: Tuple[Pattern, Tuple[Tuple[str, Pattern], ...]]
+    misc_secrets_regex: Tuple[Pattern, Tuple[Tuple[str, Pattern], ...]]
+    # Regex of a download URL for each extension in download
+    download_regexes: Tuple[Pattern, ...]
+
+    @staticmethod
+    def load(config_path: str) -> "SecurityConfig":
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        security = config['security']
+
+        def load_list(key: str) -> Tuple[str, ...]:
+            return tuple(json.loads(security[key]))
+
+        passwords, users = load_list('passwords'), load_list('users')
+        secrets, misc_secrets = load_list('secrets'), load_list('misc_secrets')
+        roles, download = load_list('roles'), load_list('download_extensions')
+        return SecurityConfig(
+            wrong_words=load_list('suspicious_words'),
+            passwords=passwords,
+            users=users,
+            profile=frozenset(load_list('profile')),
+            secrets=secrets,
+            misc_secrets=misc_secrets,
+            roles=roles,
+            download=download,
+            ssh_dirs=load_list('ssh_dirs'),
+            admin=load_list('admin'),
+            checksum=load_list('checksum'),
+            crypt=load_list('weak_crypt'),
+            crypt_whitelist=load_list('weak_crypt_whitelist'),
+            url_whitelist=frozenset(load_list('url_http_white_list')),
+            file_commands=load_list('file_commands'),
+            download_commands=load_list('download_commands'),
+            shell_resources=load_list('shell_resources'),
+            ip_bind_commands=frozenset(load_list('ip_binding_commands')),
+            obsolete_commands=frozenset(SecurityConfig.__load_data_file("obsolete_commands")),
+            docker_official_images=frozenset(
+                SecurityConfig.__load_data_file("official_docker_images")),
+            roles_users_regex=SecurityConfig.__compile_keywords(
+                SecurityConfig.KEYWORD_REGEX, roles + users),
+            secrets_regex=SecurityConfig.__compile_keywords(
+                SecurityConfig.KEYWORD_REGEX, passwords + secrets + users),
+            misc_secrets_regex=SecurityConfig.__compile_keywords(
+                SecurityConfig.MISC_SECRET_REGEX, misc_secrets),
+            download_regexes=tuple(re.compile(r'(http|https|www)[^ ,]*\.{text}'.format(text=item))
+                for item in download),
+        )
+
+    @staticmethod
+    def __compile_keywords(regex: str, keywords: Tuple[str, ...]) -> \
+            Tuple[Pattern, Tuple[Tuple[str, Pattern], ...]]:
+        """Compiles the regex of each keyword and a regex with all the keywords,
+        which matches if and only if the regex of some keyword matches. Most 
+        names do not have any keyword, so they are checked in a single scan."""
+        combined = re.compile(regex.format(text="(?:" + "|".join(keywords) + ")"))
+        return combined, tuple((k, re.compile(regex.format(text=k))) for k in keywords)
+
+    @staticmethod
+    def __load_data_file(file: str) -> List[str]:
+        folder_path = os.path.dirname(os.path.realpath(glitch.__file__))
+        with open(os.path.join(folder_path, "files", file)) as f:
+            content = f.readlines()
+            return [c.strip() for c in content]
+
+
 class SecurityVisitor(RuleVisitor):
-    __URL_REGEX = r"^(http:\/\/www\.|https:\/\/www\.|http:\/\/|https:\/\/)?[a-z0-9]+([_\-\.]{1}[a-z0-9]+)*\.[a-z]{2,5}(:[0-9]{1,5})?(\/.*)?$"
+    __URL_REGEX = re.compile(r"^(http:\/\/www\.|https:\/\/www\.|http:\/\/|https:\/\/)?[a-z0-9]+([_\-\.]{1}[a-z0-9]+)*\.[a-z]{2,5}(:[0-9]{1,5})?(\/.*)?$")
 
     class NonOfficialImageSmell(SmellChecker):
-        def check(self, element, file: str) -> List[Error]:
-            return []
+        @rule('sec_non_official_image')
+        def check(self, element, file: str, errors: ErrorSink):
+            pass
 
     class DockerNonOfficialImageSmell(SmellChecker):
-        def check(self, element, file: str) -> List[Error]:
+        def __init__(self, visitor: "SecurityVisitor") -> None:
+            self.visitor = visitor
+
+        @rule('sec_non_official_image')
+        def check(self, element, file: str, errors: ErrorSink):
             if not isinstance(element, UnitBlock) or \
                     element.name is None or "Dockerfile" in element.name:
-                return []
+                return
             image = element.name.split(":")
-            if image[0] not in SecurityVisitor._DOCKER_OFFICIAL_IMAGES:
-                return [Error('sec_non_official_image', element, file, repr(element))]
-            return []
+            if image[0] not in self.visitor.settings.docker_official_images:
+                errors.emit(Error('sec_non_official_image', element, file, repr(element)))
 
     def __init__(self, tech: Tech) -> None:
         super().__init__(tech)
+        self.settings: SecurityConfig = None
 
         if tech == Tech.docker:
-            self.non_off_img = SecurityVisitor.DockerNonOfficialImageSmell()
+            self.non_off_img = SecurityVisitor.DockerNonOfficialImageSmell(self)
         else:
             self.non_off_img = SecurityVisitor.NonOfficialImageSmell()
 
@@ -42,40 +146,28 @@ class SecurityVisitor(RuleVisitor):
         return "security"
 
     def config(self, config_path: str):
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        SecurityVisitor.__WRONG_WORDS = json.loads(config['security']['suspicious_words'])
-        SecurityVisitor.__PASSWORDS = json.loads(config['security']['passwords'])
-        SecurityVisitor.__USERS = json.loads(config['security']['users'])
-        SecurityVisitor.__PROFILE = json.loads(config['security']['profile'])
-        SecurityVisitor.__SECRETS = json.loads(config['security']['secrets'])
-        SecurityVisitor.__MISC_SECRETS = json.loads(config['security']['misc_secrets'])
-        SecurityVisitor.__ROLES = json.loads(config['security']['roles'])
-        SecurityVisitor.__DOWNLOAD = json.loads(config['security']['download_extensions'])
-        SecurityVisitor.__SSH_DIR = json.loads(config['security']['ssh_dirs'])
-        SecurityVisitor.__ADMIN = json.loads(config['security']['admin'])
-        SecurityVisitor.__CHECKSUM = json.loads(config['security']['checksum'])
-        SecurityVisitor.__CRYPT = json.loads(config['security']['weak_crypt'])
-        SecurityVisitor.__CRYPT_WHITELIST = json.loads(config['security']['weak_crypt_whitelist'])
-        SecurityVisitor.__URL_WHITELIST = json.loads(config['security']['url_http_white_list'])
-        SecurityVisitor.__FILE_COMMANDS = json.loads(config['security']['file_commands'])
-        SecurityVisitor.__DOWNLOAD_COMMANDS = json.loads(config['security']['download_commands'])
-        SecurityVisitor.__SHELL_RESOURCES = json.loads(config['security']['shell_resources'])
-        SecurityVisitor.__IP_BIND_COMMANDS = json.loads(config['security']['ip_binding_commands'])
-        SecurityVisitor.__OBSOLETE_COMMANDS = self._load_data_file("obsolete_commands")
-        SecurityVisitor._DOCKER_OFFICIAL_IMAGES = self._load_data_file("official_docker_images")
+        self.settings = SecurityConfig.load(config_path)
 
     @staticmethod
-    def _load_data_file(file: str) -> List[str]:
-        folder_path = os.path.dirname(os.path.realpath(glitch.__file__))
-        with open(os.path.join(folder_path, "files", file)) as f:
-            content = f.readlines()
-            return [c.strip() for c in content]
-
-    def check_atomicunit(self, au: AtomicUnit, file: str) -> List[Error]:
-        errors = super().check_atomicunit(au, file)
-
-        for item in SecurityVisitor.__FILE_COMMANDS:
+    def __match_keywords(regexes: Tuple[Pattern, Tuple[Tuple[str, Pattern], ...]], 
+            name: str) -> Iterator[str]:
+        """Yields the keywords whose regex matches the name, in order."""
+        combined, keywords = regexes
+        if not combined.match(name):
+            return
+        for keyword, regex in keywords:
+            if regex.match(name):
+                yield keyword
+
+    def check_atomicunit(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        self.__check_full_permission(au, file, errors)
+        self.__check_obsolete_command(au, file, errors)
+        self.__check_https(au, au.name, file, errors)
+        self.__check_weak_crypt(au, au.type, au.name, file, errors)
+
+    @rule('sec_full_permission_filesystem')
+    def __check_full_permission(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        for item in self.settings.file_commands:
             if item not in au.type:
                 continue
             for a in au.attributes:
@@ -92,115 +184,130 @@ class SecurityVisitor(RuleVisitor):
                             r'(?:^0?777$)|(?:(?:^|(?:ugo)|o|a)\+[rwx]{3})',
                             value
                             ):
-                        errors.append(Error('sec_full_permission_filesystem', a, file, repr(a)))
+                        errors.emit(Error('sec_full_permission_filesystem', a, file, repr(a)))
 
-        if au.type in SecurityVisitor.__OBSOLETE_COMMANDS:
-            errors.append(Error('sec_obsolete_command', au, file, repr(au)))
-        elif any(au.type.endswith(res) for res in SecurityVisitor.__SHELL_RESOURCES):
+    @rule('sec_obsolete_command')
+    def __check_obsolete_command(self, au: AtomicUnit, file: str, errors: ErrorSink):
+        if au.type in self.settings.obsolete_commands:
+            errors.emit(Error('sec_obsolete_command', au, file, repr(au)))
+        elif any(au.type.endswith(res) for res in self.settings.shell_resources):
             for attr in au.attributes:
-                if isinstance(attr.value, str) and attr.value.split(" ")[0] in SecurityVisitor.__OBSOLETE_COMMANDS:
-                    errors.append(Error('sec_obsolete_command', attr, file, repr(attr)))
+                if isinstance(attr.value, str) and attr.value.split(" ")[0] in self.settings.obsolete_commands:
+                    errors.emit(Error('sec_obsolete_command', attr, file, repr(attr)))
 
-        if self.__is_http_url(au.name):
-            errors.append(Error('sec_https', au, file, repr(au)))
-        if self.__is_weak_crypt(au.type, au.name):
-            errors.append(Error('sec_weak_crypt', au, file, repr(au)))
+    @rule('sec_https')
+    def __check_https(self, c: CodeElement, value: str, file: str, errors: ErrorSink):
+        if self.__is_http_url(value):
+            errors.emit(Error('sec_https', c, file, repr(c)))
 
-        return errors
+    @rule('sec_weak_crypt')
+    def __check_weak_crypt(self, c: CodeElement, value: str, name: str, 
+            file: str, errors: ErrorSink):
+        if self.__is_weak_crypt(value, name):
+            errors.emit(Error('sec_weak_crypt', c, file, repr(c)))
 
-    def check_dependency(self, d: Dependency, file: str) -> List[Error]:
-        return []
+    def check_dependency(self, d: Dependency, file: str, errors: ErrorSink):
+        pass
 
     # FIXME attribute and variables need to have superclass
     def __check_keyvalue(self, c: CodeElement, name: str,
-            value: str, has_variable: bool, file: str):
-        errors = []
+            value: str, has_variable: bool, file: str, errors: ErrorSink):
         name = name.strip().lower()
+        # The keyvalues inside (or the value, if it is an element) are 
+        # checked by the traversal
         if (isinstance(value, type(None))):
-            for child in c.keyvalues:
-                errors += self.check_element(child, file)
-            return errors
+            return
         elif (isinstance(value, str)):
             value = value.strip().lower()
         else:
-            errors += self.check_element(value, file)
             value = repr(value)
 
-        if self.__is_http_url(value):
-            errors.append(Error('sec_https', c, file, repr(c)))
+        self.__check_https(c, value, file, errors)
+        self.__check_invalid_bind(c, name, value, file, errors)
+        self.__check_weak_crypt(c, value, name, file, errors)
+        self.__check_no_integrity(c, name, value, file, errors)
+        self.__check_admin(c, name, value, has_variable, file, errors)
+        self.__check_secrets(c, name, value, has_variable, file, errors)
 
+    @rule('sec_invalid_bind')
+    def __check_invalid_bind(self, c: CodeElement, name: str, value: str, 
+            file: str, errors: ErrorSink):
         if re.match(r'(?:https?://|^)0.0.0.0', value) or\
             (name == "ip" and value in {"*", '::'}) or\
-            (name in SecurityVisitor.__IP_BIND_COMMANDS and
+            (name in self.settings.ip_bind_commands and
              (value == True or value in {'*', '::'})):
-            errors.append(Error('sec_invalid_bind', c, file, repr(c)))
+            errors.emit(Error('sec_invalid_bind', c, file, repr(c)))
 
-        if self.__is_weak_crypt(value, name):
-            errors.append(Error('sec_weak_crypt', c, file, repr(c)))
-
-        for check in SecurityVisitor.__CHECKSUM:
+    @rule('sec_no_int_check')
+    def __check_no_integrity(self, c: CodeElement, name: str, value: str, 
+            file: str, errors: ErrorSink):
+        for check in self.settings.checksum:
             if (check in name and (value == 'no' or value == 'false')):
-                errors.append(Error('sec_no_int_check', c, file, repr(c)))
+                errors.emit(Error('sec_no_int_check', c, file, repr(c)))
                 break
 
-        for item in (SecurityVisitor.__ROLES + SecurityVisitor.__USERS):
-            if (re.match(r'[_A-Za-z0-9$\/\.\[\]-]*{text}\b'.format(text=item), name)):
-                if (len(value) > 0 and not has_variable):
-                    for admin in SecurityVisitor.__ADMIN:
-                        if admin in value:
-                            errors.append(Error('sec_def_admin', c, file, repr(c)))
-                            break
-
-        for item in (SecurityVisitor.__PASSWORDS +
-                SecurityVisitor.__SECRETS + SecurityVisitor.__USERS):
-            if re.match(r'[_A-Za-z0-9$\/\.\[\]-]*{text}\b'.format(text=item), name) and not has_variable and \
-                    name not in SecurityVisitor.__PROFILE:
-                errors.append(Error('sec_hard_secr', c, file, repr(c)))
-
-                if (item in SecurityVisitor.__PASSWORDS):
-                    errors.append(Error('sec_hard_pass', c, file, repr(c)))
-                elif (item in SecurityVisitor.__USERS):
-                    errors.append(Error('sec_hard_user', c, file, repr(c)))
-
-                if (item in SecurityVisitor.__PASSWORDS and len(value) == 0):
-                    errors.append(Error('sec_empty_pass', c, file, repr(c)))
+    @rule('sec_def_admin')
+    def __check_admin(self, c: CodeElement, name: str, value: str, 
+            has_variable: bool, file: str, errors: ErrorSink):
+        for _ in SecurityVisitor.__match_keywords(self.settings.roles_users_regex, name):
+            if (len(value) > 0 and not has_variable):
+                for admin in self.settings.admin:
+                    if admin in value:
+                        errors.emit(Error('sec_def_admin', c, file, repr(c)))
+                        break
+
+    @rule('sec_hard_secr', 'sec_hard_pass', 'sec_hard_user', 'sec_empty_pass')
+    def __check_secrets(self, c: CodeElement, name: str, value: str, 
+            has_variable: bool, file: str, errors: ErrorSink):
+        if not has_variable and name not in self.settings.profile:
+            for item in SecurityVisitor.__match_keywords(self.settings.secrets_regex, name):
+                errors.emit(Error('sec_hard_secr', c, file, repr(c)))
+
+                if (item in self.settings.passwords):
+                    errors.emit(Error('sec_hard_pass', c, file, repr(c)))
+                elif (item in self.settings.users):
+                    errors.emit(Error('sec_hard_user', c, file, repr(c)))
+
+                if (item in self.settings.passwords and len(value) == 0):
+                    errors.emit(Error('sec_empty_pass', c, file, repr(c)))
 
                 break
 
-        for item in SecurityVisitor.__SSH_DIR:
+        for item in self.settings.ssh_dirs:
             if item.lower() in name:
                 if len(value) > 0 and '/id_rsa' in value:
-                    errors.append(Error('sec_hard_secr', c, file, repr(c)))
+                    errors.emit(Error('sec_hard_secr', c, file, repr(c)))
 
-        for item in SecurityVisitor.__MISC_SECRETS:
-            if (re.match(r'([_A-Za-z0-9$-]*[-_]{text}([-_].*)?$)|(^{text}([-_].*)?$)'.format(text=item), name)
-                    and len(value) > 0 and not has_variable):
-                errors.append(Error('sec_hard_secr', c, file, repr(c)))
+        for _ in SecurityVisitor.__match_keywords(self.settings.misc_secrets_regex, name):
+            if (len(value) > 0 and not has_variable):
+                errors.emit(Error('sec_hard_secr', c, file, repr(c)))
 
-        return errors
+    def check_attribute(self, a: Attribute, file: str, errors: ErrorSink):
+        self.__check_keyvalue(a, a.name, a.value, a.has_variable, file, errors)
 
-    def check_attribute(self, a: Attribute, file: str) -> List[Error]:
-        return self.__check_keyvalue(a, a.name, a.value, a.has_variable, file)
+    def check_variable(self, v: Variable, file: str, errors: ErrorSink):
+        self.__check_keyvalue(v, v.name, v.value, v.has_variable, file, errors) #FIXME
 
-    def check_variable(self, v: Variable, file: str) -> List[Error]:
-        return self.__check_keyvalue(v, v.name, v.value, v.has_variable, file) #FIXME
+    def check_comment(self, c: Comment, file: str, errors: ErrorSink):
+        self.__check_suspicious_comment(c, file, errors)
 
-    def check_comment(self, c: Comment, file: str) -> List[Error]:
-        errors = []
+    @rule('sec_susp_comm')
+    def __check_suspicious_comment(self, c: Comment, file: str, errors: ErrorSink):
         lines = c.content.split('\n')
         stop = False
-        for word in SecurityVisitor.__WRONG_WORDS:
+        for word in self.settings.wrong_words:
             for line in lines:
                 if word in line.lower():
-                    errors.append(Error('sec_susp_comm', c, file, line))
+                    errors.emit(Error('sec_susp_comm', c, file, line))
                     stop = True
             if stop:
                 break
-        return errors
 
-    def check_condition(self, c: ConditionalStatement, file: str) -> List[Error]:
-        errors = super().check_condition(c, file)
+    def check_condition(self, c: ConditionalStatement, file: str, errors: ErrorSink):
+        self.__check_default_switch(c, file, errors)
 
+    @rule('sec_no_default_switch')
+    def __check_default_switch(self, c: ConditionalStatement, file: str, errors: ErrorSink):
         condition = c
         has_default = False
 
@@ -211,13 +318,14 @@ class SecurityVisitor(RuleVisitor):
             condition = condition.else_statement
 
         if not has_default:
-            return errors + [Error('sec_no_default_switch', c, file, repr(c))]
-
-        return errors
+            errors.emit(Error('sec_no_default_switch', c, file, repr(c)))
 
-    def check_unitblock(self, u: UnitBlock) -> List[Error]:
-        errors = super().check_unitblock(u)
+    def check_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        self.__check_missing_integrity(u, errors)
+        self.non_off_img.check(u, u.path, errors)
 
+    @rule('sec_no_int_check')
+    def __check_missing_integrity(self, u: UnitBlock, errors: ErrorSink):
         # Missing integrity check changed to unit block since in Docker the integrity check is not an attribute of the
         # atomic unit but can be done on another atomic unit inside the same unit block.
         missing_integrity_checks = {}
@@ -226,71 +334,63 @@ class SecurityVisitor(RuleVisitor):
             if result:
                 missing_integrity_checks[result[0]] = result[1]
                 continue
-            file = SecurityVisitor.check_has_checksum(au)
+            file = self.check_has_checksum(au)
             if file:
                 if file in missing_integrity_checks:
                     del missing_integrity_checks[file]
 
-        errors += missing_integrity_checks.values()
-        errors += self.non_off_img.check(u, u.path)
+        errors.extend(missing_integrity_checks.values())
 
-        return errors
-
-    @staticmethod
-    def check_integrity_check(au: AtomicUnit, path: str) -> Optional[Tuple[str, Error]]:
-        for item in SecurityVisitor.__DOWNLOAD:
-            if not re.search(r'(http|https|www)[^ ,]*\.{text}'.format(text=item), au.name):
+    def check_integrity_check(self, au: AtomicUnit, path: str) -> Optional[Tuple[str, Error]]:
+        for regex in self.settings.download_regexes:
+            if not regex.search(au.name):
                 continue
-            if SecurityVisitor.__has_integrity_check(au.attributes):
+            if self.__has_integrity_check(au.attributes):
                 return None
             return os.path.basename(au.name), Error('sec_no_int_check', au, path, repr(au))
 
         for a in au.attributes:
             value = a.value.strip().lower() if isinstance(a.value, str) else repr(a.value).strip().lower()
 
-            for item in SecurityVisitor.__DOWNLOAD:
-                if not re.search(r'(http|https|www)[^ ,]*\.{text}'.format(text=item), value):
+            for regex in self.settings.download_regexes:
+                if not regex.search(value):
                     continue
-                if SecurityVisitor.__has_integrity_check(au.attributes):
+                if self.__has_integrity_check(au.attributes):
                     return None
                 return os.path.basename(a.value), Error('sec_no_int_check', au, path, repr(a))
         return None
 
-    @staticmethod
-    def check_has_checksum(au: AtomicUnit) -> Optional[str]:
-        if au.type not in SecurityVisitor.__CHECKSUM:
+    def check_has_checksum(self, au: AtomicUnit) -> Optional[str]:
+        if au.type not in self.settings.checksum:
             return None
-        if any(d in au.name for d in SecurityVisitor.__DOWNLOAD):
+        if any(d in au.name for d in self.settings.download):
             return os.path.basename(au.name)
 
         for a in au.attributes:
             value = a.value.strip().lower() if isinstance(a.value, str) else repr(a.value).strip().lower()
-            if any(d in value for d in SecurityVisitor.__DOWNLOAD):
+            if any(d in value for d in self.settings.download):
                 return os.path.basename(au.name)
         return None
 
-    @staticmethod
-    def __has_integrity_check(attributes: List[Attribute]) -> bool:
+    def __has_integrity_check(self, attributes: List[Attribute]) -> bool:
         for attr in attributes:
             name = attr.name.strip().lower()
-            if any([check in name for check in SecurityVisitor.__CHECKSUM]):
+            if any([check in name for check in self.settings.checksum]):
                 return True
 
-    @staticmethod
-    def __is_http_url(value: str) -> bool:
-        if (re.match(SecurityVisitor.__URL_REGEX, value) and
+    def __is_http_url(self, value: str) -> bool:
+        if (SecurityVisitor.__URL_REGEX.match(value) and
                 ('http' in value or 'www' in value) and 'https' not in value):
             return True
         try:
             parsed_url = urlparse(value)
             return parsed_url.scheme == 'http' and \
-                    parsed_url.hostname not in SecurityVisitor.__URL_WHITELIST
+                    parsed_url.hostname not in self.settings.url_whitelist
         except ValueError:
             return False
 
-    @staticmethod
-    def __is_weak_crypt(value: str, name: str) -> bool:
-        if any(crypt in value for crypt in SecurityVisitor.__CRYPT):
-            whitelist = any(word in name or word in value for word in SecurityVisitor.__CRYPT_WHITELIST)
+    def __is_weak_crypt(self, value: str, name: str) -> bool:
+        if any(crypt in value for crypt in self.settings.crypt):
+            whitelist = any(word in name or word in value for word in self.settings.crypt_whitelist)
             return not whitelist
         return False
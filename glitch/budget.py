@@ -0,0 +1,122 @@
+import os
+import time
+import signal
+import threading
+from typing import Optional
+
+class BudgetExceeded(BaseException):
+    """Raised in the code processing a file when the file exceeds its budget.
+    Like KeyboardInterrupt, it is not an Exception, so the parsers which
+    handle every Exception of a file do not report it as a parse error."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+def current_rss() -> Optional[int]:
+    """Returns the resident set size of the process in bytes, or None if it
+    cannot be measured (e.g. there is no /proc)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+class Budget:
+    """Wall-clock time (in seconds) and memory (in bytes of RSS added to the
+    process) which the processing of each file can use.
+
+    The budget is checked every INTERVAL seconds by a SIGALRM timer, which
+    interrupts the Python code processing the file (e.g. a parser stuck
+    in a YAML anchor bomb). Code which does not return to the interpreter
+    cannot be interrupted. The timer only works in the main thread of a
+    process, which is where the files are processed both in a serial run
+    and in the workers of a process pool."""
+
+    INTERVAL = 0.05
+
+    def __init__(self, timeout: Optional[float] = None, max_memory: Optional[int] = None) -> None:
+        self.timeout = timeout
+        self.max_memory = max_memory
+
+    @property
+    def enabled(self) -> bool:
+        return self.timeout is not None or self.max_memory is not None
+
+    @staticmethod
+    def supported(memory: bool = False) -> bool:
+        """Returns whether the budget can be enforced in this platform."""
+        if not hasattr(signal, "setitimer"):
+            return False
+        return not memory or current_rss() is not None
+
+    def run(self, function, *args):
+        """Calls the function with the args and returns its result. Raises
+        BudgetExceeded if the call exceeds the budget."""
+        if not self.enabled or not Budget.supported() or \
+                threading.current_thread() is not threading.main_thread():
+            return function(*args)
+
+        timer = _Timer(self)
+        timer.start()
+        try:
+            result = _call(function, args)
+        finally:
+            timer.stop()
+        if timer.reason is not None:
+            # The exception was handled by the function (e.g. with a bare
+            # except) and the function returned
+            raise BudgetExceeded(timer.reason)
+        return result
+
+def _call(function, args):
+    # BudgetExceeded is only raised in the frames called by this one, so
+    # that it is never raised while the timer is started or stopped
+    return function(*args)
+
+def shielded(function, *args):
+    """Calls the function with the args, which is not interrupted when the
+    budget is exceeded (e.g. to clean up after the interrupted code). The
+    exception is raised again after the function returns."""
+    return function(*args)
+
+class _Timer:
+    def __init__(self, budget: Budget) -> None:
+        self.budget = budget
+        self.reason = None
+        self.__handler = None
+
+    def start(self):
+        self.__start = time.monotonic()
+        self.__rss = current_rss() if self.budget.max_memory is not None else None
+        self.__handler = signal.signal(signal.SIGALRM, self.__tick)
+        interval = Budget.INTERVAL
+        if self.budget.timeout is not None:
+            interval = min(interval, self.budget.timeout)
+        signal.setitimer(signal.ITIMER_REAL, interval, interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self.__handler)
+
+    def __in_function(self, frame) -> bool:
+        while frame is not None:
+            if frame.f_code is shielded.__code__:
+                return False
+            if frame.f_code is _call.__code__:
+                return True
+            frame = frame.f_back
+        return False
+
+    def __tick(self, signum, frame):
+        if self.reason is None:
+            elapsed = time.monotonic() - self.__start
+            if self.budget.timeout is not None and elapsed > self.budget.timeout:
+                self.reason = f"took more than {self.budget.timeout:g} seconds"
+            elif self.__rss is not None:
+                rss = current_rss()
+                if rss is not None and rss - self.__rss > self.budget.max_memory:
+                    self.reason = f"used more than {self.budget.max_memory // (1 << 20)} MB of memory"
+        # Raised again at every tick, in case the function handles it
+        if self.reason is not None and self.__in_function(frame):
+            raise BudgetExceeded(self.reason)
@@ -0,0 +1,112 @@
+import os
+import pickle
+import hashlib
+import tempfile
+from importlib import metadata
+from typing import Optional, Tuple
+
+from glitch.analysis.rules import Error
+from glitch.stats.stats import FileStats
+
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(cache_home, "glitch")
+
+def glitch_version() -> str:
+    try:
+        return metadata.version("glitch")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+class ResultCache:
+    """On-disk cache with the errors and file stats of each analyzed path.
+    The key of an entry is the hash of the content of the path (every file
+    inside it, if it is a folder) together with everything else that may
+    change the results: the tech, the config, the smells, the options
+    and the version of GLITCH. The least recently used entries are removed
+    when the cache gets bigger than max_size bytes."""
+
+    VERSION = 4
+    DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+    def __init__(self, path: str, tech, config: str, smells, type, module: bool,
+            max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.path = path
+        self.max_size = max_size
+
+        with open(config, "rb") as f:
+            config_hash = hashlib.sha256(f.read()).hexdigest()
+        self.__run_key = repr((ResultCache.VERSION, glitch_version(), str(tech),
+            config_hash, sorted(smells), str(type), module)).encode()
+
+    @staticmethod
+    def __hash_file(h, path: str):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+
+    def key(self, path: str) -> str:
+        h = hashlib.sha256(self.__run_key)
+        h.update(os.path.abspath(path).encode())
+
+        if os.path.isfile(path):
+            ResultCache.__hash_file(h, path)
+        else:
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file = os.path.join(root, name)
+                    h.update(b"\0" + os.path.relpath(file, path).encode() + b"\0")
+                    if os.path.isfile(file):
+                        ResultCache.__hash_file(h, file)
+
+        return h.hexdigest()
+
+    def __entry(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key: str) -> Optional[Tuple[list[Error], FileStats]]:
+        entry = self.__entry(key)
+        try:
+            with open(entry, "rb") as f:
+                errors, stats = pickle.load(f)
+            # The modification time is used to know which entries were
+            # least recently used
+            os.utime(entry)
+            return errors, stats
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key: str, errors: list[Error], stats: FileStats):
+        entry = self.__entry(key)
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            # Write to a temporary file first so that other processes never
+            # read a partial entry
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(entry))
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((errors, stats), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    def evict(self):
+        entries, total = [], 0
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, os.path.join(root, name)))
+                total += st.st_size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(entry)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,61 @@
+from typing import Callable, Dict, Optional
+
+class _Handlers(dict):
+    # Handlers of an owner class, which are found the first time each
+    # class of element is dispatched
+    def __init__(self, dispatch: "TypeDispatch", owner: type) -> None:
+        super().__init__()
+        self.__dispatch = dispatch
+        self.__owner = owner
+
+    def __missing__(self, cls: type) -> Optional[Callable]:
+        handler = self.__dispatch.find(self.__owner, cls)
+        self[cls] = handler
+        return handler
+
+class TypeDispatch:
+    """Registry with the handler of each class of element, which replaces a
+    chain of isinstance checks (similar to functools.singledispatchmethod).
+    The handler of a class is the one registered for the nearest class in
+    its MRO.
+
+    Handlers are registered by the name of a method, so that the method
+    called is the one of the class of the object handling the element
+    (e.g. a visitor which overrides it). Other classes (e.g. the visitors
+    of new rules) can register handlers without changing the class which
+    owns the registry."""
+
+    def __init__(self) -> None:
+        self.__names: Dict[type, str] = {}
+        self.__handlers: Dict[type, _Handlers] = {}
+
+    def register(self, cls: type, name: str = None):
+        """Registers the method name as the handler of the elements of class
+        cls. Without a name, it is a decorator of the method."""
+        if name is None:
+            def decorator(method):
+                self.register(cls, method.__name__)
+                return method
+            return decorator
+
+        self.__names[cls] = name
+        # The handlers found before may have changed
+        for handlers in self.__handlers.values():
+            handlers.clear()
+
+    def find(self, owner: type, cls: type) -> Optional[Callable]:
+        """Returns the function of the owner class which handles the
+        elements of class cls, or None if there is none."""
+        for base in cls.__mro__:
+            name = self.__names.get(base)
+            if name is not None and hasattr(owner, name):
+                return getattr(owner, name)
+        return None
+
+    def handlers(self, owner: type) -> Dict[type, Optional[Callable]]:
+        """Returns the handlers of the owner class, by class of element. The
+        handler of each class is only found once."""
+        handlers = self.__handlers.get(owner)
+        if handlers is None:
+            handlers = self.__handlers[owner] = _Handlers(self, owner)
+        return handlers
@@ -38,6 +38,45 @@ class RulesListOption(click.Option):
         rules = list(map(lambda c: c.get_name(), RuleVisitor.__subclasses__()))
         self.type = click.Choice(rules, case_sensitive=False)
 
+class AnalysisGroup(click.Group):
+    """Group of commands whose own callback is the analysis (e.g. 'glitch 
+    --tech puppet PATH'). A command (e.g. 'glitch serve') is only recognized
+    as the first argument, so a path with the name of a command is analyzed
+    if any option is given before it."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, invoke_without_command=True, **kwargs)
+        # The analysis is parsed as a command (e.g. its options can come
+        # after PATH), not as a group
+        self.allow_interspersed_args = True
+        self.allow_extra_args = False
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] in self.commands:
+            # The options and arguments are the ones of the command
+            ctx.protected_args, ctx.args = args[:1], args[1:]
+            return ctx.args
+        return click.Command.parse_args(self, ctx, args)
+
+    def invoke(self, ctx: click.Context):
+        if not ctx.protected_args:
+            return click.Command.invoke(self, ctx)
+
+        name, command, args = self.resolve_command(ctx, 
+            [*ctx.protected_args, *ctx.args])
+        ctx.protected_args, ctx.args = [], []
+        ctx.invoked_subcommand = name
+        # The command does not have a parent context, whose arguments (PATH)
+        # would be part of the usage of the command
+        with ctx, command.make_context(f"{ctx.command_path} {name}", args) as sub_ctx:
+            return command.invoke(sub_ctx)
+
+    def format_usage(self, ctx: click.Context, formatter: click.HelpFormatter):
+        formatter.write_usage(ctx.command_path, 
+            " ".join(click.Command.collect_usage_pieces(self, ctx)))
+        formatter.write_usage(ctx.command_path, self.subcommand_metavar, 
+            prefix="   or: ")
+
 def remove_unmatched_brackets(string):
     stack, aux = [], ""
 
@@ -0,0 +1,165 @@
+import mmap
+import struct
+import pickle
+from typing import Iterator, List, Tuple
+
+from glitch.cache import glitch_version
+import glitch.repr.inter as inter
+from glitch.repr.inter import UnitBlockType
+from glitch.source import Source, Span
+from glitch.tech import Tech
+
+class IRFormatError(Exception):
+    pass
+
+class _Unpickler(pickle.Unpickler):
+    # Only the classes of the intermediate representation can be loaded,
+    # so that loading a file never runs other code. The names are matched
+    # exactly, since a dotted name (e.g. "os.system" in glitch.source) would
+    # be looked up through the attributes of the module.
+    CLASSES = {(c.__module__, c.__qualname__): c for c in (
+        inter.UnitBlockType, inter.UnitBlock, inter.AtomicUnit, inter.Attribute,
+        inter.Variable, inter.Comment, inter.Dependency, inter.ConditionalStatement,
+        inter.ConditionalStatement.ConditionType, inter.File, inter.Folder,
+        inter.Module, inter.Project, Source, Span)}
+
+    def find_class(self, module: str, name: str):
+        c = _Unpickler.CLASSES.get((module, name))
+        if c is None:
+            raise pickle.UnpicklingError(f"'{module}.{name}' is not part of the "
+                "intermediate representation")
+        return c
+
+Entry = Tuple[str, object, List[Source]]
+
+class IRWriter:
+    """Writes the intermediate representation of parsed paths to a file, so
+    that it can be analyzed many times without parsing the paths again.
+
+    The file starts with MAGIC and VERSION, followed by a header with the
+    options used to parse the paths and by a record for each path. Each
+    record is the pickled (path, IR, sources) of the path, where the
+    sources are the texts of the files parsed, which are needed by the
+    spans of the IR and by the analyses. The file ends with an index with
+    the offset of each record, so that the records can be loaded in any
+    order."""
+
+    MAGIC = b"GLITCHIR"
+    VERSION = 1
+
+    # magic, version
+    START = struct.Struct("<8sI")
+    # size of a record
+    RECORD = struct.Struct("<Q")
+    # offset of the index, number of records
+    END = struct.Struct("<QQ")
+
+    def __init__(self, path: str, tech: Tech, type: UnitBlockType, module: bool) -> None:
+        self.__file = open(path, "wb")
+        self.__offsets = []
+        self.__file.write(IRWriter.START.pack(IRWriter.MAGIC, IRWriter.VERSION))
+        self.__write({"tech": tech.value, "type": type.value, "module": module,
+            "version": glitch_version()})
+
+    def __enter__(self) -> "IRWriter":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __write(self, record):
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__file.write(IRWriter.RECORD.pack(len(data)))
+        self.__file.write(data)
+
+    def add(self, path: str, inter, sources: List[Source]):
+        """Adds the IR of the path, which is None if it could not be parsed.
+        Sources which cannot be decoded are not saved, so the analyses
+        read their files again."""
+        saved = []
+        for source in sources:
+            try:
+                source.text
+                saved.append(source)
+            except UnicodeDecodeError:
+                pass
+
+        self.__offsets.append(self.__file.tell())
+        self.__write((path, inter, saved))
+
+    def close(self):
+        if self.__file.closed:
+            return
+        index = self.__file.tell()
+        self.__file.write(struct.pack(f"<{len(self.__offsets)}Q", *self.__offsets))
+        self.__file.write(IRWriter.END.pack(index, len(self.__offsets)))
+        self.__file.close()
+
+
+class IRReader:
+    """Reads a file written by IRWriter. The file is memory-mapped and each
+    record is only loaded when it is accessed."""
+
+    def __init__(self, path: str) -> None:
+        invalid = IRFormatError(f"'{path}' is not an intermediate representation file.")
+        self.__data = None
+        with open(path, "rb") as f:
+            try:
+                self.__data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be memory-mapped
+                raise invalid
+
+        start, end = IRWriter.START, IRWriter.END
+        try:
+            magic, version = start.unpack_from(self.__data, 0)
+            if magic != IRWriter.MAGIC:
+                raise invalid
+            if version != IRWriter.VERSION:
+                raise IRFormatError(f"'{path}' has version {version} of the intermediate "
+                    f"representation, but version {IRWriter.VERSION} is required.")
+
+            index, count = end.unpack_from(self.__data, len(self.__data) - end.size)
+            self.__offsets = struct.unpack_from(f"<{count}Q", self.__data, index)
+            self.header = self.__read(start.size)
+            if self.header["version"] != glitch_version():
+                raise IRFormatError(f"'{path}' was written by version {self.header['version']} "
+                    f"of GLITCH, but this is version {glitch_version()}. Parse the scripts again.")
+        except IRFormatError:
+            self.close()
+            raise
+        except (struct.error, pickle.UnpicklingError, EOFError, TypeError, KeyError):
+            # e.g. the file was not closed by the writer
+            self.close()
+            raise invalid
+
+        self.tech = Tech(self.header["tech"])
+        self.type = UnitBlockType(self.header["type"])
+        self.module: bool = self.header["module"]
+
+    def __enter__(self) -> "IRReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __read(self, offset: int):
+        # The record is unpickled directly from the memory-mapped file
+        self.__data.seek(offset + IRWriter.RECORD.size)
+        return _Unpickler(self.__data).load()
+
+    def __len__(self) -> int:
+        return len(self.__offsets)
+
+    def __getitem__(self, i: int) -> Entry:
+        """Returns the (path, IR, sources) of the i-th path added."""
+        return self.__read(self.__offsets[i])
+
+    def __iter__(self) -> Iterator[Entry]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        if self.__data is not None:
+            self.__data.close()
+            self.__data = None
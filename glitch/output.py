@@ -0,0 +1,66 @@
+import os
+import json
+import heapq
+import tempfile
+from typing import Iterator, Tuple
+
+from glitch.analysis.rules import Error
+
+def format_error(error: Error, linter: bool, csv: bool) -> str:
+    if linter:
+        return Error.ALL_ERRORS[error.code] + "," + error.to_csv()
+    elif csv:
+        return error.to_csv()
+    else:
+        return repr(error)
+
+class ExternalSort:
+    """Sorts the output of the errors without keeping all of them in memory.
+    The errors are written to temporary files in sorted runs of at most
+    run_size errors, which are merged in the end. Duplicated errors are
+    only output once, keeping the first one that was added."""
+
+    DEFAULT_RUN_SIZE = 100000
+
+    def __init__(self, run_size: int = DEFAULT_RUN_SIZE) -> None:
+        self.run_size = run_size
+        self.__dir = tempfile.TemporaryDirectory(prefix="glitch-")
+        self.__runs = []
+        self.__run = []
+
+    def add(self, error: Error, text: str):
+        self.__run.append((error.path, error.line, error.code, text))
+        if len(self.__run) >= self.run_size:
+            self.__flush()
+
+    def __flush(self):
+        if len(self.__run) == 0:
+            return
+        # sort is stable, so the first error added is kept on duplicates
+        self.__run.sort(key=lambda e: e[:3])
+        path = os.path.join(self.__dir.name, f"{len(self.__runs)}.jsonl")
+        with open(path, "w") as f:
+            for e in self.__run:
+                f.write(json.dumps(e) + "\n")
+        self.__runs.append(path)
+        self.__run = []
+
+    @staticmethod
+    def __read_run(path: str) -> Iterator[Tuple[str, int, str, str]]:
+        with open(path) as f:
+            for line in f:
+                yield tuple(json.loads(line))
+
+    def merge(self) -> Iterator[Tuple[str, int, str, str]]:
+        """Yields the (path, line, code, text) of each error, sorted by path,
+        line and code."""
+        self.__flush()
+        last = None
+        # heapq.merge keeps the order of the runs on ties, so the first
+        # error added is still the one kept
+        for e in heapq.merge(*map(ExternalSort.__read_run, self.__runs),
+                key=lambda e: e[:3]):
+            if e[:3] != last:
+                last = e[:3]
+                yield e
+        self.__dir.cleanup()
@@ -1,4 +1,5 @@
 from typing import TextIO
+import io
 import ast
 import os.path
 import re
@@ -9,6 +10,7 @@ import bashlex
 from dockerfile_parse import DockerfileParser
 
 import glitch.parsers.parser as p
+from glitch.source import sources, Span
 from glitch.exceptions import throw_exception, EXCEPTIONS
 from glitch.repr.inter import *
 
@@ -20,42 +22,40 @@ class DFPStructure:
     instruction: str
     startline: int
     value: str
-    raw_content: str
+    raw_content: Union[str, Span]
 
 
 class DockerParser(p.Parser):
     def parse_file(self, path: str, type: UnitBlockType) -> UnitBlock:
         try:
-            with open(path) as f:
-                file_lines = list(f)
-                f.seek(0)
-                dfp = DockerfileParser()
-                dfp.content = f.read()
-                structure = [
-                        DFPStructure(
-                            raw_content="".join(file_lines[s['startline']:s['endline']+1]),
-                            **s)
-                        for s in dfp.structure]
-
-                stage_indexes = [i for i, e in enumerate(structure) if e.instruction == 'FROM']
-                if len(stage_indexes) > 1:
-                    main_block = UnitBlock(os.path.basename(path), type)
-                    main_block.code = dfp.content
-                    stages = self.__get_stages(stage_indexes, structure)
-                    for i, (name, s) in enumerate(stages):
-                        unit_block = self.__parse_stage(name, path, UnitBlockType.block, s)
-                        unit_block.line = structure[stage_indexes[i]].startline + 1
-                        unit_block.code = "".join([struct.content for struct in s])
-                        main_block.add_unit_block(unit_block)
-                else:
-                    self.__add_user_tag(structure)
-                    main_block = self.__parse_stage(dfp.baseimage, path, type, structure)
-                    main_block.line = structure[stage_indexes[0]].startline + 1 \
-                        if stage_indexes else 1
-                    main_block.code = "".join([struct.content for struct in structure])
-
-                main_block.path = path
-                return main_block
+            source = sources.open(path)
+            dfp = DockerParser.__new_dockerfile_parser(source.text)
+            structure = [
+                    DFPStructure(
+                        raw_content=source.span(source.offset(s['startline']),
+                            source.offset(s['endline'] + 1)),
+                        **s)
+                    for s in dfp.structure]
+
+            stage_indexes = [i for i, e in enumerate(structure) if e.instruction == 'FROM']
+            if len(stage_indexes) > 1:
+                main_block = UnitBlock(os.path.basename(path), type)
+                main_block.code = dfp.content
+                stages = self.__get_stages(stage_indexes, structure)
+                for i, (name, s) in enumerate(stages):
+                    unit_block = self.__parse_stage(name, path, UnitBlockType.block, s)
+                    unit_block.line = structure[stage_indexes[i]].startline + 1
+                    unit_block.code = "".join([struct.content for struct in s])
+                    main_block.add_unit_block(unit_block)
+            else:
+                self.__add_user_tag(structure)
+                main_block = self.__parse_stage(dfp.baseimage, path, type, structure)
+                main_block.line = structure[stage_indexes[0]].startline + 1 \
+                    if stage_indexes else 1
+                main_block.code = "".join([struct.content for struct in structure])
+
+            main_block.path = path
+            return main_block
         except Exception as e:
             throw_exception(EXCEPTIONS['DOCKER_UNKNOW_ERROR'], e)
             main_block = UnitBlock(os.path.basename(path), type)
@@ -122,8 +122,7 @@ class DockerParser(p.Parser):
             except Exception:
                 throw_exception(EXCEPTIONS['SHELL_COULD_NOT_PARSE'], element.content)
         elif instruction == 'ONBUILD':
-            dfp = DockerfileParser()
-            dfp.content = element.value
+            dfp = DockerParser.__new_dockerfile_parser(element.value)
             element = DFPStructure(**dfp.structure[0],
                                    raw_content=dfp.structure[0]['content'])
             DockerParser.__parse_instruction(element, unit_block)
@@ -146,6 +145,14 @@ class DockerParser(p.Parser):
         elif instruction == 'EXPOSE':
             pass
 
+    @staticmethod
+    def __new_dockerfile_parser(content: str) -> DockerfileParser:
+        # The content is kept in memory instead of in ./Dockerfile, which
+        # would be shared by the processes analyzing files in parallel
+        dfp = DockerfileParser(fileobj=io.BytesIO())
+        dfp.content = content
+        return dfp
+
     @staticmethod
     def __get_stages(stage_indexes: List[int], structure: List[DFPStructure]) -> List[Tuple[str, List[DFPStructure]]]:
         stages = []
@@ -226,7 +233,7 @@ class ShellCommand:
     sudo: bool
     command: str
     args: List[str]
-    code: str
+    code: Union[str, Span]
     options: Dict[str, Tuple[Union[str, bool, int, float], str]] = field(default_factory=dict)
     main_arg: Optional[str] = None
     line: int = -1
@@ -0,0 +1,39 @@
+require 'ripper'
+require 'pp'
+require 'json'
+require 'stringio'
+
+class CommentRipper < Ripper::SexpBuilder
+    def initialize(src, out)
+        super(src)
+        @out = out
+    end
+
+    def on_comment(token)
+        super.tap { |result| PP.pp(result, @out) }
+    end
+end
+
+# Each request is a JSON string with the path of a file. The answer is the
+# output with the comments followed by the output of Ripper.sexp, each one
+# preceded by a line with its size in bytes.
+$stdout.binmode
+$stdin.each_line do |line|
+    path = JSON.parse(line)
+    comments, sexp = StringIO.new, StringIO.new
+
+    begin
+        contents = File.read(path)
+        PP.pp(CommentRipper.new(contents, comments).parse, comments)
+        PP.pp(Ripper.sexp(contents), sexp)
+    rescue StandardError => e
+        $stderr.puts e.message
+    end
+
+    [comments.string, sexp.string].each do |output|
+        output = output.b
+        $stdout.write("#{output.bytesize}\n")
+        $stdout.write(output)
+    end
+    $stdout.flush
+end
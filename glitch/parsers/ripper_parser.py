@@ -1,7 +1,81 @@
+import os
+import json
+import subprocess
+from typing import Tuple
 from ply.lex import lex
 from ply.yacc import yacc
 
-def parser_yacc(script_ast):
+from glitch.budget import shielded
+
+class RipperWorker:
+    """A long-lived Ruby process which returns the comments and the 
+    Ripper.sexp output of a file in a single round trip. The process is 
+    started on the first request and restarted if it crashes."""
+
+    def __init__(self) -> None:
+        self.__process = None
+        # A request whose output was not read yet
+        self.__pending = False
+
+    def __start(self):
+        script = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+            "resources", "ripper_worker.rb")
+        self.__process = subprocess.Popen(["ruby", script], 
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def __read_output(self) -> str:
+        size = self.__process.stdout.readline()
+        if size == b"":
+            raise EOFError("The Ruby worker stopped unexpectedly")
+        return self.__process.stdout.read(int(size)).decode()
+
+    def parse(self, path: str) -> Tuple[str, str]:
+        if self.__pending:
+            # The last request was interrupted (e.g. by the budget of its
+            # file), so its output would be read by this one
+            self.close()
+        for attempt in range(2):
+            if self.__process is None or self.__process.poll() is not None:
+                self.__start()
+            try:
+                self.__pending = True
+                self.__process.stdin.write((json.dumps(path) + "\n").encode())
+                self.__process.stdin.flush()
+                output = self.__read_output(), self.__read_output()
+                self.__pending = False
+                return output
+            except (OSError, EOFError, ValueError):
+                self.close()
+                if attempt == 1:
+                    raise
+            except BaseException:
+                self.close()
+                raise
+
+    def close(self):
+        # An interrupted close (e.g. in wait) could leave the process half
+        # closed or never be able to wait for it again
+        shielded(self.__close)
+
+    def __close(self):
+        if self.__process is not None:
+            try:
+                self.__process.stdin.close()
+            except OSError:
+                pass
+            self.__process.kill()
+            self.__process.wait()
+            self.__process.stdout.close()
+            self.__process = None
+        self.__pending = False
+
+    def __del__(self):
+        self.__close()
+
+class RipperParser:
+    """PLY lexer and parser for the output of Ripper. The lexer and the LALR 
+    tables are built once and reused for every script."""
+
     tokens = ('LPAREN', 'RPAREN', 'STRING', 'ID', 'INTEGER', 
         'TRUE', 'FALSE', 'COMMENT', 'PLUS')
     states = (
@@ -15,111 +89,119 @@ def parser_yacc(script_ast):
     t_ignore_ANY = r'[nil\,\ \n]'
     t_PLUS = r'\+'
 
-    def t_INTEGER(t):
+    def __init__(self) -> None:
+        self.lexer = lex(module=self)
+        self.parser = yacc(module=self, debug=False)
+
+    def parse(self, script_ast):
+        self.lexer.begin('INITIAL')
+        return self.parser.parse(script_ast, lexer=self.lexer)
+
+    def t_INTEGER(self, t):
         r'[0-9]+'
         t.value = int(t.value)
         return t
 
-    def t_STRING(t):
+    def t_STRING(self, t):
         r'\"([^\\\n]|(\\.))*?\"'
         t.value = t.value[1:-1]
         return t
 
-    def t_begin_id(t):
+    def t_begin_id(self, t):
         r'\:'
         t.lexer.begin('id')
 
-    def t_id_end(t):
+    def t_id_end(self, t):
         r'[\,]'
         t.lexer.begin('INITIAL')
 
-    def t_id_RPAREN(t):
+    def t_id_RPAREN(self, t):
         r'\]'
         t.lexer.begin('INITIAL')
         return t
 
-    def t_id_COMMENT(t):
+    def t_id_COMMENT(self, t):
         r'@comment'
         return t
 
-    def t_id_ID(t):
+    def t_id_ID(self, t):
         r'[^,\]]+'
         return t
 
-    def t_ANY_error(t):
+    def t_ANY_error(self, t):
         print(f'Illegal character {t.value[0]!r}.')
         t.lexer.skip(1)
 
-    lexer = lex()
-    # Give the lexer some input
-    lexer.input(script_ast)
-
-    def p_program(p):
+    def p_program(self, p):
         r'program : comments list'
         p[0] = (p[1], p[2])
 
-    def p_comments(p):
+    def p_comments(self, p):
         r'comments : comments comment'
         p[0] = [p[2]] + p[1]
 
-    def p_comments_empty(p):
+    def p_comments_empty(self, p):
         r'comments : empty'
         p[0] = []
 
-    def p_comment(p):
+    def p_comment(self, p):
         r'comment : LPAREN COMMENT STRING LPAREN INTEGER INTEGER RPAREN RPAREN'
         p[0] = (p[3], p[5])
 
-    def p_list(p):
+    def p_list(self, p):
         r'list : LPAREN args RPAREN'
         p[0] = p[2]
 
-    def p_args_value(p):
+    def p_args_value(self, p):
         r'args : value args'
         p[0] = [p[1]] + p[2]
 
-    def p_args_list(p):
+    def p_args_list(self, p):
         r'args : list args'
         p[0] = [p[1]] + p[2]
 
-    def p_args_empty(p):
+    def p_args_empty(self, p):
         r'args : empty'
         p[0] = []
 
-    def p_empty(p):
+    def p_empty(self, p):
         r'empty : '
 
-    def p_value_string(p):
+    def p_value_string(self, p):
         r'value : string'
         p[0] = p[1]
     
-    def p_multi_string(p):
+    def p_multi_string(self, p):
         r'string : STRING PLUS string'
         p[0] = p[1] + p[3]
 
-    def p_string(p):
+    def p_string(self, p):
         r'string : STRING'
         p[0] = p[1]
 
-    def p_value_integer(p):
+    def p_value_integer(self, p):
         r'value : INTEGER'
         p[0] = p[1]
 
-    def p_value_false(p):
+    def p_value_false(self, p):
         r'value : FALSE'
         p[0] = False
     
-    def p_value_true(p):
+    def p_value_true(self, p):
         r'value : TRUE'
         p[0] = True
 
-    def p_value_id(p):
+    def p_value_id(self, p):
         r'value : ID'
         p[0] = ("id", p[1]) #FIXME
 
-    def p_error(p):
+    def p_error(self, p):
         print(f'Syntax error at {p.value!r}')
 
-    # Build the parser
-    parser = yacc()
-    return parser.parse(script_ast)
\ No newline at end of file
+_parser = None
+
+def parser_yacc(script_ast):
+    global _parser
+    if _parser is None:
+        _parser = RipperParser()
+    return _parser.parse(script_ast)
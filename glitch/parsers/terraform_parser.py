@@ -0,0 +1,166 @@
+import os
+from glitch.exceptions import EXCEPTIONS, throw_exception
+
+import glitch.parsers.parser as p
+from glitch.source import sources
+from glitch.repr.inter import *
+
+import hcl2
+
+class TerraformParser(p.Parser):
+    @staticmethod
+    def __get_element_code(start_line, end_line, source):
+        return source.span(source.offset(start_line - 1), source.offset(end_line))
+
+
+    def parse_keyvalues(self, unit_block: UnitBlock, keyvalues, source, type: str):
+        def create_keyvalue(start_line, end_line, name: str, value: str):
+            has_variable = ("${" in f"{value}") and ("}" in f"{value}") if value != None else False
+            if value == "null": value = ""
+
+            if type == "attribute":
+                keyvalue = Attribute(name, value, has_variable)
+            elif type == "variable":
+                keyvalue = Variable(name, value, has_variable)
+            keyvalue.line = start_line
+            keyvalue.code = TerraformParser.__get_element_code(start_line, end_line, source)
+            return keyvalue
+        
+        def process_list(name, value, start_line, end_line):
+            for i, v in enumerate(value):
+                if isinstance(v, dict):
+                    k = create_keyvalue(start_line, end_line, name + f"[{i}]", None)
+                    k.keyvalues = self.parse_keyvalues(unit_block, v, source, type)
+                    k_values.append(k)
+                elif isinstance(v, list):
+                    process_list(name + f"[{i}]", v, start_line, end_line)
+                else:
+                    k = create_keyvalue(start_line, end_line, name + f"[{i}]", v)
+                    k_values.append(k)
+
+        k_values = []
+        for name, keyvalue in keyvalues.items():
+            if name == "__start_line__" or name == "__end_line__": 
+                continue
+
+            if isinstance(keyvalue, dict):          # Note: local values (variables) can only enter here
+                value = keyvalue["value"]
+                if isinstance(value, dict):     # (ex: labels = {})
+                    k = create_keyvalue(keyvalue["__start_line__"], keyvalue["__end_line__"], name, None)
+                    k.keyvalues = self.parse_keyvalues(unit_block, value, source, type)
+                    k_values.append(k)
+                elif isinstance(value, list):   # (ex: x = [1,2,3])
+                    process_list(name, value, keyvalue["__start_line__"], keyvalue["__end_line__"])
+                else:   # (ex: x = 'test')
+                    if value == None:   # (ex: x = null)
+                        value = "null"
+                    k = create_keyvalue(keyvalue["__start_line__"], keyvalue["__end_line__"], name, value)
+                    k_values.append(k)    
+            elif isinstance(keyvalue, list) and type == "attribute":
+            # block (ex: access {} or dynamic setting {}; blocks of attributes; not allowed inside local values (variables))
+                if name == "dynamic":
+                    for block in keyvalue:
+                        for block_name, block_attributes in block.items():
+                            k = create_keyvalue(block_attributes["__start_line__"], 
+                                    block_attributes["__end_line__"], f"dynamic.{block_name}", None)
+                            k.keyvalues = self.parse_keyvalues(unit_block, block_attributes, source, type)
+                            k_values.append(k)
+                else:
+                    for block_attributes in keyvalue:
+                        k = create_keyvalue(block_attributes["__start_line__"], 
+                                block_attributes["__end_line__"], name, None)
+                        k.keyvalues = self.parse_keyvalues(unit_block, block_attributes, source, type)
+                        k_values.append(k)
+                    
+        return k_values
+
+
+    def parse_atomic_unit(self, type: str, unit_block: UnitBlock, dict, source):
+        def create_atomic_unit(start_line, end_line, type: str, name: str, source) -> AtomicUnit:
+            au = AtomicUnit(name, type)
+            au.line = start_line
+            au.code = TerraformParser.__get_element_code(start_line, end_line, source)
+            return au
+
+        def parse_resource():
+            for resource_type, resource in dict.items():
+                for name, attributes in resource.items():
+                    au = create_atomic_unit(attributes['__start_line__'], 
+                            attributes['__end_line__'], f"{type}.{resource_type}", name, source)
+                    au.attributes = self.parse_keyvalues(unit_block, attributes, source, "attribute")
+                    unit_block.add_atomic_unit(au)
+
+        def parse_simple_unit():
+            for name, attributes in dict.items():
+                au = create_atomic_unit(attributes['__start_line__'], attributes['__end_line__'], type, name, source)
+                au.attributes = self.parse_keyvalues(unit_block, attributes, source, "attribute")
+                unit_block.add_atomic_unit(au)
+
+        if type in ["resource", "data"]:
+            parse_resource()
+        elif type in ["variable", "module", "output"]:
+            parse_simple_unit()
+
+
+    def parse_comments(self, unit_block: UnitBlock, comments, source):
+        def create_comment(value, start_line, end_line, source):
+            c = Comment(value)
+            c.line = start_line
+            c.code = TerraformParser.__get_element_code(start_line, end_line, source)
+            return c
+        
+        for comment in comments:
+            unit_block.add_comment(create_comment(comment["value"], comment["__start_line__"], comment["__end_line__"], source))
+
+
+    def parse_file(self, path: str, type: UnitBlockType) -> UnitBlock:
+        source = sources.open(path)
+        try:
+            parsed_hcl = hcl2.loads(source.text, True)
+
+            unit_block = UnitBlock(path, type)
+            unit_block.path = path
+            for key, value in parsed_hcl.items():
+                if key in ["resource", "data", "variable", "module", "output"]:
+                    for v in value:
+                        self.parse_atomic_unit(key, unit_block, v, source)
+                elif key == "__comments__":
+                    self.parse_comments(unit_block, value, source)
+                elif key == "locals":
+                    for local in value:
+                        unit_block.variables += self.parse_keyvalues(unit_block, local, source, "variable")
+                elif key == "provider":
+                    continue
+                else:
+                    throw_exception(EXCEPTIONS["TERRAFORM_COULD_NOT_PARSE"], path)
+            return unit_block
+        except:
+            throw_exception(EXCEPTIONS["TERRAFORM_COULD_NOT_PARSE"], path)
+            return None
+
+
+    def parse_module(self, path: str) -> Module:
+        res: Module = Module(os.path.basename(os.path.normpath(path)), path)
+        super().parse_file_structure(res.folder, path)
+
+        files = [f.path for f in os.scandir(f"{path}") 
+            if f.is_file() and not f.is_symlink()]
+        for f in files:
+            unit_block = self.parse_file(f, "unknown")
+            res.add_block(unit_block)
+        
+        return res
+
+
+    def parse_folder(self, path: str) -> Project:
+        res: Project = Project(os.path.basename(os.path.normpath(path)))
+        res.add_module(self.parse_module(path))
+
+        subfolders = [f.path for f in os.scandir(f"{path}") 
+            if f.is_dir() and not f.is_symlink()]
+        for d in subfolders:
+            aux = self.parse_folder(d)
+            res.blocks += aux.blocks
+            res.modules += aux.modules
+
+        return res
@@ -0,0 +1,106 @@
+import os
+import json
+import heapq
+import time
+from typing import List
+
+from glitch.analysis.rules import ErrorSink, RuleVisitor, Traversal
+from glitch.repr.inter import UnitBlock
+
+class NodeCounter(Traversal):
+    """Counts the elements of the IR which are visited by the analyses."""
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.nodes = 0
+
+    def visit(self, c, file: str, errors: ErrorSink):
+        self.nodes += 1
+        super().visit(c, file, errors)
+
+    def visit_unitblock(self, u: UnitBlock, errors: ErrorSink):
+        self.nodes += 1
+        super().visit_unitblock(u, errors)
+
+def count_nodes(code) -> int:
+    counter = NodeCounter()
+    counter.check(code)
+    return counter.nodes
+
+def new_record(path: str) -> dict:
+    """Record with the cost of each phase of the processing of a path. The
+    time of a phase which did not run is None."""
+    return {"path": path, "parse": None, "analysis": {}, "stats": None,
+        "nodes": 0, "files": 0, "bytes": 0}
+
+def check_inter(inter, analyses: List[RuleVisitor], errors, stats, record: dict):
+    """Same as runner.check_inter, but records the time of each analysis and
+    of the stats. The analyses are checked in a pass per analysis, so that
+    the time of each one is measured separately."""
+    if inter is not None:
+        record["nodes"] = count_nodes(inter)
+        sink = ErrorSink()
+        for analysis in analyses:
+            start = time.perf_counter()
+            Traversal([analysis]).check(inter, sink)
+            record["analysis"][analysis.get_name()] = time.perf_counter() - start
+        errors += sink
+
+    start = time.perf_counter()
+    stats.compute(inter)
+    record["stats"] = time.perf_counter() - start
+
+    record["files"] = len(stats.file_loc)
+    for file in stats.file_loc:
+        try:
+            record["bytes"] += os.path.getsize(file)
+        except OSError:
+            pass
+
+def total_time(record: dict) -> float:
+    return (record["parse"] or 0) + sum(record["analysis"].values()) + \
+        (record["stats"] or 0)
+
+class ProfileReport:
+    """Writes the records of the paths processed to a file, as JSON lines,
+    and keeps the records of the n slowest paths."""
+
+    def __init__(self, path: str, n: int = 10) -> None:
+        self.n = n
+        self.__file = open(path, "w")
+        # Min-heap of (time, order, record), so that the fastest is replaced
+        self.__slowest = []
+        self.__count = 0
+
+    def add(self, records: List[dict]):
+        for record in records:
+            self.__file.write(json.dumps(record) + "\n")
+            if "skipped" in record or "cached" in record:
+                continue
+
+            entry = (total_time(record), self.__count, record)
+            self.__count += 1
+            if len(self.__slowest) < self.n:
+                heapq.heappush(self.__slowest, entry)
+            elif entry[0] > self.__slowest[0][0]:
+                heapq.heapreplace(self.__slowest, entry)
+
+    def slowest(self) -> List[dict]:
+        """Returns the records of the slowest paths, from the slowest."""
+        return [record for _, _, record in sorted(self.__slowest,
+            key=lambda e: (-e[0], e[1]))]
+
+    def close(self):
+        self.__file.close()
+
+    def __enter__(self) -> "ProfileReport":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def skipped_record(path: str, reason: str) -> dict:
+    return {"path": path, "skipped": reason}
+
+def cached_record(path: str) -> dict:
+    return {"path": path, "cached": True}
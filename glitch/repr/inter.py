@@ -1,11 +1,29 @@
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import Union
 
+from glitch.source import Span
+
+# The classes of the intermediate representation use __slots__ instead of
+# a __dict__ per instance, since there are many instances of them
 class CodeElement(ABC):
+    __slots__ = ("line", "column", "__code")
+
     def __init__(self) -> None:
         self.line: int = -1
         self.column: int = -1
-        self.code: str = ""
+        self.__code = ""
+
+    @property
+    def code(self) -> str:
+        # The parsers may give a span of the source instead of a string,
+        # so that the code of nested elements is not copied at every level
+        code = self.__code
+        return code if isinstance(code, str) else str(code)
+
+    @code.setter
+    def code(self, code: Union[str, Span]):
+        self.__code = code
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -15,6 +33,8 @@ class CodeElement(ABC):
         pass
 
 class Block(CodeElement):
+    __slots__ = ("statements",)
+
     def __init__(self) -> None:
         super().__init__()
         self.statements = []
@@ -23,6 +43,8 @@ class Block(CodeElement):
         self.statements.append(statement)
 
 class ConditionalStatement(Block):
+    __slots__ = ("condition", "else_statement", "is_default", "type")
+
     class ConditionType(Enum):
         IF = 1
         SWITCH = 2
@@ -53,6 +75,8 @@ class ConditionalStatement(Block):
         return res
 
 class Comment(CodeElement):
+    __slots__ = ("content",)
+
     def __init__(self, content: str) -> None:
         super().__init__()
         self.content: str = content
@@ -64,6 +88,8 @@ class Comment(CodeElement):
         return (tab * "\t") + self.content + ' (on line ' + str(self.line) + ')'
 
 class KeyValue(CodeElement):
+    __slots__ = ("name", "value", "has_variable", "keyvalues")
+
     def __init__(self, name: str, value: str, has_variable: bool):
         self.name: str = name
         self.value: str = value
@@ -78,6 +104,8 @@ class KeyValue(CodeElement):
             return f"{self.name}:{value}"
 
 class Variable(KeyValue):
+    __slots__ = ()
+
     def __init__(self, name: str, value: str, has_variable: bool) -> None:
         super().__init__(name, value, has_variable)
 
@@ -94,6 +122,8 @@ class Variable(KeyValue):
                 " (on line " + str(self.line) + f" {self.has_variable})"
 
 class Attribute(KeyValue):
+    __slots__ = ()
+
     def __init__(self, name: str, value: str, has_variable: bool) -> None:
         super().__init__(name, value, has_variable)
 
@@ -110,6 +140,8 @@ class Attribute(KeyValue):
                 " (on line " + str(self.line) + f" {self.has_variable})"
 
 class AtomicUnit(Block):
+    __slots__ = ("name", "type", "attributes")
+
     def __init__(self, name: str, type: str) -> None:
         super().__init__()
         self.name: str = name
@@ -137,6 +169,8 @@ class AtomicUnit(Block):
         return res
 
 class Dependency(CodeElement):
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
         super().__init__()
         self.name: str = name
@@ -155,6 +189,9 @@ class UnitBlockType(str, Enum):
     unknown = "unknown"
 
 class UnitBlock(Block):
+    __slots__ = ("dependencies", "comments", "variables", "atomic_units", 
+        "unit_blocks", "attributes", "name", "path", "type")
+
     def __init__(self, name: str, type: UnitBlockType) -> None:
         super().__init__()
         self.dependencies: list[Dependency] = []
@@ -222,6 +259,8 @@ class UnitBlock(Block):
         return res
 
 class File:
+    __slots__ = ("name",)
+
     def __init__(self, name) -> None:
         self.name: str = name
 
@@ -229,6 +268,8 @@ class File:
         return (tab * "\t") + self.name
 
 class Folder:
+    __slots__ = ("content", "name")
+
     def __init__(self, name) -> None:
         self.content: list = []
         self.name: str = name
@@ -249,6 +290,8 @@ class Folder:
         return res
 
 class Module:
+    __slots__ = ("name", "path", "blocks", "folder")
+
     def __init__(self, name, path) -> None:
         self.name: str = name
         self.path: str = path
@@ -274,6 +317,8 @@ class Module:
         return res
 
 class Project:
+    __slots__ = ("name", "modules", "blocks")
+
     def __init__(self, name) -> None:
         self.name: str = name
         self.modules: list[Module] = []
@@ -0,0 +1,185 @@
+import time
+from typing import Optional
+
+from glitch.analysis.duplicates import Fingerprints, fingerprint
+from glitch.analysis.rules import Error, RuleVisitor, Traversal
+from glitch.budget import Budget, BudgetExceeded
+from glitch.cache import ResultCache
+from glitch.ir import Entry, IRReader, IRWriter
+from glitch.parsers.parser import Parser
+from glitch import profiling
+from glitch.source import sources
+from glitch.stats.stats import FileStats
+from glitch.tech import Tech
+
+# NOTE: These are necessary in order for python to load the visitors.
+# Otherwise, python will not consider these types of rules.
+from glitch.analysis.design import DesignVisitor
+from glitch.analysis.security import SecurityVisitor
+
+def get_parser(tech: Tech) -> Parser:
+    # The parsers are imported here so that only the dependencies of the 
+    # chosen tech are loaded
+    if tech == Tech.ansible:
+        from glitch.parsers.ansible_parser import AnsibleParser
+        return AnsibleParser()
+    elif tech == Tech.chef:
+        from glitch.parsers.chef_parser import ChefParser
+        return ChefParser()
+    elif tech == Tech.puppet:
+        from glitch.parsers.puppet_parser import PuppetParser
+        return PuppetParser()
+    elif tech == Tech.docker:
+        from glitch.parsers.docker_parser import DockerParser
+        return DockerParser()
+    elif tech == Tech.terraform:
+        from glitch.parsers.terraform_parser import TerraformParser
+        return TerraformParser()
+
+def get_analyses(tech: Tech, config: str, smells, profile_rules: bool = False) -> list[RuleVisitor]:
+    """If profile_rules is True, the analyses measure the cost of the rules
+    of each smell, which is moved to the stats of each path checked."""
+    analyses = []
+    for r in RuleVisitor.__subclasses__():
+        if smells == () or r.get_name() in smells:
+            analysis = r(tech)
+            analysis.config(config)
+            if profile_rules:
+                analysis.profile_rules()
+            analyses.append(analysis)
+    return analyses
+
+def collect_costs(analyses, stats: FileStats):
+    """Moves the costs of the rules measured by the analyses to the stats."""
+    for analysis in analyses:
+        if analysis.costs is not None:
+            stats.costs.merge(analysis.costs)
+            analysis.costs.clear()
+
+def check_inter(inter, analyses, errors, stats):
+    if inter != None:
+        # All the analyses are checked in a single pass over the IR
+        errors += Traversal(analyses).check(inter)
+    stats.compute(inter)
+
+def parse_and_check(type, path, module, parser, analyses, errors, stats, 
+        record: Optional[dict] = None):
+    if record is None:
+        check_inter(parser.parse(path, type, module), analyses, errors, stats)
+        return
+
+    start = time.perf_counter()
+    inter = parser.parse(path, type, module)
+    record["parse"] = time.perf_counter() - start
+    profiling.check_inter(inter, analyses, errors, stats, record)
+
+def skipped(path: str, reason: str, profile: bool = False) -> tuple[list[Error], FileStats]:
+    """Results of a path which exceeded its budget. The results found
+    until then are discarded."""
+    stats = FileStats()
+    stats.skipped[path] = reason
+    if profile:
+        stats.profile.append(profiling.skipped_record(path, reason))
+    return [], stats
+
+def check(type, path, module, parser, analyses, cache: ResultCache = None,
+        budget: Budget = Budget(), profile: bool = False) -> tuple[list[Error], FileStats]:
+    """If profile is True, the stats also have the record of the time spent
+    in each phase of the analysis of the path (see glitch.profiling)."""
+    if cache is not None:
+        key = cache.key(path)
+        cached = cache.get(key)
+        if cached is not None:
+            if profile:
+                cached[1].profile.append(profiling.cached_record(path))
+            return cached
+
+    errors, stats = [], FileStats()
+    record = profiling.new_record(path) if profile else None
+    try:
+        budget.run(parse_and_check, type, path, module, parser, analyses, errors, 
+            stats, record)
+    except BudgetExceeded as e:
+        # Not cached, since the path may not exceed the budget of other runs
+        errors, stats = skipped(path, e.reason, profile)
+        collect_costs(analyses, stats)
+        return errors, stats
+
+    if cache is not None:
+        cache.put(key, errors, stats)
+    # The costs are not cached, since the rules do not run for cached paths
+    collect_costs(analyses, stats)
+    if record is not None:
+        stats.profile.append(record)
+    return errors, stats
+
+def fingerprint_files(stats: FileStats, fingerprints: bool) -> Optional[dict[str, Fingerprints]]:
+    files = None
+    if fingerprints:
+        files = {file: fingerprint(file) for file in stats.file_loc}
+    # The analysis of the files is finished
+    sources.evict()
+    return files
+
+def check_and_fingerprint(type, path, module, parser, analyses, cache: ResultCache, 
+        fingerprints: bool, budget: Budget = Budget(), profile: bool = False) -> \
+            tuple[list[Error], FileStats, Optional[dict[str, Fingerprints]]]:
+    """Also returns the fingerprints of each file analyzed, if asked, to find
+    the blocks duplicated between files."""
+    errors, stats = check(type, path, module, parser, analyses, cache, budget, profile)
+    return errors, stats, fingerprint_files(stats, fingerprints)
+
+def parse_to_ir(type, path, module, parser, writer: IRWriter):
+    """Parses the path and adds its IR, with the sources of the files 
+    parsed, to the writer."""
+    try:
+        writer.add(path, parser.parse(path, type, module), list(sources))
+    finally:
+        sources.evict()
+
+def check_from_ir(entry: Entry, analyses, fingerprints: bool, 
+        budget: Budget = Budget(), profile: bool = False) -> \
+            tuple[list[Error], FileStats, Optional[dict[str, Fingerprints]]]:
+    """Same as check_and_fingerprint for a path loaded from an IR file."""
+    path, inter, files = entry
+    # The analyses read the sources saved with the IR instead of the files
+    for source in files:
+        sources.add(source)
+    errors, stats = [], FileStats()
+    try:
+        if profile:
+            # The path is not parsed, so its record has no parse time
+            record = profiling.new_record(path)
+            budget.run(profiling.check_inter, inter, analyses, errors, stats, record)
+            stats.profile.append(record)
+        else:
+            budget.run(check_inter, inter, analyses, errors, stats)
+    except BudgetExceeded as e:
+        errors, stats = skipped(path, e.reason, profile)
+    collect_costs(analyses, stats)
+    return errors, stats, fingerprint_files(stats, fingerprints)
+
+# Each process of a worker pool builds its own parser and visitors once.
+_worker = {}
+
+def init_worker(tech: Tech, config: str, smells, cache: ResultCache, 
+        budget: Budget = Budget(), profile: bool = False, profile_rules: bool = False):
+    _worker["parser"] = get_parser(tech)
+    _worker["analyses"] = get_analyses(tech, config, smells, profile_rules)
+    _worker["cache"] = cache
+    _worker["budget"] = budget
+    _worker["profile"] = profile
+
+def check_in_worker(type, module, fingerprints, path) -> \
+        tuple[list[Error], FileStats, Optional[dict[str, Fingerprints]]]:
+    return check_and_fingerprint(type, path, module, _worker["parser"], 
+        _worker["analyses"], _worker["cache"], fingerprints, _worker["budget"], 
+        _worker["profile"])
+
+def check_ir_in_worker(ir: str, fingerprints, i: int) -> \
+        tuple[list[Error], FileStats, Optional[dict[str, Fingerprints]]]:
+    # Each worker maps the IR file once and only loads the records it checks
+    if _worker.get("ir") is None:
+        _worker["ir"] = IRReader(ir)
+    return check_from_ir(_worker["ir"][i], _worker["analyses"], fingerprints, 
+        _worker["budget"], _worker["profile"])
@@ -0,0 +1,193 @@
+import io
+import os
+import sys
+import json
+import inspect
+import tempfile
+import threading
+import traceback
+import socketserver
+from typing import TextIO
+
+from glitch.analysis.rules import Error, RuleVisitor
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import get_parser, get_analyses, parse_and_check
+from glitch.source import sources
+from glitch.stats.stats import FileStats
+from glitch.tech import Tech
+
+class RPCError(Exception):
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INVALID_PARAMS = -32602
+    INTERNAL_ERROR = -32603
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class Server:
+    """JSON-RPC 2.0 server which keeps the parsers and the configured visitors
+    warm between requests. Each request and response is a JSON object in a
+    single line.
+
+    Methods:
+        analyze: analyzes the file in "path" (or the content in "content",
+            if given, as if it was the file in "path") with the "tech",
+            "config", "smells" and "type" params, which have the same meaning
+            as the options of the command line tool. Returns the errors found.
+        shutdown: stops the server.
+
+    Requests may be handled by several threads, but files are analyzed one
+    at a time, since the sources read for each request are evicted once it
+    is answered.
+    """
+
+    def __init__(self) -> None:
+        self.__parsers = {}
+        # Each visitor keeps its own configuration, so the visitors of
+        # different configs can be kept at the same time
+        self.__analyses = {}
+        self.__lock = threading.Lock()
+        self.stopped = False
+
+    def __get_analyses(self, tech: Tech, config: str, smells) -> list[RuleVisitor]:
+        key = (tech, config, tuple(smells))
+        if key not in self.__analyses:
+            self.__analyses[key] = get_analyses(tech, config, smells)
+        return self.__analyses[key]
+
+    def __get_parser(self, tech: Tech):
+        if tech not in self.__parsers:
+            self.__parsers[tech] = get_parser(tech)
+        return self.__parsers[tech]
+
+    def analyze(self, path: str, tech: str, config: str = None, smells: list = None,
+            type: str = UnitBlockType.unknown, content: str = None) -> list[dict]:
+        try:
+            tech = Tech(tech)
+            type = UnitBlockType(type)
+        except ValueError as e:
+            raise RPCError(RPCError.INVALID_PARAMS, str(e))
+
+        if config is None:
+            config = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+            "configs", "default.ini")
+        elif not os.path.isfile(config):
+            raise RPCError(RPCError.INVALID_PARAMS, f"Path '{config}' is not a file.")
+        if not smells:
+            smells = list(map(lambda c: c.get_name(), RuleVisitor.__subclasses__()))
+
+        with self.__lock:
+            parser = self.__get_parser(tech)
+            analyses = self.__get_analyses(tech, config, smells)
+
+            errors = []
+            if content is None:
+                if not os.path.isfile(path):
+                    raise RPCError(RPCError.INVALID_PARAMS, f"Path '{path}' is not a file.")
+                try:
+                    parse_and_check(type, path, False, parser, analyses, errors, FileStats())
+                finally:
+                    sources.evict()
+            else:
+                with tempfile.TemporaryDirectory() as tmp:
+                    tmp_path = os.path.join(tmp, os.path.basename(path))
+                    with open(tmp_path, "w") as f:
+                        f.write(content)
+                    try:
+                        parse_and_check(type, tmp_path, False, parser, analyses, errors, FileStats())
+                    finally:
+                        sources.evict()
+                for error in errors:
+                    error.path = error.path.replace(tmp_path, path)
+                    error.repr = error.repr.replace(tmp_path, path)
+
+        errors = sorted(set(errors), key=lambda e: (e.path, e.line, e.code))
+        return [{
+            "code": e.code,
+            "description": Error.ALL_ERRORS[e.code],
+            "path": e.path,
+            "line": e.line,
+            "repr": e.repr.split('\n')[0].strip()
+        } for e in errors]
+
+    def shutdown(self) -> None:
+        self.stopped = True
+
+    def handle(self, line: str):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"jsonrpc": "2.0", "id": None,
+                "error": {"code": RPCError.PARSE_ERROR, "message": "Parse error"}}
+
+        id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise RPCError(RPCError.INVALID_REQUEST, "Invalid Request")
+
+            methods = {"analyze": self.analyze, "shutdown": self.shutdown}
+            if request["method"] not in methods:
+                raise RPCError(RPCError.METHOD_NOT_FOUND, "Method not found")
+
+            method, params = methods[request["method"]], request.get("params", {})
+            try:
+                if isinstance(params, list):
+                    args = inspect.signature(method).bind(*params)
+                else:
+                    args = inspect.signature(method).bind(**params)
+            except TypeError as e:
+                raise RPCError(RPCError.INVALID_PARAMS, str(e))
+            result = method(*args.args, **args.kwargs)
+            response = {"jsonrpc": "2.0", "id": id, "result": result}
+        except RPCError as e:
+            response = {"jsonrpc": "2.0", "id": id,
+                "error": {"code": e.code, "message": e.message}}
+        except Exception as e:
+            traceback.print_exc()
+            response = {"jsonrpc": "2.0", "id": id,
+                "error": {"code": RPCError.INTERNAL_ERROR, "message": str(e)}}
+
+        # Notifications do not have an answer
+        if isinstance(request, dict) and "id" not in request:
+            return None
+        return response
+
+    def serve(self, rfile: TextIO, wfile: TextIO):
+        for line in rfile:
+            if line.strip() == "":
+                continue
+
+            response = self.handle(line)
+            if response is not None:
+                wfile.write(json.dumps(response) + "\n")
+                wfile.flush()
+            if self.stopped:
+                break
+
+def serve(port: int = None):
+    """Serves requests from stdin/stdout or, if a port is given, from 
+    connections to that port on localhost (one connection at a time)."""
+    server = Server()
+    out = sys.stdout
+    # The parsers may print to stdout, which would break the protocol
+    sys.stdout = sys.stderr
+
+    try:
+        if port is None:
+            server.serve(sys.stdin, out)
+            return
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                server.serve(io.TextIOWrapper(self.rfile, encoding="utf-8"),
+                    io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True))
+
+        with socketserver.TCPServer(("127.0.0.1", port), Handler) as tcp:
+            while not server.stopped:
+                tcp.handle_request()
+    finally:
+        sys.stdout = out
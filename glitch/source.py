@@ -0,0 +1,251 @@
+import io
+import os
+import mmap
+import locale
+import threading
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Union
+
+class Source:
+    """Content of a file, which is read only once. Files bigger than
+    MMAP_SIZE bytes are memory-mapped instead of being read to memory.
+
+    The text and the lines are decoded like a file opened in text mode
+    (with universal newlines), so they are the same as the ones returned
+    by read() and readlines(). As in that case, a UnicodeDecodeError is
+    raised if the file cannot be decoded."""
+
+    MMAP_SIZE = 1 << 20
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__text = None
+        self.__lines = None
+        self.__offsets = None
+        self.__mmap = None
+
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= Source.MMAP_SIZE:
+                self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = self.__mmap
+            else:
+                self.data = f.read()
+
+    @property
+    def text(self) -> str:
+        if self.__text is None:
+            # Decoded straight from the data (which may be mapped), which
+            # a text stream would first copy to memory
+            text = str(self.data, locale.getpreferredencoding(False))
+            if "\r" in text:
+                # Universal newlines
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            self.__text = text
+        return self.__text
+
+    @property
+    def lines(self) -> List[str]:
+        if self.__lines is None:
+            self.__lines = io.StringIO(self.text).readlines()
+        return self.__lines
+
+    @property
+    def offsets(self) -> List[int]:
+        """Offset in the text of the start of each line, followed by the
+        length of the text."""
+        if self.__offsets is None:
+            self.__offsets = list(accumulate(map(len, self.lines), initial=0))
+        return self.__offsets
+
+    def offset(self, line: int, column: Optional[int] = 0) -> int:
+        """Returns the offset in the text of the column of the line (both
+        starting at 0), or of the end of the line if the column is None.
+        As when slicing lists, negative indexes count from the end and
+        indexes out of bounds are clamped."""
+        offsets = self.offsets
+        line = slice(line).indices(len(offsets) - 1)[1]
+        start = offsets[line]
+        length = offsets[line + 1] - start if line + 1 < len(offsets) else 0
+        return start + slice(column).indices(length)[1]
+
+    def span(self, start: int, end: int) -> Union[str, "Span"]:
+        """Returns the text between the offsets start and end. Texts shorter
+        than Span.MIN_SIZE are copied, since they use less memory than a
+        span."""
+        if end - start < Span.MIN_SIZE:
+            return self.text[start:end]
+        return Span(self, start, end)
+
+    def open(self) -> io.TextIOWrapper:
+        """Returns a text stream with the content of the file, which behaves
+        like the file opened in text mode, for the code which expects a 
+        file object."""
+        raw = _BufferReader(self.data)
+        raw.name = self.path
+        return io.TextIOWrapper(io.BufferedReader(raw))
+
+    def __getstate__(self):
+        # Only the text is saved (e.g. with the spans of the intermediate
+        # representation). A loaded source has no data.
+        return (self.path, self.text)
+
+    def __setstate__(self, state):
+        self.path, self.__text = state
+        self.__lines = None
+        self.__offsets = None
+        self.__mmap = None
+        self.data = None
+
+    def close(self):
+        # The text is kept for the spans of the source which are still in
+        # use, but the lines can be computed from it again
+        self.__lines = None
+        self.__offsets = None
+        if self.__mmap is not None:
+            try:
+                self.__mmap.close()
+            except BufferError:
+                # A stream of the file is still open, so the map is only
+                # closed once the stream is no longer used
+                pass
+            self.__mmap = None
+        self.data = None
+
+
+class _BufferReader(io.RawIOBase):
+    """Binary stream which reads the data of a buffer (e.g. a memory map)
+    without copying it. The buffer cannot be closed until the stream is."""
+
+    def __init__(self, data) -> None:
+        self.__data = memoryview(data)
+        self.__position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        chunk = self.__data[self.__position:self.__position + len(b)]
+        b[:len(chunk)] = chunk
+        self.__position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += len(self.__data)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self.__position = offset
+        return self.__position
+
+    def tell(self) -> int:
+        return self.__position
+
+    def close(self):
+        if not self.closed:
+            self.__data.release()
+        super().close()
+
+
+class Span:
+    """Span of the text of a source. The text is only copied when it is
+    converted to a string."""
+
+    __slots__ = ("source", "start", "end")
+
+    MIN_SIZE = 64
+
+    def __init__(self, source: Source, start: int, end: int) -> None:
+        self.source = source
+        self.start = start
+        self.end = end
+
+    def __str__(self) -> str:
+        return self.source.text[self.start:self.end]
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+
+class SourceStore:
+    """Sources of the files being analyzed, shared by the parsers, the
+    analyses and the stats so that each file is read only once. The
+    sources are kept until they are evicted, which should be done once
+    the analysis of the files is finished.
+
+    The sources of other files (e.g. the files of the errors being 
+    printed) are kept in a small LRU cache of RECENT_SIZE files instead.
+
+    The store can be used by several threads. Evicting every source also
+    closes the ones which other threads may still be using, so threads
+    should only evict the files they analyzed (or wait for each other)."""
+
+    RECENT_SIZE = 8
+
+    def __init__(self) -> None:
+        self.__sources: Dict[str, Source] = {}
+        self.__recent: OrderedDict[str, Source] = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.__sources
+
+    def __len__(self) -> int:
+        return len(self.__sources)
+
+    def __iter__(self) -> Iterator[Source]:
+        with self.__lock:
+            return iter(list(self.__sources.values()))
+
+    def add(self, source: Source):
+        """Adds a source which is kept until it is evicted, e.g. a source
+        loaded with the intermediate representation instead of read from
+        its file."""
+        with self.__lock:
+            self.__recent.pop(source.path, None)
+            self.__sources[source.path] = source
+
+    def open(self, path: str, keep: bool = True) -> Source:
+        """Returns the source of the file in path. If the file is not in the
+        store, it is read and kept until it is evicted if keep is True.
+        Otherwise, it is kept in the cache of recent files."""
+        with self.__lock:
+            source = self.__sources.get(path)
+            if source is not None:
+                return source
+
+            source = self.__recent.pop(path, None)
+            if source is None:
+                source = Source(path)
+            if keep:
+                self.__sources[path] = source
+                return source
+
+            self.__recent[path] = source
+            if len(self.__recent) > SourceStore.RECENT_SIZE:
+                _, old = self.__recent.popitem(last=False)
+                old.close()
+            return source
+
+    def evict(self, path: str = None):
+        """Removes the source of the file in path, or every source if the
+        path is not given."""
+        with self.__lock:
+            if path is None:
+                sources = list(self.__sources.values())
+                self.__sources.clear()
+            else:
+                sources = [s for s in (self.__sources.pop(path, None), 
+                    self.__recent.pop(path, None)) if s is not None]
+
+            for source in sources:
+                source.close()
+
+# Store of the process. Each worker of a process pool has its own store.
+sources = SourceStore()
@@ -1,21 +1,62 @@
 from glob import escape
-import pandas as pd
 from glitch.analysis.rules import Error
+from glitch.profiling import total_time
 from prettytable import PrettyTable
 
-def print_stats(errors, smells, file_stats, format):
+class SmellStats:
+    def __init__(self, smells) -> None:
+        self.occurrences = {}
+        self.files_with_the_smell = {'Combined': set()}
+        for smell_type in smells:
+            for code in Error.ERRORS[smell_type].keys():
+                self.occurrences[code] = 0
+                self.files_with_the_smell[code] = set()
+
+    def add(self, code: str, path: str):
+        self.occurrences[code] += 1
+        self.files_with_the_smell[code].add(path)
+        self.files_with_the_smell['Combined'].add(path)
+
+    def add_errors(self, errors):
+        for error in errors:
+            self.add(error.code, error.path)
+
+def slowest_table(slowest) -> tuple[list[str], list[list]]:
+    """Columns and rows of the table with the records of the slowest files."""
+    analyses = []
+    for record in slowest:
+        for name in record["analysis"]:
+            if name not in analyses:
+                analyses.append(name)
+
+    def seconds(t):
+        return "-" if t is None else round(t, 4)
+
+    columns = ["Slowest files", "Time (s)", "Parse (s)"] + \
+        [f"Analysis {name} (s)" for name in analyses] + \
+        ["Stats (s)", "IR nodes", "Bytes"]
+    rows = []
+    for record in slowest:
+        rows.append([record["path"], seconds(total_time(record)), seconds(record["parse"])] + 
+            [seconds(record["analysis"].get(name)) for name in analyses] + 
+            [seconds(record["stats"]), record["nodes"], record["bytes"]])
+    return columns, rows
+
+def cost_columns(costs, codes) -> list:
+    """CPU time (in ms) and invocations of the rules of the codes. The codes 
+    found by the rules of another code have no cost of their own."""
+    codes = [code for code in codes if code in costs.calls]
+    if len(codes) == 0:
+        return ["-", "-"]
+    return [round(sum(costs.time[code] for code in codes) * 1000, 2), 
+        sum(costs.calls[code] for code in codes)]
+
+def print_stats(smell_stats: SmellStats, file_stats, format, slowest=None):
     total_files = len(file_stats.files)
-    occurrences = {}
-    files_with_the_smell = {'Combined': set()}
-    for smell_type in smells:
-        for code in Error.ERRORS[smell_type].keys():
-            occurrences[code] = 0
-            files_with_the_smell[code] = set()
-
-    for error in errors:
-        occurrences[error.code] += 1
-        files_with_the_smell[error.code].add(error.path)
-        files_with_the_smell['Combined'].add(error.path)
+    occurrences = smell_stats.occurrences
+    files_with_the_smell = smell_stats.files_with_the_smell
+    # The costs are only shown when the rules were profiled
+    costs = file_stats.costs if file_stats.costs else None
         
     stats_info = []
     total_occur = 0
@@ -26,21 +67,24 @@ def print_stats(errors, smells, file_stats, format):
         stats_info.append([Error.ALL_ERRORS[code], n, 
             round(n / (file_stats.loc / 1000), 2), 
             round((len(files_with_the_smell[code]) / total_files) * 100, 2)])
+        if costs is not None:
+            stats_info[-1] += cost_columns(costs, [code])
     stats_info.append([
         "Combined", 
         total_occur,
         total_smell_density,
         round((len(files_with_the_smell['Combined']) / total_files) * 100, 2)
     ])
+    if costs is not None:
+        stats_info[-1] += cost_columns(costs, occurrences.keys())
 
     if (format == "prettytable"):
         table = PrettyTable()
         table.field_names = ["Smell", "Occurrences", 
-            "Smell density (Smell/KLoC)", "Proportion of scripts (%)"]
+            "Smell density (Smell/KLoC)", "Proportion of scripts (%)"] + \
+            (["CPU time (ms)", "Invocations"] if costs is not None else [])
+        table.align = 'l'
         table.align["Smell"] = 'r'
-        table.align["Occurrences"] = 'l'
-        table.align["Smell density (Smell/KLoC)"] = 'l'
-        table.align["Proportion of scripts (%)"] = 'l'
         smells_info = stats_info[:-1]
         for smell in smells_info:
             smell[0] = smell[0].split(' - ')[0]
@@ -63,14 +107,28 @@ def print_stats(errors, smells, file_stats, format):
         attributes.field_names = ["Total IaC files", "Lines of Code"]
         attributes.add_row([total_files, file_stats.loc])
         print(attributes)
+
+        if slowest:
+            columns, rows = slowest_table(slowest)
+            table = PrettyTable()
+            table.field_names = columns
+            table.align = 'l'
+            table.align["Slowest files"] = 'r'
+            for row in rows:
+                table.add_row(row)
+            print(table)
     elif (format == "latex"):
+        # pandas takes a long time to import and is only needed here
+        import pandas as pd
+
         smells_info = stats_info[:-1]
         smells_info = sorted(smells_info, key=lambda x: x[0])
         for smell in smells_info:
             smell[0] = smell[0].split(' - ')[0]
         smells_info.append(stats_info[-1])
         table = pd.DataFrame(smells_info, columns = ["\\textbf{Smell}", "\\textbf{Occurrences}", 
-            "\\textbf{Smell density (Smell/KLoC)}", "\\textbf{Proportion of scripts (\%)}"])
+            "\\textbf{Smell density (Smell/KLoC)}", "\\textbf{Proportion of scripts (\%)}"] + 
+            (["\\textbf{CPU time (ms)}", "\\textbf{Invocations}"] if costs is not None else []))
         latex = table.style.hide(axis='index').format(escape=None, 
                 precision=2, thousands=',').to_latex()
         combined = latex[:latex.rfind('\\\\')].rfind('\\\\')
@@ -80,4 +138,10 @@ def print_stats(errors, smells, file_stats, format):
         attributes = pd.DataFrame([[total_files, file_stats.loc]], columns=
             ["\\textbf{Total IaC files}", "\\textbf{Lines of Code}"])
         print(attributes.style.hide(axis='index').format(escape=None, 
-                precision=2, thousands=',').to_latex())
\ No newline at end of file
+                precision=2, thousands=',').to_latex())
+
+        if slowest:
+            columns, rows = slowest_table(slowest)
+            table = pd.DataFrame(rows, columns=[f"\\textbf{{{c}}}" for c in columns])
+            print(table.style.hide(axis='index').format(escape="latex", 
+                precision=4, thousands=',').to_latex())
\ No newline at end of file
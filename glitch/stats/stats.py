@@ -1,65 +1,68 @@
 import os
 from abc import ABC, abstractmethod
 
+from glitch.analysis.rules import RuleCosts
+from glitch.dispatch import TypeDispatch
 from glitch.repr.inter import *
+from glitch.source import sources
 
 class Stats(ABC):
+    # Handler of each class of element in compute, which other stats can
+    # extend with @Stats.elements.register(cls)
+    elements = TypeDispatch()
+
     def compute(self, c):
-        if isinstance(c, Project):
-            self.compute_project(c)
-        elif isinstance(c, Module):
-            self.compute_module(c)
-        elif isinstance(c, UnitBlock):
-            self.compute_unitblock(c)
-        if isinstance(c, AtomicUnit):
-            self.compute_atomicunit(c)
-        elif isinstance(c, Dependency):
-            self.compute_dependency(c)
-        elif isinstance(c, Attribute):
-            self.compute_attribute(c)
-        elif isinstance(c, Variable):
-            self.compute_variable(c)
-        elif isinstance(c, ConditionalStatement):
-            self.compute_condition(c)
-        elif isinstance(c, Comment):
-            self.compute_comment(c)
-        elif isinstance(c, dict):
-            for k, v in c.items():
-                self.compute(k)
-                self.compute(v)
+        handler = Stats.elements.handlers(self.__class__)[c.__class__]
+        if handler is not None:
+            handler(self, c)
+
+    @elements.register(dict)
+    def compute_dict(self, d: dict):
+        for k, v in d.items():
+            self.compute(k)
+            self.compute(v)
 
+    @elements.register(Project)
     @abstractmethod
     def compute_project(self, p: Project):
         pass
 
+    @elements.register(Module)
     @abstractmethod
     def compute_module(self, m: Module):
         pass
 
+    @elements.register(UnitBlock)
     @abstractmethod
     def compute_unitblock(self, u: UnitBlock):
         pass
 
+    @elements.register(AtomicUnit)
     @abstractmethod
     def compute_atomicunit(self, au: AtomicUnit):
         pass
 
+    @elements.register(Dependency)
     @abstractmethod
     def compute_dependency(self, d: Dependency):
         pass
 
+    @elements.register(Attribute)
     @abstractmethod
     def compute_attribute(self, a: Attribute):
         pass
 
+    @elements.register(Variable)
     @abstractmethod
     def compute_variable(self, v: Variable):
         pass
 
+    @elements.register(ConditionalStatement)
     @abstractmethod
     def compute_condition(self, c: ConditionalStatement):
         pass
 
+    @elements.register(Comment)
     @abstractmethod
     def compute_comment(self, c: Comment):
         pass
@@ -69,6 +72,23 @@ class FileStats(Stats):
         super().__init__()
         self.files = set()
         self.loc = 0
+        self.file_loc = {}
+        # Paths skipped because they exceeded their budget, with the reason
+        self.skipped = {}
+        # Records of the cost of each phase of the analysis, when profiled.
+        # They are not merged, since they are reported as they arrive.
+        self.profile = []
+        # Cost of the rules of each smell code, when they are profiled
+        self.costs = RuleCosts()
+
+    def merge(self, other: 'FileStats'):
+        self.skipped.update(other.skipped)
+        self.costs.merge(other.costs)
+        for path, loc in other.file_loc.items():
+            if path not in self.files:
+                self.files.add(path)
+                self.file_loc[path] = loc
+                self.loc += loc
 
     def compute_project(self, p: Project):
         for m in p.modules:
@@ -81,19 +101,21 @@ class FileStats(Stats):
             self.compute(u)
         if os.path.isfile(m.path) and m.path not in self.files:
             self.files.add(m.path)
-            with open(m.path, "r") as f:
-                self.loc += len(f.readlines())
+            self.file_loc[m.path] = 0
+            self.file_loc[m.path] = len(sources.open(m.path).lines)
+            self.loc += self.file_loc[m.path]
 
     def compute_unitblock(self, u: UnitBlock):
         for ub in u.unit_blocks:
             self.compute(ub)
         if os.path.isfile(u.path) and u.path not in self.files:
             self.files.add(u.path)
-            with open(u.path, "r") as f:
-                try:
-                    self.loc += len(f.readlines())
-                except UnicodeDecodeError:
-                    pass
+            self.file_loc[u.path] = 0
+            try:
+                self.file_loc[u.path] = len(sources.open(u.path).lines)
+                self.loc += self.file_loc[u.path]
+            except UnicodeDecodeError:
+                pass
 
     def compute_atomicunit(self, au: AtomicUnit):
         pass
@@ -0,0 +1,151 @@
+import os
+import time
+import shutil
+import signal
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from glitch.budget import Budget, BudgetExceeded, shielded
+from glitch.cache import ResultCache
+from glitch.parsers.cmof import PuppetParser
+from glitch.parsers.ripper_parser import RipperWorker
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import check, get_analyses, init_worker, check_in_worker
+from glitch.tech import Tech
+
+def spin():
+    while True:
+        pass
+
+def handle():
+    # The exception is handled at every tick until the loop ends
+    end = time.monotonic() + 0.5
+    while time.monotonic() < end:
+        try:
+            time.sleep(0.01)
+        except:
+            pass
+    return "done"
+
+class SlowParser(PuppetParser):
+    def parse(self, path, type, is_module):
+        spin()
+
+@unittest.skipUnless(Budget.supported(), "the budget cannot be enforced in this platform")
+class TestBudget(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_timeout(self):
+        with self.assertRaises(BudgetExceeded) as e:
+            Budget(timeout=0.1).run(spin)
+        self.assertEqual(e.exception.reason, "took more than 0.1 seconds")
+        self.assertIs(signal.getsignal(signal.SIGALRM), signal.SIG_DFL)
+
+    def test_handled(self):
+        with self.assertRaises(BudgetExceeded):
+            Budget(timeout=0.1).run(handle)
+
+    def test_shielded(self):
+        finished = []
+        def clean_up():
+            time.sleep(0.3)
+            finished.append(True)
+        def abort():
+            try:
+                spin()
+            finally:
+                shielded(clean_up)
+
+        with self.assertRaises(BudgetExceeded):
+            Budget(timeout=0.1).run(abort)
+        self.assertEqual(finished, [True])
+
+    def test_within_budget(self):
+        self.assertEqual(Budget(timeout=1).run(lambda x: x + 1, 1), 2)
+        self.assertEqual(Budget().run(handle), "done")
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+    @unittest.skipUnless(Budget.supported(memory=True), "the RSS cannot be measured")
+    def test_memory(self):
+        def allocate():
+            blocks = []
+            while True:
+                blocks.append(bytearray(1 << 20))
+
+        with self.assertRaises(BudgetExceeded) as e:
+            Budget(max_memory=64 << 20).run(allocate)
+        self.assertEqual(e.exception.reason, "used more than 64 MB of memory")
+
+    def test_skipped(self):
+        path = "tests/security/puppet/files/admin.pp"
+        cache = ResultCache(os.path.join(self.dir, "cache"), Tech.puppet,
+            "configs/default.ini", ["security"], UnitBlockType.script, False)
+        analyses = get_analyses(Tech.puppet, "configs/default.ini", ["security"])
+        errors, stats = check(UnitBlockType.script, path, False, SlowParser(), 
+            analyses, cache, Budget(timeout=0.1))
+        self.assertEqual(errors, [])
+        self.assertEqual(stats.skipped, {path: "took more than 0.1 seconds"})
+        self.assertEqual(stats.files, set())
+        # The results of skipped paths are not cached
+        self.assertIsNone(cache.get(cache.key(path)))
+
+    def test_aborted_unit_block(self):
+        aborted = os.path.join(self.dir, "a.pp")
+        with open(aborted, "w") as f:
+            f.write("$secretvar = 'secret'\n")
+        path = os.path.join(self.dir, "b.pp")
+        with open(path, "w") as f:
+            f.write("class b {\n  $params = '{ \"password\": $secretvar }'\n}\n")
+        analyses = get_analyses(Tech.puppet, "tests/design/puppet/design_puppet.ini",
+            ["design"])
+
+        # The check of a.pp is aborted after its variables are in scope
+        analyses[0].check_unitblock = lambda u, errors: spin()
+        _, stats = check(UnitBlockType.script, aborted, False, PuppetParser(),
+            analyses, budget=Budget(timeout=0.1))
+        self.assertEqual(stats.skipped, {aborted: "took more than 0.1 seconds"})
+        del analyses[0].check_unitblock
+
+        # The variables of a.pp are not in scope in b.pp
+        errors, _ = check(UnitBlockType.script, path, False, PuppetParser(), analyses)
+        self.assertEqual([e for e in errors if e.code == "implementation_unguarded_variable"], [])
+
+    @unittest.skipUnless(shutil.which("ruby"), "Ruby is not installed")
+    def test_ripper_worker(self):
+        aborted = "tests/design/chef/files/too_many_variables.rb"
+        path = "tests/security/chef/files/obs_command.rb"
+        expected = RipperWorker().parse(path)
+        worker = RipperWorker()
+        for _ in range(5):
+            with self.assertRaises(BudgetExceeded):
+                Budget(timeout=0.0002).run(worker.parse, aborted)
+            # The output of the aborted file is not read for the next one
+            self.assertEqual(worker.parse(path), expected)
+        worker.close()
+
+    def test_worker(self):
+        # YAML anchors which expand to 9^8 strings
+        bomb = os.path.join(self.dir, "bomb.yml")
+        with open(bomb, "w") as f:
+            f.write("- hosts: all\n  vars:\n    a0: &a0 [" + ",".join(['"lol"'] * 9) + "]\n")
+            for i in range(1, 9):
+                f.write(f"    a{i}: &a{i} [" + ",".join([f"*a{i - 1}"] * 9) + "]\n")
+        paths = [bomb, "tests/security/ansible/files/admin.yml"]
+
+        with ProcessPoolExecutor(2, initializer=init_worker, initargs=(Tech.ansible, 
+                "configs/default.ini", ["security"], None, Budget(timeout=0.5))) as executor:
+            results = list(executor.map(partial(check_in_worker, 
+                UnitBlockType.unknown, False, False), paths))
+
+        self.assertEqual(results[0][1].skipped, {bomb: "took more than 0.5 seconds"})
+        self.assertEqual(results[1][1].skipped, {})
+        self.assertNotEqual(results[1][0], [])
+
+if __name__ == '__main__':
+    unittest.main()
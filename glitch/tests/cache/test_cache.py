@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from glitch.cache import ResultCache
+from glitch.parsers.cmof import PuppetParser
+from glitch.runner import check, get_analyses
+from glitch.tech import Tech
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.dir, "admin.pp")
+        shutil.copy("tests/security/puppet/files/admin.pp", self.file)
+        self.cache = ResultCache(os.path.join(self.dir, "cache"), Tech.puppet,
+            "configs/default.ini", ["security", "design"], "script", False)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def __check(self):
+        analyses = get_analyses(Tech.puppet, "configs/default.ini", ["security", "design"])
+        return check("script", self.file, False, PuppetParser(), analyses, self.cache)
+
+    def test_cache_hit(self):
+        errors, stats = self.__check()
+        self.assertIsNotNone(self.cache.get(self.cache.key(self.file)))
+        cached_errors, cached_stats = self.__check()
+        self.assertEqual(
+            [(e.code, e.path, e.line, e.repr) for e in errors],
+            [(e.code, e.path, e.line, e.repr) for e in cached_errors]
+        )
+        self.assertEqual(stats.file_loc, cached_stats.file_loc)
+
+    def test_cache_key_changes_with_content(self):
+        key = self.cache.key(self.file)
+        with open(self.file, "a") as f:
+            f.write("\n")
+        self.assertNotEqual(key, self.cache.key(self.file))
+
+    def test_cache_eviction(self):
+        self.__check()
+        self.cache.max_size = 0
+        self.cache.evict()
+        self.assertIsNone(self.cache.get(self.cache.key(self.file)))
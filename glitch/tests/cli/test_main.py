@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from glitch.__main__ import glitch
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.runner = CliRunner()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_help_commands(self):
+        result = self.runner.invoke(glitch, ["--help"], prog_name="glitch")
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("--tech", result.output)
+        self.assertIn("glitch COMMAND [ARGS]...", result.output)
+        self.assertIn("parse", result.output)
+        self.assertIn("serve", result.output)
+
+    def test_command(self):
+        result = self.runner.invoke(glitch, ["parse", "--help"], prog_name="glitch")
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Usage: glitch parse [OPTIONS] PATH", result.output)
+        self.assertIn("--emit-ir", result.output)
+
+    def test_options_after_path(self):
+        output = os.path.join(self.dir, "output")
+        result = self.runner.invoke(glitch, ["--tech", "puppet", 
+            "tests/security/puppet/files/http.pp", "--smells", "security", output], 
+            prog_name="glitch")
+        self.assertEqual(result.exit_code, 0, result.output)
+        with open(output) as f:
+            self.assertIn("Use of HTTP without TLS", f.read())
+
+        result = self.runner.invoke(glitch, ["--tech", "puppet", 
+            "tests/security/puppet/files/http.pp", output, "extra"], prog_name="glitch")
+        self.assertEqual(result.exit_code, 2)
+
+    def test_path_named_as_command(self):
+        # A path is only taken as a command if it is the first argument
+        path = os.path.join(self.dir, "serve")
+        shutil.copy("tests/security/puppet/files/http.pp", path)
+        cwd = os.getcwd()
+        config = os.path.join(cwd, "configs", "default.ini")
+        os.chdir(self.dir)
+        try:
+            result = self.runner.invoke(glitch, ["--tech", "puppet",
+                "--config", config, "--smells", "security", "serve"], prog_name="glitch")
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Use of HTTP without TLS", result.output)
+
+if __name__ == '__main__':
+    unittest.main()
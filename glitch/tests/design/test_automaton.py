@@ -0,0 +1,39 @@
+import unittest
+
+from glitch.analysis.automaton import AhoCorasick
+
+class TestAhoCorasick(unittest.TestCase):
+    def __count(self, patterns, text):
+        return sum(1 for p in patterns if p in text)
+
+    def test_count(self):
+        patterns = ["$var", "$variable", "$var", "able", "$v", "x"]
+        automaton = AhoCorasick()
+        for pattern in patterns:
+            automaton.add(pattern)
+
+        for text in ["", "$variable", "the $var is here", "$vx", "vari$able", "$$va"]:
+            self.assertEqual(automaton.count(text), self.__count(patterns, text), text)
+
+    def test_add_and_remove(self):
+        automaton = AhoCorasick()
+        automaton.add("#name")
+        self.assertEqual(automaton.count("a #name and #other"), 1)
+
+        automaton.add("#other")
+        self.assertEqual(automaton.count("a #name and #other"), 2)
+
+        automaton.remove("#other")
+        self.assertEqual(automaton.count("a #name and #other"), 1)
+        automaton.remove("#name")
+        self.assertEqual(automaton.count("a #name and #other"), 0)
+
+    def test_empty_pattern(self):
+        automaton = AhoCorasick()
+        automaton.add("")
+        automaton.add("a")
+        self.assertEqual(automaton.count(""), 1)
+        self.assertEqual(automaton.count("ba"), 2)
+
+if __name__ == '__main__':
+    unittest.main()
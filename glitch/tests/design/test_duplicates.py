@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from glitch.analysis.duplicates import DuplicateIndex, fingerprint, winnow
+
+class TestDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        block = "".join(f"    attribute_{i} => 'value_{i}',\n" for i in range(20))
+        self.files = []
+        for i in range(3):
+            path = os.path.join(self.dir, f"{i}.pp")
+            with open(path, "w") as f:
+                f.write(f"file {{ '/tmp/{i}':\n    owner => 'user_{i}',\n")
+                # Only the first two files share the block
+                f.write(block if i < 2 else block.replace("value", "other"))
+                f.write("}\n")
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_winnow(self):
+        hashes = [77, 74, 42, 17, 98, 50, 17, 98, 8, 88, 67, 39, 77, 74, 42, 17, 98]
+        self.assertEqual(winnow(hashes, 4), [3, 6, 8, 11, 15])
+        self.assertEqual(winnow([5, 3, 9], 4), [1])
+        self.assertEqual(winnow([], 4), [])
+
+    def test_cross_file(self):
+        index = DuplicateIndex()
+        errors = []
+        for file in self.files:
+            errors += index.add(file, fingerprint(file))
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(set((e.code, e.path) for e in errors), 
+            {("design_duplicate_block", self.files[0]), 
+             ("design_duplicate_block", self.files[1])})
+        for error in errors:
+            self.assertEqual(error.line, 3)
+        self.assertIn(self.files[0], errors[0].repr)
+
+    def test_same_file(self):
+        index = DuplicateIndex()
+        fingerprints = fingerprint(self.files[0])
+        self.assertEqual(index.add(self.files[0], fingerprints + fingerprints), [])
+
+    def test_max_size(self):
+        index = DuplicateIndex(max_size=10)
+        errors = []
+        for file in self.files:
+            errors += index.add(file, fingerprint(file))
+            self.assertLessEqual(len(index), 10)
+
+if __name__ == '__main__':
+    unittest.main()
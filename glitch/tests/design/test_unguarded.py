@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from glitch.analysis.rules import Traversal
+from glitch.repr.inter import *
+from glitch.runner import get_analyses
+from glitch.source import sources
+from glitch.tech import Tech
+
+class TestUnguardedVariables(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "a.pp")
+        with open(self.path, "w") as f:
+            f.write("class a {\n  $params = '$nested'\n  $keys = '$key'\n}\n")
+        self.analyses = get_analyses(Tech.puppet, "tests/design/puppet/design_puppet.ini",
+            ["design"])
+
+    def tearDown(self):
+        sources.evict()
+        shutil.rmtree(self.dir)
+
+    def test_nested_variables(self):
+        u = UnitBlock("a", UnitBlockType.script)
+        u.path = self.path
+        condition = ConditionalStatement("$facts == 'debian'",
+            ConditionalStatement.ConditionType.IF)
+        # The variables inside statements are in scope, but not the keys of
+        # the values of variables
+        nested = Variable("$nested", None, False)
+        nested.keyvalues.append(Variable("$key", "value", False))
+        condition.add_statement(nested)
+        u.add_statement(condition)
+
+        errors = Traversal(self.analyses).check(u)
+        self.assertEqual([(e.code, e.line) for e in errors
+            if e.code == "implementation_unguarded_variable"],
+            [("implementation_unguarded_variable", 2)])
+
+if __name__ == '__main__':
+    unittest.main()
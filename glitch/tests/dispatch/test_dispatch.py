@@ -0,0 +1,88 @@
+import unittest
+
+from glitch.analysis.rules import Error, RuleVisitor
+from glitch.dispatch import TypeDispatch
+from glitch.repr.inter import *
+from glitch.tech import Tech
+
+class Resource(AtomicUnit):
+    pass
+
+class Handler:
+    elements = TypeDispatch()
+
+    @elements.register(KeyValue)
+    def handle_keyvalue(self, kv):
+        return "keyvalue"
+
+    @elements.register(Attribute)
+    def handle_attribute(self, a):
+        return "attribute"
+
+    def handle(self, c):
+        handler = Handler.elements.handlers(self.__class__)[c.__class__]
+        return None if handler is None else handler(self, c)
+
+class OtherHandler(Handler):
+    def handle_keyvalue(self, kv):
+        return "other keyvalue"
+
+class TestDispatch(unittest.TestCase):
+    def test_nearest_class(self):
+        handler = Handler()
+        self.assertEqual(handler.handle(Attribute("a", "", False)), "attribute")
+        self.assertEqual(handler.handle(Variable("v", "", False)), "keyvalue")
+        self.assertIsNone(handler.handle(Comment("c")))
+
+    def test_override(self):
+        handler = OtherHandler()
+        self.assertEqual(handler.handle(Variable("v", "", False)), "other keyvalue")
+        self.assertEqual(handler.handle(Attribute("a", "", False)), "attribute")
+
+    def test_register_after_dispatch(self):
+        class Note(Comment):
+            pass
+
+        handler = Handler()
+        self.assertIsNone(handler.handle(Note("c")))
+        Handler.elements.register(Note, "handle_attribute")
+        self.assertEqual(handler.handle(Note("c")), "attribute")
+
+    def test_rule_visitor(self):
+        # A new rule handles its own class of elements without changing
+        # RuleVisitor
+        class ResourceVisitor(RuleVisitor):
+            @staticmethod
+            def get_name() -> str:
+                return "resource"
+
+            def config(self, config_path: str):
+                pass
+
+            @RuleVisitor.elements.register(Resource)
+            def check_resource(self, r, file, errors):
+                errors.emit(Error("sec_def_admin", r, file, repr(r)))
+
+            def check_dependency(self, d, file, errors):
+                pass
+
+            def check_attribute(self, a, file, errors):
+                pass
+
+            def check_variable(self, v, file, errors):
+                pass
+
+            def check_comment(self, c, file, errors):
+                pass
+
+        visitor = ResourceVisitor(Tech.puppet)
+        resource = Resource("r", "file")
+        resource.line = 1
+        unit_block = UnitBlock("a", UnitBlockType.script)
+        unit_block.path = "a.pp"
+        unit_block.statements.append({resource: [AtomicUnit("a", "file")]})
+        errors = visitor.check(unit_block)
+        self.assertEqual([(e.code, e.line) for e in errors], [("sec_def_admin", 1)])
+
+if __name__ == '__main__':
+    unittest.main()
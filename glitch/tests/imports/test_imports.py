@@ -0,0 +1,34 @@
+import sys
+import json
+import unittest
+import subprocess
+
+class TestImports(unittest.TestCase):
+    def __modules(self, code: str) -> set:
+        code += "\nimport sys, json\nprint(json.dumps(list(sys.modules)))"
+        output = subprocess.check_output([sys.executable, "-c", code])
+        return set(json.loads(output))
+
+    def test_main(self):
+        modules = self.__modules("import glitch.__main__")
+        for module in ["pandas", "hcl2", "ruamel.yaml", "puppetparser", "pkg_resources"]:
+            self.assertNotIn(module, modules)
+
+    def test_terraform_parser(self):
+        modules = self.__modules(
+            "from glitch.runner import get_parser\n" 
+            "from glitch.tech import Tech\n"
+            "get_parser(Tech.terraform)"
+        )
+        self.assertIn("hcl2", modules)
+        for module in ["pandas", "ruamel.yaml", "puppetparser", "glitch.parsers.ansible_parser"]:
+            self.assertNotIn(module, modules)
+
+    def test_cmof(self):
+        modules = self.__modules("from glitch.parsers.cmof import PuppetParser")
+        self.assertIn("puppetparser", modules)
+        self.assertNotIn("hcl2", modules)
+        self.assertNotIn("ruamel.yaml", modules)
+
+if __name__ == '__main__':
+    unittest.main()
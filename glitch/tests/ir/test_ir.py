@@ -0,0 +1,98 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from glitch.ir import IRFormatError, IRReader, IRWriter
+from glitch.parsers.cmof import TerraformParser
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import check_and_fingerprint, check_from_ir, get_analyses, parse_to_ir
+from glitch.tech import Tech
+
+class TestIR(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.ir = os.path.join(self.dir, "scripts.ir")
+        self.paths = ["tests/security/terraform/files/http.tf", 
+            "tests/design/terraform/files/long_statement.tf"]
+        self.analyses = get_analyses(Tech.terraform, "configs/default.ini", ["security", "design"])
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def __write(self):
+        with IRWriter(self.ir, Tech.terraform, UnitBlockType.unknown, False) as writer:
+            for path in self.paths:
+                parse_to_ir(UnitBlockType.unknown, path, False, TerraformParser(), writer)
+
+    def test_same_errors(self):
+        self.__write()
+        with IRReader(self.ir) as ir:
+            self.assertEqual(ir.tech, Tech.terraform)
+            self.assertEqual(len(ir), len(self.paths))
+
+            for path, entry in zip(self.paths, ir):
+                self.assertEqual(entry[0], path)
+                errors, stats, fingerprints = check_from_ir(entry, self.analyses, True)
+                expected_errors, expected_stats, expected_fingerprints = \
+                    check_and_fingerprint(UnitBlockType.unknown, path, False, 
+                        TerraformParser(), self.analyses, None, True)
+
+                self.assertEqual(
+                    [(e.code, e.path, e.line, e.repr) for e in errors],
+                    [(e.code, e.path, e.line, e.repr) for e in expected_errors]
+                )
+                self.assertEqual(stats.file_loc, expected_stats.file_loc)
+                self.assertEqual(fingerprints, expected_fingerprints)
+
+    def test_sources_saved(self):
+        self.paths = [os.path.join(self.dir, "http.tf")]
+        shutil.copy("tests/security/terraform/files/http.tf", self.paths[0])
+        self.__write()
+        # The code of the elements and the analyses do not need the files
+        os.remove(self.paths[0])
+        with IRReader(self.ir) as ir:
+            _, inter, _ = ir[0]
+            self.assertIn("http://", inter.atomic_units[0].code)
+            errors, _, _ = check_from_ir(ir[0], self.analyses, False)
+            self.assertIn("sec_https", [e.code for e in errors])
+
+    def test_invalid_file(self):
+        with open(self.ir, "wb") as f:
+            f.write(b"not an IR file")
+        with self.assertRaises(IRFormatError):
+            IRReader(self.ir)
+
+        self.__write()
+        with open(self.ir, "r+b") as f:
+            f.truncate(os.path.getsize(self.ir) - 1)
+        with self.assertRaises(IRFormatError):
+            IRReader(self.ir)
+
+    def test_only_ir_classes(self):
+        with IRWriter(self.ir, Tech.terraform, UnitBlockType.unknown, False) as writer:
+            writer.add("a.tf", tempfile.TemporaryDirectory, [])
+        with IRReader(self.ir) as ir:
+            with self.assertRaises(pickle.UnpicklingError):
+                ir[0]
+
+    def test_dotted_name(self):
+        path = "a" * 64 + ".tf"
+        with IRWriter(self.ir, Tech.terraform, UnitBlockType.unknown, False) as writer:
+            writer.add(path, None, [])
+        # The record is replaced by one which calls os.system, named as the
+        # attribute os.system of glitch.source
+        payload = b"\x80\x04\x8c\x0dglitch.source\x8c\x09os.system\x93\x8c\x04true\x85R."
+        record = pickle.dumps((path, None, []), protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self.ir, "rb") as f:
+            content = f.read()
+        with open(self.ir, "wb") as f:
+            f.write(content.replace(record, payload.ljust(len(record), b".")))
+
+        with IRReader(self.ir) as ir:
+            with self.assertRaises(pickle.UnpicklingError):
+                ir[0]
+
+if __name__ == '__main__':
+    unittest.main()
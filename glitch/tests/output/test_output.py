@@ -0,0 +1,30 @@
+import unittest
+
+from glitch.analysis.rules import Error
+from glitch.output import ExternalSort
+
+class TestOutput(unittest.TestCase):
+    def __error(self, code, path, line, repr):
+        error = Error(code, None, path, repr)
+        error.line = line
+        return error
+
+    def test_external_sort(self):
+        errors = [
+            self.__error("sec_https", "b.pp", 3, "first"),
+            self.__error("sec_hard_secr", "a.pp", 10, "a"),
+            self.__error("sec_hard_pass", "a.pp", 10, "b"),
+            self.__error("sec_https", "b.pp", 3, "second"),
+            self.__error("sec_https", "a.pp", 2, "c"),
+        ]
+
+        sorter = ExternalSort(run_size=2)
+        for error in errors:
+            sorter.add(error, error.repr)
+
+        self.assertEqual(list(sorter.merge()), [
+            ("a.pp", 2, "sec_https", "c"),
+            ("a.pp", 10, "sec_hard_pass", "b"),
+            ("a.pp", 10, "sec_hard_secr", "a"),
+            ("b.pp", 3, "sec_https", "first"),
+        ])
@@ -0,0 +1,62 @@
+import os
+import json
+import tempfile
+import unittest
+
+from glitch.parsers.cmof import PuppetParser
+from glitch.profiling import ProfileReport, count_nodes
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import check, get_analyses
+from glitch.tech import Tech
+
+def record(path, parse, analysis, stats):
+    return {"path": path, "parse": parse, "analysis": analysis, "stats": stats,
+        "nodes": 0, "files": 1, "bytes": 0}
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.parser = PuppetParser()
+        self.analyses = get_analyses(Tech.puppet, "configs/default.ini", 
+            ["security", "design"])
+        self.path = "tests/security/puppet/files/admin.pp"
+
+    def test_profiling_record(self):
+        errors, stats = check(UnitBlockType.unknown, self.path, False, 
+            self.parser, self.analyses, profile=True)
+        self.assertEqual(len(stats.profile), 1)
+        profile = stats.profile[0]
+        self.assertEqual(profile["path"], self.path)
+        self.assertGreater(profile["parse"], 0)
+        self.assertEqual(sorted(profile["analysis"].keys()), ["design", "security"])
+        self.assertGreaterEqual(profile["stats"], 0)
+        self.assertEqual(profile["files"], 1)
+        self.assertEqual(profile["bytes"], os.path.getsize(self.path))
+
+        unit_block = self.parser.parse(self.path, UnitBlockType.unknown, False)
+        self.assertEqual(profile["nodes"], count_nodes(unit_block))
+        self.assertGreater(profile["nodes"], 1)
+
+    def test_profiling_same_errors(self):
+        errors, stats = check(UnitBlockType.unknown, self.path, False, 
+            self.parser, self.analyses)
+        p_errors, _ = check(UnitBlockType.unknown, self.path, False, 
+            self.parser, self.analyses, profile=True)
+        self.assertEqual(sorted(map(repr, errors)), sorted(map(repr, p_errors)))
+        self.assertEqual(stats.profile, [])
+
+    def test_profiling_report(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, "profile.jsonl")
+            with ProfileReport(path, n=2) as report:
+                report.add([record("a", 0.1, {"security": 0.1}, 0.0)])
+                report.add([record("b", None, {"security": 0.5}, 0.1),
+                    {"path": "c", "skipped": "took more than 1 second"}])
+                report.add([record("d", 0.3, {}, 0.0), {"path": "e", "cached": True}])
+
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual([line["path"] for line in lines], ["a", "b", "c", "d", "e"])
+            self.assertEqual([r["path"] for r in report.slowest()], ["b", "d"])
+
+if __name__ == '__main__':
+    unittest.main()
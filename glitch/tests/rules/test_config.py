@@ -0,0 +1,47 @@
+import unittest
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+from glitch.analysis.design import DesignConfig, DesignVisitor
+from glitch.analysis.security import SecurityConfig
+from glitch.parsers.cmof import PuppetParser
+from glitch.tech import Tech
+
+class TestConfig(unittest.TestCase):
+    PATH = "tests/design/puppet/files/unguarded_variable.pp"
+
+    def test_immutable(self):
+        config = SecurityConfig.load("configs/default.ini")
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.passwords = ()
+        self.assertIsInstance(config.passwords, tuple)
+
+    def test_instances(self):
+        puppet = DesignConfig.load("tests/design/puppet/design_puppet.ini")
+        default = DesignConfig.load("configs/default.ini")
+        self.assertEqual(puppet.var_refer_symbol, "")
+        self.assertIsNone(default.var_refer_symbol)
+
+        # Configuring a visitor does not change the others
+        first, second = DesignVisitor(Tech.puppet), DesignVisitor(Tech.puppet)
+        first.config("tests/design/puppet/design_puppet.ini")
+        second.config("configs/default.ini")
+        self.assertEqual(first.settings, puppet)
+        self.assertEqual(second.settings, default)
+
+    def test_threads(self):
+        inter = PuppetParser().parse(TestConfig.PATH, "script", False)
+
+        def check(config: str) -> list:
+            analysis = DesignVisitor(Tech.puppet)
+            analysis.config(config)
+            return sorted((e.code, e.line) for e in analysis.check(inter))
+
+        configs = ["tests/design/puppet/design_puppet.ini", "configs/default.ini"] * 8
+        expected = [check(c) for c in configs]
+        self.assertNotEqual(expected[0], expected[1])
+        with ThreadPoolExecutor(4) as executor:
+            self.assertEqual(list(executor.map(check, configs)), expected)
+
+if __name__ == '__main__':
+    unittest.main()
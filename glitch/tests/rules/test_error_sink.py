@@ -0,0 +1,32 @@
+import unittest
+
+from glitch.analysis.rules import Error, ErrorSink
+from glitch.repr.inter import *
+
+class TestErrorSink(unittest.TestCase):
+    def __error(self, code: str, line: int, repr: str = "") -> Error:
+        c = Comment("c")
+        c.line = line
+        return Error(code, c, "a.pp", repr)
+
+    def test_order(self):
+        errors = ErrorSink()
+        errors.emit(self.__error("sec_susp_comm", 2))
+        errors.emit(self.__error("sec_https", 1))
+        errors.extend([self.__error("design_avoid_comments", 1)])
+        self.assertEqual([(e.code, e.line) for e in errors], 
+            [("sec_susp_comm", 2), ("sec_https", 1), ("design_avoid_comments", 1)])
+
+    def test_duplicates(self):
+        errors = ErrorSink()
+        errors.emit(self.__error("sec_susp_comm", 2, "first"))
+        errors.emit(self.__error("sec_susp_comm", 2, "second"))
+        errors.extend([self.__error("sec_susp_comm", 2, "third"), 
+            self.__error("sec_susp_comm", 3)])
+        self.assertEqual(len(errors), 2)
+        self.assertIn(self.__error("sec_susp_comm", 3), errors)
+        # The first error emitted is kept
+        self.assertEqual([e.repr for e in errors], ["first", ""])
+
+if __name__ == '__main__':
+    unittest.main()
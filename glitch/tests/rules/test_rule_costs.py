@@ -0,0 +1,55 @@
+import unittest
+
+from glitch.analysis.security import SecurityVisitor
+from glitch.parsers.cmof import PuppetParser
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import check, get_analyses
+from glitch.tech import Tech
+
+class TestRuleCosts(unittest.TestCase):
+    PATH = "tests/security/puppet/files/hard_secr.pp"
+
+    def setUp(self):
+        self.parser = PuppetParser()
+        self.unit_block = self.parser.parse(self.PATH, UnitBlockType.unknown, False)
+
+    def visitor(self, profiled: bool) -> SecurityVisitor:
+        visitor = SecurityVisitor(Tech.puppet)
+        visitor.config("configs/default.ini")
+        if profiled:
+            visitor.profile_rules()
+        return visitor
+
+    def test_costs(self):
+        visitor = self.visitor(True)
+        errors = visitor.check(self.unit_block)
+        costs = visitor.costs
+
+        self.assertGreater(costs.calls['sec_hard_secr'], 0)
+        self.assertGreater(costs.calls['sec_https'], 0)
+        self.assertEqual(costs.calls['sec_https'], costs.calls['sec_weak_crypt'])
+        self.assertGreater(costs.time['sec_hard_secr'], 0)
+        # Found by the same rule as the hard-coded secrets
+        self.assertNotIn('sec_hard_pass', costs.calls)
+        self.assertEqual(list(errors), list(self.visitor(False).check(self.unit_block)))
+
+    def test_not_profiled(self):
+        self.visitor(True)
+        visitor = self.visitor(False)
+        visitor.check(self.unit_block)
+        self.assertIsNone(visitor.costs)
+        # Only the rules of the profiled visitor are replaced
+        self.assertNotIn("_SecurityVisitor__check_https", vars(visitor))
+
+    def test_costs_in_stats(self):
+        analyses = get_analyses(Tech.puppet, "configs/default.ini", 
+            ["security", "design"], profile_rules=True)
+        _, stats = check(UnitBlockType.unknown, self.PATH, False, self.parser, analyses)
+        self.assertGreater(stats.costs.calls['sec_hard_secr'], 0)
+        self.assertGreater(stats.costs.calls['design_imperative_abstraction'], 0)
+        # The costs of the next path do not include the ones of this path
+        for analysis in analyses:
+            self.assertFalse(analysis.costs)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import unittest
+
+from glitch.analysis.rules import RuleVisitor, Traversal
+from glitch.repr.inter import *
+from glitch.tech import Tech
+
+class RecordingVisitor:
+    # Not a subclass of RuleVisitor, which would make it one of the
+    # analyses of every test run after this one. The checks are found by
+    # the names of the methods.
+    def __init__(self, tech: Tech, events: list) -> None:
+        self.tech = tech
+        self.events = events
+        self.lock = threading.RLock()
+
+    def enter_unitblock(self, u, errors):
+        self.events.append(("enter", u.name))
+
+    def check_unitblock(self, u, errors):
+        self.events.append(("unitblock", u.name))
+
+    def exit_unitblock(self, u, errors):
+        self.events.append(("exit", u.name))
+
+    def check_atomicunit(self, au, file, errors):
+        self.events.append(("atomicunit", au.name))
+
+    def check_dependency(self, d, file, errors):
+        pass
+
+    def check_attribute(self, a, file, errors):
+        self.events.append(("attribute", a.name))
+
+    def check_variable(self, v, file, errors):
+        self.events.append(("variable", v.name))
+
+    def check_comment(self, c, file, errors):
+        self.events.append(("comment", c.content))
+
+class TestTraversal(unittest.TestCase):
+    def __unit_block(self) -> UnitBlock:
+        u = UnitBlock("outer", UnitBlockType.script)
+        u.path = "a.pp"
+        u.comments.append(Comment("# c"))
+        au = AtomicUnit("au", "file")
+        au.attributes.append(Attribute("mode", "0777", False))
+        u.atomic_units.append(au)
+        v = Variable("v", None, False)
+        v.keyvalues.append(Variable("nested", "1", False))
+        u.variables.append(v)
+        inner = UnitBlock("inner", UnitBlockType.block)
+        inner.path = "a.pp"
+        u.unit_blocks.append(inner)
+        return u
+
+    def test_order(self):
+        events = []
+        Traversal([RecordingVisitor(Tech.puppet, events)]).check(self.__unit_block())
+        self.assertEqual(events, [
+            ("enter", "outer"),
+            ("attribute", "mode"),
+            ("atomicunit", "au"),
+            ("variable", "nested"),
+            ("variable", "v"),
+            ("comment", "# c"),
+            ("unitblock", "outer"),
+            ("enter", "inner"),
+            ("unitblock", "inner"),
+            ("exit", "inner"),
+            ("exit", "outer"),
+        ])
+
+    def test_single_pass(self):
+        # Both visitors check each element when it is visited, instead of
+        # walking the IR one after the other
+        single, both = [], []
+        Traversal([RecordingVisitor(Tech.puppet, single)]).check(self.__unit_block())
+        Traversal([RecordingVisitor(Tech.puppet, both), 
+            RecordingVisitor(Tech.puppet, both)]).check(self.__unit_block())
+        self.assertEqual(both, [e for e in single for _ in range(2)])
+
+    def test_locked_visitor(self):
+        # A visitor which is checking other code (here, held by this thread)
+        # is not used by other checks until it is done
+        events = []
+        visitor = RecordingVisitor(Tech.puppet, events)
+        thread = threading.Thread(target=Traversal([visitor]).check, 
+            args=(self.__unit_block(),))
+        with visitor.lock:
+            thread.start()
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(events, [])
+        thread.join()
+        self.assertEqual(events[0], ("enter", "outer"))
+        self.assertEqual(events[-1], ("exit", "outer"))
+
+    def test_not_an_analysis(self):
+        # The analyses (e.g. the default --smells) are the subclasses
+        self.assertNotIn(RecordingVisitor, RuleVisitor.__subclasses__())
+
+if __name__ == '__main__':
+    unittest.main()
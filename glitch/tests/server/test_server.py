@@ -0,0 +1,59 @@
+import io
+import json
+import unittest
+
+from glitch.server import RPCError, Server
+
+class TestServer(unittest.TestCase):
+    def __request(self, server, method, params=None, id=1):
+        request = {"jsonrpc": "2.0", "id": id, "method": method}
+        if params is not None:
+            request["params"] = params
+        return server.handle(json.dumps(request))
+
+    def test_server_analyze_path(self):
+        response = self.__request(Server(), "analyze", {
+            "path": "tests/security/puppet/files/admin.pp",
+            "tech": "puppet",
+            "config": "configs/default.ini",
+            "smells": ["security"]
+        })
+        self.assertEqual(
+            [(e["code"], e["line"]) for e in response["result"]],
+            [("sec_def_admin", 7), ("sec_hard_secr", 7), ("sec_hard_user", 7)]
+        )
+
+    def test_server_analyze_content(self):
+        response = self.__request(Server(), "analyze", {
+            "path": "/project/manifest.pp",
+            "tech": "puppet",
+            "config": "configs/default.ini",
+            "smells": ["security"],
+            "content": "$password = \"abc\"\n"
+        })
+        self.assertEqual(
+            [(e["code"], e["path"], e["line"]) for e in response["result"]],
+            [
+                ("sec_hard_pass", "/project/manifest.pp", 1),
+                ("sec_hard_secr", "/project/manifest.pp", 1)
+            ]
+        )
+
+    def test_server_errors(self):
+        server = Server()
+        self.assertEqual(server.handle("{")["error"]["code"], RPCError.PARSE_ERROR)
+        self.assertEqual(self.__request(server, "unknown")["error"]["code"],
+            RPCError.METHOD_NOT_FOUND)
+        self.assertEqual(self.__request(server, "analyze", {"tech": "puppet"})["error"]["code"],
+            RPCError.INVALID_PARAMS)
+
+    def test_server_shutdown(self):
+        server = Server()
+        rfile = io.StringIO(
+            json.dumps({"jsonrpc": "2.0", "id": 1, "method": "shutdown"}) + "\n" +
+            json.dumps({"jsonrpc": "2.0", "id": 2, "method": "shutdown"}) + "\n"
+        )
+        wfile = io.StringIO()
+        server.serve(rfile, wfile)
+        self.assertTrue(server.stopped)
+        self.assertEqual(len(wfile.getvalue().splitlines()), 1)
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from glitch.source import Source, SourceStore, Span
+from glitch.repr.inter import AtomicUnit
+
+class TestSource(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def __write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def __assert_same_as_file(self, source: Source, path: str):
+        with open(path) as f:
+            self.assertEqual(source.text, f.read())
+            f.seek(0, 0)
+            self.assertEqual(source.lines, f.readlines())
+        with open(path) as f, source.open() as g:
+            self.assertEqual(g.name, path)
+            self.assertEqual(g.readlines(), f.readlines())
+
+    def test_text_and_lines(self):
+        path = self.__write("a.pp", b"file { 'a':\r\n  ensure => present,\r}\n\n")
+        self.__assert_same_as_file(Source(path), path)
+
+    def test_mmap(self):
+        path = self.__write("b.pp", b"line\n" * (Source.MMAP_SIZE // 5 + 1))
+        source = Source(path)
+        self.__assert_same_as_file(source, path)
+        with source.open() as f:
+            f.readline()
+            f.seek(0, 0)
+            self.assertEqual(f.readline(), "line\n")
+            source.close()
+
+    def test_decode_error(self):
+        path = self.__write("c.pp", b"\xff\xfe\x00")
+        source = Source(path)
+        with self.assertRaises(UnicodeDecodeError):
+            source.lines
+        with self.assertRaises(UnicodeDecodeError):
+            source.open().read()
+
+    def test_offset(self):
+        path = self.__write("e.pp", b"ab\r\ncde\n\nf")
+        source = Source(path)
+        for i in range(-5, 6):
+            for j in [None] + list(range(-5, 6)):
+                line = source.lines[max(i, -4)] if i < 4 else ""
+                # The offsets behave like slicing the lines
+                self.assertEqual(source.text[source.offset(i):source.offset(i, j)], line[:j])
+        self.assertEqual(source.offsets, [0, 3, 7, 8, 9])
+
+    def test_span(self):
+        path = self.__write("f.pp", b"a = 1\n" + b"b" * Span.MIN_SIZE + b"\n")
+        source = Source(path)
+        self.assertEqual(source.span(0, 5), "a = 1")
+
+        au = AtomicUnit("b", "file")
+        au.code = source.span(source.offset(1), source.offset(1, None))
+        self.assertIsInstance(au.code, str)
+        self.assertEqual(au.code, source.lines[1])
+        source.close()
+        self.assertEqual(au.code, source.lines[1])
+
+    def test_store(self):
+        path = self.__write("d.pp", b"a\n")
+        store = SourceStore()
+
+        store.open(path, keep=False)
+        self.assertNotIn(path, store)
+
+        source = store.open(path)
+        self.assertIn(path, store)
+        self.assertIs(store.open(path), source)
+
+        store.evict(path)
+        self.assertNotIn(path, store)
+        store.open(path)
+        store.evict()
+        self.assertEqual(len(store), 0)
+
+    def test_recent(self):
+        store = SourceStore()
+        paths = [self.__write(f"{i}.pp", b"a\n") for i in range(SourceStore.RECENT_SIZE + 1)]
+
+        source = store.open(paths[0], keep=False)
+        self.assertIs(store.open(paths[0], keep=False), source)
+        self.assertNotIn(paths[0], store)
+
+        # The least recently used file is removed from the cache
+        for path in paths[1:]:
+            store.open(path, keep=False)
+        self.assertIsNot(store.open(paths[0], keep=False), source)
+
+        # Opening a recent file to be kept moves it to the store
+        source = store.open(paths[0], keep=False)
+        self.assertIs(store.open(paths[0]), source)
+        self.assertIn(paths[0], store)
+
+if __name__ == '__main__':
+    unittest.main()
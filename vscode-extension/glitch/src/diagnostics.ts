@@ -1,6 +1,9 @@
 import * as vscode from 'vscode';
 
 import * as cp from "child_process";
+import { GlitchError, GlitchServer } from './server';
+
+const server = new GlitchServer();
 
 const execShell = (cmd: string) =>
     new Promise<string>((resolve, reject) => {
@@ -22,56 +25,86 @@ export async function refreshDiagnostics(doc: vscode.TextDocument,
 		return;
 	}
 
-	let options = ""
+	let options = "";
 	
-	let config = configuration.get('configurationPath');
-	if (config != "") {
+	let config: string | undefined = configuration.get('configurationPath');
+	if (config !== "") {
 		options += " --config " + config;
+	} else {
+		config = undefined;
 	}
 
-	let tech = configuration.get('tech');
-	if (tech != "") {
-		options += " --tech " + tech;
-	} else if (doc.fileName.endsWith(".yaml") || doc.fileName.endsWith(".yml")) {
-		options += " --tech ansible"
-	} else if (doc.fileName.endsWith(".rb")) {
-		options += " --tech chef"
-	} else if (doc.fileName.endsWith(".pp")) {
-		options += " --tech puppet"
-	} else {
-		return;
+	let tech: string | undefined = configuration.get('tech');
+	if (tech === "") {
+		if (doc.fileName.endsWith(".yaml") || doc.fileName.endsWith(".yml")) {
+			tech = "ansible";
+		} else if (doc.fileName.endsWith(".rb")) {
+			tech = "chef";
+		} else if (doc.fileName.endsWith(".pp")) {
+			tech = "puppet";
+		} else {
+			return;
+		}
 	}
+	options += " --tech " + tech;
 
 	let smells: string[] | undefined = configuration.get('smells');
 	for (let i = 0; i < smells!.length; i++) {
 		options += " --smells " + smells![i];
 	}
 
-	execShell(
-		'glitch --linter ' + options + " " + doc.fileName,
-	).then(csv => {
-		let lines = csv.split('\n');
-		lines = lines.filter(line => line.includes(','));
-		for (let l = 0; l < lines.length; l++) {
-			let split = lines[l].split(',', 5);
-
-			let line = parseInt(split[2])
+	const setDiagnostics = (errors: GlitchError[]) => {
+		for (const error of errors) {
+			let line = error.line;
 			if (line < 0) { line = 1; }
 	
 			const range = new vscode.Range(line - 1, 0, line, 0);
 			diagnostics.push(
 				new vscode.Diagnostic(
 					range,
-					split[0],
+					error.description,
 					vscode.DiagnosticSeverity.Warning
 				)
 			);
 		}
 
 		glitchDiagnostics.set(doc.uri, diagnostics);
-	})
-	.catch(reason => {
-		vscode.window.showErrorMessage(reason.split('Error:')[1]);
+	};
+
+	const runLinter = () => execShell(
+		'glitch --linter ' + options + " " + doc.fileName,
+	).then(csv => {
+		let lines = csv.split('\n');
+		lines = lines.filter(line => line.includes(','));
+		setDiagnostics(lines.map(l => {
+			let split = l.split(',', 5);
+			return {
+				description: split[0],
+				path: split[1],
+				line: parseInt(split[2]),
+				code: split[3],
+				repr: split[4]
+			};
+		}));
+	});
+
+	// The server is used when the installed version of GLITCH supports it
+	const analysis = server.available ? 
+		server.analyze({
+			path: doc.fileName,
+			tech: tech!,
+			config: config,
+			smells: smells,
+			content: doc.getText()
+		}).then(setDiagnostics, reason => {
+			if (!server.available) {
+				return runLinter();
+			}
+			throw reason;
+		}) : runLinter();
+
+	analysis.catch(reason => {
+		vscode.window.showErrorMessage(String(reason).split('Error:')[1] ?? String(reason));
 	});
 }
 
@@ -99,4 +132,6 @@ export function subscribeToDocumentChanges(context: vscode.ExtensionContext,
 	context.subscriptions.push(
 		vscode.workspace.onDidCloseTextDocument(doc => glitchDiagnostics.delete(doc.uri))
 	);
+
+	context.subscriptions.push(server);
 }
\ No newline at end of file
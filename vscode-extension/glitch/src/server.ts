@@ -0,0 +1,101 @@
+import * as cp from "child_process";
+import * as readline from "readline";
+
+export interface GlitchError {
+	code: string;
+	description: string;
+	path: string;
+	line: number;
+	repr: string;
+}
+
+export interface AnalyzeParams {
+	path: string;
+	tech: string;
+	config?: string;
+	smells?: string[];
+	content?: string;
+}
+
+interface PendingRequest {
+	resolve: (result: any) => void;
+	reject: (reason: string) => void;
+}
+
+// Keeps a "glitch serve" process running so that each analysis does not
+// have to pay for the startup of GLITCH. If the installed version of GLITCH
+// does not support the server, the server is marked as unavailable.
+export class GlitchServer {
+	private process: cp.ChildProcess | undefined;
+	private pending = new Map<number, PendingRequest>();
+	private nextId = 1;
+	public available = true;
+
+	private start(): cp.ChildProcess {
+		const process = cp.spawn('glitch', ['serve'], { stdio: ['pipe', 'pipe', 'ignore'] });
+		let answered = false;
+
+		readline.createInterface({ input: process.stdout! }).on('line', line => {
+			let response;
+			try {
+				response = JSON.parse(line);
+			} catch {
+				return;
+			}
+			answered = true;
+
+			const request = this.pending.get(response.id);
+			if (request === undefined) {
+				return;
+			}
+			this.pending.delete(response.id);
+			if (response.error !== undefined) {
+				request.reject(response.error.message);
+			} else {
+				request.resolve(response.result);
+			}
+		});
+
+		const stop = (reason: string) => {
+			// A server that stops before answering any request is not supported
+			if (!answered) {
+				this.available = false;
+			}
+			this.process = undefined;
+			for (const request of this.pending.values()) {
+				request.reject(reason);
+			}
+			this.pending.clear();
+		};
+		process.on('error', err => stop(err.message));
+		process.on('exit', () => stop('The GLITCH server stopped.'));
+		// Errors writing to the server are handled when it stops
+		process.stdin!.on('error', () => {});
+
+		return process;
+	}
+
+	private request(method: string, params: object): Promise<any> {
+		if (this.process === undefined) {
+			this.process = this.start();
+		}
+
+		const id = this.nextId++;
+		const request = JSON.stringify({ jsonrpc: '2.0', id: id, method: method, params: params });
+		return new Promise((resolve, reject) => {
+			this.pending.set(id, { resolve: resolve, reject: reject });
+			this.process!.stdin!.write(request + '\n');
+		});
+	}
+
+	public analyze(params: AnalyzeParams): Promise<GlitchError[]> {
+		return this.request('analyze', params);
+	}
+
+	public dispose(): void {
+		if (this.process !== undefined) {
+			this.process.stdin!.end();
+			this.process = undefined;
+		}
+	}
+}